@@ -16,6 +16,7 @@
                 (pPy.python.withPackages (p: [
                     p.kiwisolver
                     p.pygame
+                    p.numpy
 
                     p.pytest
                     p.ruff
@@ -0,0 +1,215 @@
+"""
+Archive of many layouts in one file, any of them loaded on its own.
+
+The file is a header, then one block per append: layouts in the binary
+format of `grid.serialize`, an index of `(offset, size, id)` entries of
+those layouts and a trailer pointing at the index and at the trailer of the
+block before:
+
+    header | layout | ... | index | trailer | layout | ... | index | trailer
+
+Appending writes only the new block, nothing before is rewritten. Opening
+reads the indexes from the first block to the last, so an id appended again
+points at its latest layout, the old one is left in place unused.
+"""
+
+import dataclasses
+import mmap
+import os
+import struct
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from typing import Self
+
+from .model import TileGrid
+from .serialize import dump_grid, load_grid
+
+
+MAGIC = b"GRDA"
+VERSION = 2
+
+HEADER = struct.Struct("<4sI")
+"""
+Magic, version
+"""
+INDEX_ENTRY = struct.Struct("<QQH")
+"""
+Offset, size, id length, followed by the id in UTF-8
+"""
+MAX_ID_LENGTH = 0xFFFF
+"""
+Of an id in UTF-8
+"""
+TRAILER = struct.Struct("<QQI4s")
+"""
+Index offset, offset of the previous trailer or 0, index entry count, magic
+"""
+
+type Index = dict[str, tuple[int, int]]
+"""
+Layout id -> offset and size of the layout
+"""
+
+
+@dataclass(slots=True, kw_only=True)
+class LayoutArchive:
+    """
+    Archive opened with `mmap`, a layout is read from the file only when it
+    is loaded.
+
+    Views from `get_bytes` have to be released before `close`.
+    """
+
+    index: Index
+
+    _mmap: mmap.mmap = dataclasses.field(repr=False)
+
+    @staticmethod
+    def open(path: str | os.PathLike[str]) -> "LayoutArchive":
+        # The map keeps its own handle of the file
+        with open(path, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            index = _read_index(buffer)
+        except ValueError:
+            buffer.close()
+            raise
+
+        return LayoutArchive(index=index, _mmap=buffer)
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, layout_id: str) -> bool:
+        return layout_id in self.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index)
+
+    def get_bytes(self, layout_id: str) -> memoryview:
+        """
+        Binary format of the layout, a view of the file without a copy.
+        Can be loaded with `TileGridArray.from_bytes`.
+        """
+        offset, size = self.index[layout_id]
+        return memoryview(self._mmap)[offset : offset + size]
+
+    def load(self, layout_id: str) -> TileGrid:
+        with self.get_bytes(layout_id) as data:
+            return load_grid(data)
+
+
+def append_layouts(
+    path: str | os.PathLike[str], layouts: Mapping[str, TileGrid]
+) -> None:
+    """
+    Add `layouts` to the archive at `path`, created if it does not exist.
+    A layout replaces the one of the same id already in the archive.
+    """
+    encoded_ids = {layout_id: layout_id.encode() for layout_id in layouts}
+    for encoded_id in encoded_ids.values():
+        if len(encoded_id) > MAX_ID_LENGTH:
+            raise ValueError(
+                f"Layout id is {len(encoded_id)} bytes long, over {MAX_ID_LENGTH}"
+            )
+
+    with open(path, "ab+") as file:
+        file.seek(0, os.SEEK_END)
+        if file.tell() == 0:
+            file.write(HEADER.pack(MAGIC, VERSION))
+            previous_trailer = 0
+        else:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                _check_header(buffer)
+                previous_trailer = len(buffer) - TRAILER.size
+                _read_trailer(buffer, previous_trailer)
+
+        entries: list[tuple[int, int, bytes]] = []
+        for layout_id, grid in layouts.items():
+            data = dump_grid(grid)
+            entries.append((file.tell(), len(data), encoded_ids[layout_id]))
+            file.write(data)
+
+        index_offset = file.tell()
+        for offset, size, encoded_id in entries:
+            file.write(INDEX_ENTRY.pack(offset, size, len(encoded_id)) + encoded_id)
+        file.write(TRAILER.pack(index_offset, previous_trailer, len(entries), MAGIC))
+
+
+def _check_header(buffer: mmap.mmap) -> None:
+    if len(buffer) < HEADER.size + TRAILER.size:
+        raise ValueError("Not a layout archive: too short")
+
+    magic: bytes
+    version: int
+    magic, version = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError(f"Not a layout archive: bad magic {magic!r}")
+    if version != VERSION:
+        raise ValueError(f"Unsupported layout archive version: {version}")
+
+
+def _read_trailer(buffer: mmap.mmap, position: int) -> tuple[int, int, int]:
+    """
+    Return: index offset, previous trailer offset and index entry count
+    """
+    index_offset: int
+    previous: int
+    count: int
+    magic: bytes
+    index_offset, previous, count, magic = TRAILER.unpack_from(buffer, position)
+    if magic != MAGIC:
+        raise ValueError(f"Layout archive has no trailer at {position}")
+    if not (HEADER.size <= index_offset <= position):
+        raise ValueError(f"Layout archive trailer at {position} is corrupted")
+    if previous and not (HEADER.size <= previous < index_offset):
+        raise ValueError(f"Layout archive trailer at {position} is corrupted")
+
+    return index_offset, previous, count
+
+
+def _read_index(buffer: mmap.mmap) -> Index:
+    _check_header(buffer)
+
+    # Trailers are chained from the last block to the first
+    blocks: list[tuple[int, int, int]] = []
+    trailer = len(buffer) - TRAILER.size
+    while True:
+        index_offset, previous, count = _read_trailer(buffer, trailer)
+        blocks.append((index_offset, count, trailer))
+        if not previous:
+            break
+        trailer = previous
+
+    index: Index = {}
+    for index_offset, count, trailer in reversed(blocks):
+        position = index_offset
+        for _ in range(count):
+            offset: int
+            size: int
+            id_length: int
+            try:
+                offset, size, id_length = INDEX_ENTRY.unpack_from(buffer, position)
+            except struct.error as e:
+                raise ValueError("Layout archive index is corrupted") from e
+            position += INDEX_ENTRY.size
+
+            layout_id = buffer[position : position + id_length].decode()
+            position += id_length
+
+            index[layout_id] = (offset, size)
+
+        if position != trailer:
+            raise ValueError("Layout archive index is corrupted")
+
+    return index
@@ -0,0 +1,244 @@
+"""
+Struct-of-arrays counterpart of `TileGrid`.
+
+Every tile is a row in five contiguous `int32` columns, so geometric transforms
+run as vectorized operations instead of allocating `Tile`s.
+
+Requires `numpy` (`grid[array]` extra).
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+
+from .model import (
+    CardinalDirection,
+    Cell,
+    IntHandle,
+    Line,
+    Orientation,
+    Tile,
+    TileAsCorners,
+    TileGrid,
+    Unreachable,
+)
+from .serialize import HEADER, MAGIC, RECORD_FIELDS, VERSION, Buffer, read_header
+
+
+type Int32Array = npt.NDArray[np.int32]
+type Int64Array = npt.NDArray[np.int64]
+type BoolArray = npt.NDArray[np.bool_]
+
+
+@dataclass(frozen=True, slots=True, kw_only=True, eq=False)
+class TileGridArray:
+    """
+    Columns hold normalized corners: `x0 <= x1` and `y0 <= y1`.
+
+    Row order is the order of `TileGrid.tiles`, the first row is the origin.
+    Columns are never mutated in place, so transforms share untouched ones.
+    """
+
+    x0: Int32Array
+    y0: Int32Array
+    x1: Int32Array
+    y1: Int32Array
+    handle: Int32Array
+
+    @staticmethod
+    def from_grid(grid: TileGrid) -> "TileGridArray":
+        records = np.array(
+            [
+                (c.c0.x, c.c0.y, c.c3.x, c.c3.y, tile.handle)
+                for tile, c in ((tile, tile.as_corners()) for tile in grid.tiles)
+            ],
+            dtype=np.int32,
+        ).reshape(-1, 5)
+
+        return TileGridArray.from_records(records)
+
+    @staticmethod
+    def from_records(records: Int32Array) -> "TileGridArray":
+        """
+        `records` is an `(n, 5)` array of `(x0, y0, x1, y1, handle)` rows
+        """
+        return TileGridArray(
+            x0=np.ascontiguousarray(records[:, 0], dtype=np.int32),
+            y0=np.ascontiguousarray(records[:, 1], dtype=np.int32),
+            x1=np.ascontiguousarray(records[:, 2], dtype=np.int32),
+            y1=np.ascontiguousarray(records[:, 3], dtype=np.int32),
+            handle=np.ascontiguousarray(records[:, 4], dtype=np.int32),
+        )
+
+    @staticmethod
+    def from_bytes(data: Buffer) -> "TileGridArray":
+        """
+        Load the binary format of `grid.serialize`.
+
+        Records are read in place with `np.frombuffer`, only the columns are
+        copied out of them.
+        """
+        count = read_header(data)
+        records = np.frombuffer(
+            data, dtype="<i4", count=count * RECORD_FIELDS, offset=HEADER.size
+        ).reshape(count, RECORD_FIELDS)
+
+        return TileGridArray(
+            x0=np.ascontiguousarray(records[:, 1], dtype=np.int32),
+            y0=np.ascontiguousarray(records[:, 2], dtype=np.int32),
+            x1=np.ascontiguousarray(records[:, 3], dtype=np.int32),
+            y1=np.ascontiguousarray(records[:, 4], dtype=np.int32),
+            handle=np.ascontiguousarray(records[:, 0], dtype=np.int32),
+        )
+
+    def to_bytes(self) -> bytes:
+        records = np.stack(
+            (self.handle, self.x0, self.y0, self.x1, self.y1), axis=1
+        ).astype("<i4")
+
+        return HEADER.pack(MAGIC, VERSION, len(self)) + records.tobytes()
+
+    def to_grid(self) -> TileGrid:
+        return TileGrid.from_(
+            Tile(
+                tile=TileAsCorners(
+                    c0=Cell(x=x0, y=y0), c3=Cell(x=x1, y=y1)
+                ).normalize(),
+                handle=handle,
+            )
+            for x0, y0, x1, y1, handle in zip(
+                self.x0.tolist(),
+                self.y0.tolist(),
+                self.x1.tolist(),
+                self.y1.tolist(),
+                self.handle.tolist(),
+                strict=True,
+            )
+        )
+
+    def __len__(self) -> int:
+        return len(self.handle)
+
+    def get_handles(self) -> tuple[IntHandle, ...]:
+        return tuple(self.handle.tolist())
+
+    # Transforms {{{
+
+    def rotate_clockwise(self) -> "TileGridArray":
+        return TileGridArray(
+            x0=-self.y1, y0=self.x0, x1=-self.y0, y1=self.x1, handle=self.handle
+        )
+
+    def rotate_counterclockwise(self) -> "TileGridArray":
+        return TileGridArray(
+            x0=self.y0, y0=-self.x1, x1=self.y1, y1=-self.x0, handle=self.handle
+        )
+
+    def rotate(
+        self, side: CardinalDirection, /, *, to: CardinalDirection
+    ) -> "TileGridArray":
+        match (to - side) % 4:
+            case 0:
+                return self
+            case 1:
+                return self.rotate_clockwise()
+            case 2:
+                return TileGridArray(
+                    x0=-self.x1,
+                    y0=-self.y1,
+                    x1=-self.x0,
+                    y1=-self.y0,
+                    handle=self.handle,
+                )
+            case 3:
+                return self.rotate_counterclockwise()
+            case _:
+                raise Unreachable
+
+    def mirror_horizontally(self) -> "TileGridArray":
+        return TileGridArray(
+            x0=-self.x1, y0=self.y0, x1=-self.x0, y1=self.y1, handle=self.handle
+        )
+
+    def mirror_vertically(self) -> "TileGridArray":
+        return TileGridArray(
+            x0=self.x0, y0=-self.y1, x1=self.x1, y1=-self.y0, handle=self.handle
+        )
+
+    def mirror(self, orientation: Orientation) -> "TileGridArray":
+        match orientation:
+            case Orientation.HORIZONTAL:
+                return self.mirror_horizontally()
+            case Orientation.VERTICAL:
+                return self.mirror_vertically()
+
+    def translate(self, *, delta: Cell) -> "TileGridArray":
+        return TileGridArray(
+            x0=self.x0 + np.int32(delta.x),
+            y0=self.y0 + np.int32(delta.y),
+            x1=self.x1 + np.int32(delta.x),
+            y1=self.y1 + np.int32(delta.y),
+            handle=self.handle,
+        )
+
+    def centralize_origin(self) -> "TileGridArray":
+        return self.translate(delta=Cell(x=-int(self.x0[0]), y=-int(self.y0[0])))
+
+    # }}} Transforms
+
+    # Measures {{{
+
+    def get_box(self) -> Tile:
+        return Tile.build(
+            TileAsCorners(
+                c0=Cell(x=int(self.x0.min()), y=int(self.y0.min())),
+                c3=Cell(x=int(self.x1.max()), y=int(self.y1.max())),
+            )
+        )
+
+    def area(self) -> Int64Array:
+        """
+        Area of every tile, in `int64` as it overflows `int32` past 46340²
+        """
+        return (self.x1.astype(np.int64) - self.x0 + 1) * (
+            self.y1.astype(np.int64) - self.y0 + 1
+        )
+
+    def get_area_mismatch(self) -> int:
+        box = self.get_box()
+        return box.area() - int(self.area().sum())
+
+    # }}} Measures
+
+    # `Line` predicates {{{
+    # Vectorized `Line` methods, one value per tile
+
+    def _lows_highs(self, line: Line) -> tuple[Int32Array, Int32Array]:
+        match line.orientation:
+            case Orientation.HORIZONTAL:
+                return self.y0, self.y1
+            case Orientation.VERTICAL:
+                return self.x0, self.x1
+
+    def line_fully_contains(self, line: Line) -> BoolArray:
+        lows, highs = self._lows_highs(line)
+        return np.equal(lows, highs) & np.equal(lows, line.coordinate)
+
+    def line_intersects(self, line: Line) -> BoolArray:
+        lows, highs = self._lows_highs(line)
+        return (lows <= line.coordinate) & (line.coordinate <= highs)
+
+    def line_touches(self, line: Line) -> BoolArray:
+        lows, highs = self._lows_highs(line)
+        return np.equal(lows, line.coordinate) | np.equal(highs, line.coordinate)
+
+    def line_on_positive_side(self, line: Line) -> BoolArray:
+        _, highs = self._lows_highs(line)
+        return line.coordinate >= highs
+
+    def line_on_negative_side(self, line: Line) -> BoolArray:
+        lows, _ = self._lows_highs(line)
+        return line.coordinate <= lows
+
+    # }}} `Line` predicates
@@ -1,7 +1,9 @@
+import contextlib
 import itertools
+import os
 import sys
 from enum import Enum
-from typing import Generator
+from typing import Generator, TextIO
 
 import pygame as pg
 
@@ -11,12 +13,22 @@ from .model import (
     CardinalDirection,
     Cell,
     IntHandle,
+    ResizeSession,
     SharedBorders,
     Tile,
     TileAsCorners,
     TileGrid,
+    TileGridHistory,
     get_box,
 )
+from .oplog import (
+    AlignBorderClusters,
+    DeleteAndCloseGap,
+    Drag,
+    OperationLog,
+    ResizeAlongX,
+    SplitTile,
+)
 
 
 FPS = 24
@@ -356,7 +368,7 @@ class Mode(Enum):
     SPLIT_RIGHT = "SPLIT_RIGHT"
 
 
-def main_loop() -> None:
+def main_loop(*, operation_log_file: TextIO | None = None) -> None:
     pg.font.init()
     font = pg.font.SysFont("Hack", 25)
 
@@ -404,6 +416,9 @@ def main_loop() -> None:
     mode: Mode = Mode.NORMAL
 
     border_drag_cache: BorderDragCache | None = None
+    resize_session = ResizeSession()
+    history = TileGridHistory(tile_grid)
+    operation_log = OperationLog(grid=tile_grid, file=operation_log_file)
 
     while True:
         events = tuple(pg.event.get())
@@ -440,15 +455,27 @@ def main_loop() -> None:
                         print(f"Mode: {mode.value}")
 
                     case pg.K_a:
-                        tile_grid = tile_grid.align_borders(proximity=3)
+                        tile_grid = operation_log.record(
+                            AlignBorderClusters(proximity=3), tile_grid
+                        )
                         # tile_grid = tile_grid.snap_2_edges(handle=0, proximity=3)
 
                     case pg.K_s:
                         # tile_grid = tile_grid.resize(new_boundary=Cell(x=10, y=10))
-                        tile_grid = tile_grid.resize_along_x(x_length_new=10)
+                        tile_grid = operation_log.record(
+                            ResizeAlongX(x_length_new=10, mode=resize_session.mode),
+                            tile_grid,
+                            result=resize_session.resize(tile_grid, x_length_new=10),
+                        )
+
+                    case pg.K_r if e.mod & pg.KMOD_CTRL:
+                        tile_grid = operation_log.record_grid(history.redo())
 
                     case pg.K_r:
-                        tile_grid = ORIGINAL_TILE_GRID
+                        tile_grid = operation_log.record_grid(ORIGINAL_TILE_GRID)
+
+                    case pg.K_u:
+                        tile_grid = operation_log.record_grid(history.undo())
 
                     case pg.K_p:
                         print()
@@ -456,15 +483,23 @@ def main_loop() -> None:
                         print()
 
                     case pg.K_z:
-                        tile_grid = tile_grid.rotate_counterclockwise()
+                        tile_grid = operation_log.record_grid(
+                            tile_grid.rotate_counterclockwise()
+                        )
 
                     case pg.K_x:
-                        tile_grid = tile_grid.rotate_clockwise()
+                        tile_grid = operation_log.record_grid(
+                            tile_grid.rotate_clockwise()
+                        )
 
                     case pg.K_c:
-                        tile_grid = tile_grid.mirror_horizontally()
+                        tile_grid = operation_log.record_grid(
+                            tile_grid.mirror_horizontally()
+                        )
                     case pg.K_v:
-                        tile_grid = tile_grid.mirror_vertically()
+                        tile_grid = operation_log.record_grid(
+                            tile_grid.mirror_vertically()
+                        )
 
                     case pg.K_b:
                         match border_mode:
@@ -481,15 +516,11 @@ def main_loop() -> None:
             if e.type == pg.MOUSEBUTTONUP:
                 x, y = e.pos
 
-                selected_tile: Tile | None = None
-                for tile_translated in (
-                    tile_to_screen_space(tile) for tile in tile_grid.tiles
-                ):
-                    if tile_translated.contains_cell(
+                selected_tile = tile_grid.try_get_tile_by_cell(
+                    cell_from_screen_space(
                         Cell(x=x // CELL_SIDE_LENGTH, y=y // CELL_SIDE_LENGTH)
-                    ):
-                        selected_tile = tile_translated
-                        break
+                    )
+                )
 
                 if selected_tile is not None:
                     match mode:
@@ -498,8 +529,9 @@ def main_loop() -> None:
 
                         case Mode.DELETE:
                             # tile_grid = tile_grid.delete_by_handle(selected_tile.handle)
-                            tile_grid = tile_grid.delete_and_close_gap(
-                                handle=selected_tile.handle
+                            tile_grid = operation_log.record(
+                                DeleteAndCloseGap(handle=selected_tile.handle),
+                                tile_grid,
                             )
 
                         case (
@@ -508,7 +540,7 @@ def main_loop() -> None:
                             | Mode.SPLIT_LEFT
                             | Mode.SPLIT_RIGHT
                         ):
-                            tile_grid = tile_grid.split_tile(
+                            split = SplitTile(
                                 tile_handle=selected_tile.handle,
                                 new_tile_handle=generate_handle(),
                                 direction={
@@ -518,6 +550,7 @@ def main_loop() -> None:
                                     Mode.SPLIT_RIGHT: CardinalDirection.RIGHT,
                                 }[mode],
                             )
+                            tile_grid = operation_log.record(split, tile_grid)
             # }}} Controls
         # tile_grid = tile_grid.centralize_origin()
 
@@ -529,8 +562,8 @@ def main_loop() -> None:
         )
         cursor_cell = cell_from_screen_space(screen_cursor_cell)
 
-        shared_borders = tile_grid.get_shared_borders_near(
-            cursor_cell, proximity=2, mode=border_mode
+        shared_borders = tile_grid.get_hover_map(proximity=2, mode=border_mode).get(
+            cursor_cell
         )
 
         for e in events:
@@ -542,14 +575,31 @@ def main_loop() -> None:
                 )
 
             if e.type == pg.MOUSEBUTTONUP:
+                if border_drag_cache is not None:
+                    dragged_tile_grid = operation_log.record(
+                        Drag.of(border_drag_cache, to=cursor_cell, snap_proximity=2),
+                        border_drag_cache.grid,
+                    )
+                    # Only clusters near the dragged tiles can have changed
+                    tile_grid = operation_log.record(
+                        AlignBorderClusters(
+                            proximity=2,
+                            handles=dragged_tile_grid.get_changed_handles(
+                                border_drag_cache.grid
+                            ),
+                        ),
+                        dragged_tile_grid,
+                    )
                 border_drag_cache = None
 
         if border_drag_cache is not None:
-            tile_grid, shared_borders = border_drag_cache.drag(
+            dragged_tile_grid, shared_borders = border_drag_cache.drag(
                 to=cursor_cell, snap_proximity=2
             )
-
-        # tile_grid = tile_grid.align_borders(proximity=2)
+            tile_grid = dragged_tile_grid
+        else:
+            # A drag is recorded as one edit, once the button is released
+            tile_grid = history.push(tile_grid)
 
         # }}} Borders
 
@@ -565,7 +615,16 @@ def main_loop() -> None:
 
 
 def main() -> None:
-    main_loop()
+    # Replay with `python -m grid.oplog <path>`
+    operation_log_path = os.environ.get("GRID_OPERATION_LOG")
+
+    with contextlib.ExitStack() as stack:
+        operation_log_file = (
+            stack.enter_context(open(operation_log_path, "w", encoding="utf-8"))
+            if operation_log_path
+            else None
+        )
+        main_loop(operation_log_file=operation_log_file)
 
 
 if __name__ == "__main__":
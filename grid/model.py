@@ -6,14 +6,27 @@ Coordinates:
 
 """
 
+import bisect
 import dataclasses
 import functools
+import heapq
 import itertools
-from collections import Counter, defaultdict
-from collections.abc import Iterable
+import math
+import operator
+from collections import Counter, OrderedDict, defaultdict, deque
+from collections.abc import (
+    Callable,
+    Collection,
+    Hashable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from enum import Enum, IntEnum, auto
-from typing import Literal, NewType, overload
+from typing import Literal, NewType, cast, overload, override
 
 from kiwisolver import Expression, Solver, Variable
 
@@ -396,8 +409,8 @@ class Tile:
         )
 
     def area(self) -> int:
-        s = self.as_span()
-        return s.span.x * s.span.y
+        c = self.as_corners()
+        return (c.c3.x - c.c0.x + 1) * (c.c3.y - c.c0.y + 1)
 
     def un_occupy(self, area: "Tile", /, *, prefer: Orientation) -> "Tile | None":
         curr: "Tile | None" = self
@@ -464,6 +477,83 @@ class Tile:
         return curr
 
 
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Transform:
+    """
+    Element of the dihedral group D4 - a composition of rotations and
+    mirrorings around the origin, stored as a matrix:
+
+    ```
+    x' = (xx * x) + (xy * y)
+    y' = (yx * x) + (yy * y)
+    ```
+
+    Composing transforms is cheap and inverse ones cancel out exactly.
+    """
+
+    xx: int = 1
+    xy: int = 0
+    yx: int = 0
+    yy: int = 1
+
+    def then(self, other: "Transform") -> "Transform":
+        """
+        Apply `self`, then `other`
+        """
+        return Transform(
+            xx=(other.xx * self.xx) + (other.xy * self.yx),
+            xy=(other.xx * self.xy) + (other.xy * self.yy),
+            yx=(other.yx * self.xx) + (other.yy * self.yx),
+            yy=(other.yx * self.xy) + (other.yy * self.yy),
+        )
+
+    def inverse(self) -> "Transform":
+        # D4 matrices are orthogonal
+        return Transform(xx=self.xx, xy=self.yx, yx=self.xy, yy=self.yy)
+
+    def is_identity(self) -> bool:
+        return self == Transform()
+
+    def mirror_horizontally(self) -> "Transform":
+        return self.then(Transform(xx=-1))
+
+    def mirror_vertically(self) -> "Transform":
+        return self.then(Transform(yy=-1))
+
+    def rotate_clockwise(self) -> "Transform":
+        return self.then(Transform(xx=0, xy=-1, yx=1, yy=0))
+
+    def rotate_counterclockwise(self) -> "Transform":
+        return self.then(Transform(xx=0, xy=1, yx=-1, yy=0))
+
+    def rotate(
+        self, side: CardinalDirection, /, *, to: CardinalDirection
+    ) -> "Transform":
+        match (to - side) % 4:
+            case 0:
+                return self
+            case 1:
+                return self.rotate_clockwise()
+            case 2:
+                return self.rotate_clockwise().rotate_clockwise()
+            case 3:
+                return self.rotate_counterclockwise()
+            case _:
+                raise Unreachable
+
+    def apply_to_cell(self, cell: Cell) -> Cell:
+        return Cell(
+            x=(self.xx * cell.x) + (self.xy * cell.y),
+            y=(self.yx * cell.x) + (self.yy * cell.y),
+        )
+
+    def apply_to_tile(self, tile: Tile) -> Tile:
+        tc = tile.as_corners()
+        return tile.replace_tile(
+            TileAsCorners(c0=self.apply_to_cell(tc.c0), c3=self.apply_to_cell(tc.c3))
+        )
+
+
 @dataclass(frozen=True, slots=True, kw_only=True)
 class TileGridInvariantErrorContainer:
     handles: dict[IntHandle, int]
@@ -493,27 +583,14 @@ class SharedBorders:
     bottom: frozenset[Tile] = frozenset()
 
     def pull_coords(self, grid: "TileGrid") -> "SharedBorders":
-        return SharedBorders(
-            left=frozenset(
-                tile
-                for tile in grid.tiles
-                if tile.handle in (t.handle for t in self.left)
-            ),
-            right=frozenset(
-                tile
-                for tile in grid.tiles
-                if tile.handle in (t.handle for t in self.right)
-            ),
-            top=frozenset(
-                tile
-                for tile in grid.tiles
-                if tile.handle in (t.handle for t in self.top)
-            ),
-            bottom=frozenset(
-                tile
-                for tile in grid.tiles
-                if tile.handle in (t.handle for t in self.bottom)
-            ),
+        return self.get_handles().resolve(grid)
+
+    def get_handles(self) -> "HandleBorders":
+        return HandleBorders(
+            left=frozenset(tile.handle for tile in self.left),
+            right=frozenset(tile.handle for tile in self.right),
+            top=frozenset(tile.handle for tile in self.top),
+            bottom=frozenset(tile.handle for tile in self.bottom),
         )
 
     def as_tiles(self) -> tuple[Tile | None, Tile | None]:
@@ -627,239 +704,1147 @@ class SharedBorders:
 
 
 @dataclass(frozen=True, slots=True)
-class TileGrid:
-    tiles: tuple[Tile, ...]
+class HandleBorders:
+    """
+    `SharedBorders` holding only handles, resolved against a grid on demand.
+
+    Stays valid for every grid version that keeps the handles, and
+    transforms only swap the sides.
+    """
+
+    left: frozenset[IntHandle] = frozenset()
+    right: frozenset[IntHandle] = frozenset()
+    top: frozenset[IntHandle] = frozenset()
+    bottom: frozenset[IntHandle] = frozenset()
+
+    def resolve(self, grid: "TileGrid") -> SharedBorders:
+        """
+        Handles missing from `grid` are skipped
+        """
+        if not grid.has_unique_handles():
+            return SharedBorders(
+                left=frozenset(t for t in grid.tiles if t.handle in self.left),
+                right=frozenset(t for t in grid.tiles if t.handle in self.right),
+                top=frozenset(t for t in grid.tiles if t.handle in self.top),
+                bottom=frozenset(t for t in grid.tiles if t.handle in self.bottom),
+            )
+
+        tile_map = grid.get_handle_tile_map()
+
+        def get(handles: frozenset[IntHandle]) -> frozenset[Tile]:
+            return frozenset(tile_map[h] for h in handles if h in tile_map)
+
+        return SharedBorders(
+            left=get(self.left),
+            right=get(self.right),
+            top=get(self.top),
+            bottom=get(self.bottom),
+        )
+
+    def union(self, other: "HandleBorders") -> "HandleBorders":
+        return HandleBorders(
+            left=self.left | other.left,
+            right=self.right | other.right,
+            top=self.top | other.top,
+            bottom=self.bottom | other.bottom,
+        )
+
+    def rotate(
+        self, side: CardinalDirection, /, *, to: CardinalDirection
+    ) -> "HandleBorders":
+        match (to - side) % 4:
+            case 0:
+                return self
+            case 1:
+                return self.rotate_clockwise()
+            case 2:
+                return HandleBorders(
+                    left=self.right, right=self.left, top=self.bottom, bottom=self.top
+                )
+            case 3:
+                return self.rotate_counterclockwise()
+            case _:
+                raise Unreachable
+
+    def rotate_clockwise(self) -> "HandleBorders":
+        return HandleBorders(
+            left=self.bottom, right=self.top, top=self.left, bottom=self.right
+        )
+
+    def rotate_counterclockwise(self) -> "HandleBorders":
+        return HandleBorders(
+            left=self.top, right=self.bottom, top=self.right, bottom=self.left
+        )
+
+    def mirror_horizontally(self) -> "HandleBorders":
+        return HandleBorders(
+            left=self.right, right=self.left, top=self.top, bottom=self.bottom
+        )
+
+    def mirror_vertically(self) -> "HandleBorders":
+        return HandleBorders(
+            left=self.left, right=self.right, top=self.bottom, bottom=self.top
+        )
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class BorderLine:
+    """
+    Line between cells `coordinate - 1` and `coordinate` along the axis
+    perpendicular to `orientation`.
+
+    Tiles ending at `coordinate - 1` are "before" the line, tiles starting at
+    `coordinate` are "after" it. `own_after` tells which side the tile the
+    line was built for is on.
+    """
+
+    orientation: Orientation
+    coordinate: int
+    own_after: bool
 
     @staticmethod
-    def from_(tiles: Iterable[Tile] | Tile, *tiles_: Tile) -> "TileGrid":
-        if isinstance(tiles, Tile):
-            tiles = (tiles,)
+    def of(tile: Tile, side: CardinalDirection) -> "BorderLine":
+        tc = tile.as_corners()
 
-        return TileGrid(tuple(tiles) + tiles_)
+        match side:
+            case CardinalDirection.LEFT:
+                return BorderLine(
+                    orientation=Orientation.VERTICAL, coordinate=tc.c0.x, own_after=True
+                )
+            case CardinalDirection.RIGHT:
+                return BorderLine(
+                    orientation=Orientation.VERTICAL,
+                    coordinate=tc.c3.x + 1,
+                    own_after=False,
+                )
+            case CardinalDirection.UP:
+                return BorderLine(
+                    orientation=Orientation.HORIZONTAL,
+                    coordinate=tc.c0.y,
+                    own_after=True,
+                )
+            case CardinalDirection.DOWN:
+                return BorderLine(
+                    orientation=Orientation.HORIZONTAL,
+                    coordinate=tc.c3.y + 1,
+                    own_after=False,
+                )
 
-    def get_handle_tile_map(self) -> dict[IntHandle, Tile]:
-        return {tile.handle: tile for tile in self.tiles}
+    def has_edge_of(self, tile: Tile, *, after: bool) -> bool:
+        tc = tile.as_corners()
 
-    def get_box(self) -> Tile:
-        return get_box(self.tiles)
+        match self.orientation:
+            case Orientation.VERTICAL:
+                return (
+                    (tc.c0.x == self.coordinate)
+                    if after
+                    else (tc.c3.x == self.coordinate - 1)
+                )
+            case Orientation.HORIZONTAL:
+                return (
+                    (tc.c0.y == self.coordinate)
+                    if after
+                    else (tc.c3.y == self.coordinate - 1)
+                )
 
-    def centralize_origin(self) -> "TileGrid":
-        return self.translate(delta=Cell(x=0, y=0) - self.tiles[0].as_corners().c0)
+    def get_span(self, tile: Tile) -> tuple[int, int]:
+        """
+        Return: `(low, high)` cells of `tile` along the line
+        """
+        tc = tile.as_corners()
 
-    def try_get_tile_by_handle(self, handle: IntHandle) -> Tile | None:
-        for tile in self.tiles:
-            if tile.handle == handle:
-                return tile
-        return None
+        match self.orientation:
+            case Orientation.VERTICAL:
+                return tc.c0.y, tc.c3.y
+            case Orientation.HORIZONTAL:
+                return tc.c0.x, tc.c3.x
 
-    def get_tile_by_handle(self, handle: IntHandle) -> Tile:
-        return_ = self.try_get_tile_by_handle(handle)
-        if return_ is None:
-            raise ValueError
-        return return_
+    def get_extent(self, tile: Tile) -> int:
+        """
+        Size of `tile` across the line
+        """
+        s = tile.as_span()
 
-    def try_get_tile_by_cell(self, cell: Cell) -> Tile | None:
-        for tile in self.tiles:
-            if tile.contains_cell(cell):
-                return tile
+        match self.orientation:
+            case Orientation.VERTICAL:
+                return s.span.x
+            case Orientation.HORIZONTAL:
+                return s.span.y
 
-        return None
+    def get_shift(self, distance: int) -> Cell:
+        """
+        Offset moving the line by `distance`
+        """
+        match self.orientation:
+            case Orientation.VERTICAL:
+                return Cell(distance, 0)
+            case Orientation.HORIZONTAL:
+                return Cell(0, distance)
 
-    def replace_tiles(self, new: Iterable[Tile]) -> "TileGrid":
-        new_ = {t.handle: t for t in new}
-        return TileGrid.from_(new_.get(tile.handle, tile) for tile in self.tiles)
+    def get_before(self, borders: SharedBorders) -> frozenset[Tile]:
+        match self.orientation:
+            case Orientation.VERTICAL:
+                return borders.left
+            case Orientation.HORIZONTAL:
+                return borders.top
 
-    def count_handles(self) -> Counter[IntHandle]:
-        return Counter(t.handle for t in self.tiles)
+    def get_after(self, borders: SharedBorders) -> frozenset[Tile]:
+        match self.orientation:
+            case Orientation.VERTICAL:
+                return borders.right
+            case Orientation.HORIZONTAL:
+                return borders.bottom
 
-    def get_handle_errors(self) -> dict[IntHandle, int]:
-        return {
-            handle: count
-            for handle, count in self.count_handles().items()
-            if count != 1
-        }
+    def get_own(self, borders: SharedBorders) -> frozenset[Tile]:
+        return self.get_after(borders) if self.own_after else self.get_before(borders)
 
-    def get_overlapping_tile_pairs(self) -> tuple[tuple[Tile, Tile], ...]:
-        return_: list[tuple[Tile, Tile]] = []
-        for a, b in itertools.combinations(self.tiles, 2):
-            if a.intersects_with(b):
-                return_.append((a, b))
+    def get_other(self, borders: SharedBorders) -> frozenset[Tile]:
+        return self.get_before(borders) if self.own_after else self.get_after(borders)
 
-        return tuple(return_)
+    def build_borders(
+        self, *, own: Iterable[Tile], other: Iterable[Tile]
+    ) -> SharedBorders:
+        before, after = (other, own) if self.own_after else (own, other)
 
-    def get_area_mismatch(self) -> int:
-        box_area = self.get_box().area()
+        match self.orientation:
+            case Orientation.VERTICAL:
+                return SharedBorders(left=frozenset(before), right=frozenset(after))
+            case Orientation.HORIZONTAL:
+                return SharedBorders(top=frozenset(before), bottom=frozenset(after))
 
-        tiles_area = 0
-        for tile in self.tiles:
-            tiles_area += tile.area()
 
-        return box_area - tiles_area
+@dataclass(frozen=True, slots=True, kw_only=True)
+class AlignableBorder:
+    """
+    `LONGEST` border with its line and extent along it
+    """
 
-    def get_invariant_errors(self) -> TileGridInvariantErrorContainer:
-        return TileGridInvariantErrorContainer(
-            handles=self.get_handle_errors(),
-            overlapping_tiles=self.get_overlapping_tile_pairs(),
-            area_mismatch=self.get_area_mismatch(),
+    line: BorderLine
+    borders: SharedBorders
+    low: int
+    high: int
+
+    @staticmethod
+    def of(borders: SharedBorders) -> "AlignableBorder":
+        tiles_after = borders.right or borders.bottom
+        line = BorderLine.of(
+            next(iter(tiles_after)),
+            CardinalDirection.LEFT if borders.right else CardinalDirection.UP,
         )
+        spans = [line.get_span(t) for t in tiles_after]
 
-    def assert_invariants(self) -> None:
-        invariant_errors = self.get_invariant_errors()
-        if invariant_errors.has_errors():
-            raise InvariantViolation(f"{invariant_errors=}")
+        return AlignableBorder(
+            line=line,
+            borders=borders,
+            low=min(span[0] for span in spans),
+            high=max(span[1] for span in spans),
+        )
 
-    def rotate_clockwise(self) -> "TileGrid":
-        return TileGrid.from_(x.rotate_clockwise() for x in self.tiles)
 
-    def rotate_counterclockwise(self) -> "TileGrid":
-        return TileGrid.from_(x.rotate_counterclockwise() for x in self.tiles)
+@dataclass(frozen=True, slots=True, kw_only=True)
+class EdgeList:
+    """
+    Tiles with an edge on one side of a `BorderLine`, sorted along the line
+    """
 
-    def rotate(
-        self, side: CardinalDirection, /, *, to: CardinalDirection
-    ) -> "TileGrid":
-        return TileGrid.from_(t.rotate(side, to=to) for t in self.tiles)
+    tiles: tuple[Tile, ...]
+    lows: tuple[int, ...]
+    highs: tuple[int, ...]
+    max_highs: tuple[int, ...]
+    """
+    `max_highs[i] == max(highs[: i + 1])`
+    """
+    by_low: dict[int, tuple[Tile, ...]]
+    by_high: dict[int, tuple[Tile, ...]]
 
-    def mirror_horizontally(self) -> "TileGrid":
-        return TileGrid.from_(t.mirror_horizontally() for t in self.tiles)
+    @staticmethod
+    def build(spans: Iterable[tuple[int, int, Tile]]) -> "EdgeList":
+        spans = sorted(spans, key=lambda span: span[0])
+
+        by_low: defaultdict[int, list[Tile]] = defaultdict(list)
+        by_high: defaultdict[int, list[Tile]] = defaultdict(list)
+        for low, high, tile in spans:
+            by_low[low].append(tile)
+            by_high[high].append(tile)
+
+        return EdgeList(
+            tiles=tuple(span[2] for span in spans),
+            lows=tuple(span[0] for span in spans),
+            highs=tuple(span[1] for span in spans),
+            max_highs=tuple(itertools.accumulate((span[1] for span in spans), max)),
+            by_low={key: tuple(value) for key, value in by_low.items()},
+            by_high={key: tuple(value) for key, value in by_high.items()},
+        )
 
-    def mirror_vertically(self) -> "TileGrid":
-        return TileGrid.from_(t.mirror_vertically() for t in self.tiles)
+    def get_overlapping(self, low: int, high: int) -> list[Tile]:
+        """
+        Tiles with spans sharing at least one cell with `[low, high]`
+        """
+        return_: list[Tile] = []
 
-    def translate(self, *, delta: Cell) -> "TileGrid":
-        return TileGrid.from_(tile.translate(delta=delta) for tile in self.tiles)
+        i = bisect.bisect_right(self.lows, high) - 1
+        while (i >= 0) and (self.max_highs[i] >= low):
+            if self.highs[i] >= low:
+                return_.append(self.tiles[i])
+            i -= 1
 
-    def delete_by_handle(self, handle: IntHandle) -> "TileGrid":
-        if self.tiles[0].handle == handle:
-            # Origin must not be deleted
-            return self
+        return return_
 
-        return TileGrid.from_(t for t in self.tiles if t.handle != handle)
 
-    def delete_and_close_gap(
-        self,
-        *,
-        handle: IntHandle,
-        order: tuple[
-            CardinalDirection, CardinalDirection, CardinalDirection, CardinalDirection
-        ] = (
-            CardinalDirection.LEFT,
-            CardinalDirection.UP,
-            CardinalDirection.RIGHT,
-            CardinalDirection.DOWN,
-        ),
-    ) -> "TileGrid":
-        if self.tiles[0].handle == handle:
-            # Origin must not be deleted
-            return self
+EMPTY_EDGE_LIST = EdgeList.build(())
 
-        for direction in order:
-            grid = self.rotate(direction, to=CardinalDirection.LEFT)
 
-            tile = grid.get_tile_by_handle(handle)
-            as_span = tile.as_span()
-            border = grid.get_shortest_left_border(handle)
+@dataclass(frozen=True, slots=True, kw_only=True)
+class EdgeIndex:
+    """
+    Tiles grouped by the `BorderLine`s their edges lie on
+    """
 
-            if (
-                len([t for t in border.right if t.as_span().span.x <= as_span.span.x])
-                > 1
-            ) or (border == SharedBorders()):
-                continue
+    edges: dict[tuple[Orientation, int, bool], EdgeList]
+    """
+    `(orientation, coordinate, after)` -> tiles
+    """
 
-            return (
-                grid.replace_tiles(
-                    itertools.chain(
-                        (
-                            t.corners_c3_add(Cell(as_span.span.x, 0))
-                            for t in border.left
-                        ),
-                        (
-                            t.corners_c0_add(Cell(as_span.span.x, 0))
-                            for t in border.right
-                        ),
-                    )
-                )
-                .delete_by_handle(handle)
-                .rotate(CardinalDirection.LEFT, to=direction)
-            )
+    @staticmethod
+    def build(tiles: Iterable[Tile]) -> "EdgeIndex":
+        edges: defaultdict[tuple[Orientation, int, bool], list[tuple[int, int, Tile]]]
+        edges = defaultdict(list)
 
-        return self
+        for tile in tiles:
+            for key, span in EdgeIndex._get_edges(tile):
+                edges[key].append(span)
 
-    def insert(
-        self,
-        *,
-        anchor_handle: IntHandle,
-        direction: CardinalDirection,
-        new_tile_handle: IntHandle,
-    ) -> "TileGrid":
-        return (
-            self.rotate(direction, to=CardinalDirection.RIGHT)
-            .insert_to_right(
-                anchor_handle=anchor_handle, new_tile_handle=new_tile_handle
-            )
-            .rotate(CardinalDirection.RIGHT, to=direction)
+        return EdgeIndex(
+            edges={key: EdgeList.build(value) for key, value in edges.items()}
         )
 
-    def insert_to_right(
-        self,
-        *,
-        anchor_handle: IntHandle,
-        new_tile_handle: IntHandle,
-    ) -> "TileGrid":
-        # Guard {{{
-        anchor_tile = self.try_get_tile_by_handle(anchor_handle)
-        if anchor_tile is None:
-            return self
-        # }}}
+    @staticmethod
+    def _get_edges(
+        tile: Tile,
+    ) -> tuple[tuple[tuple[Orientation, int, bool], tuple[int, int, Tile]], ...]:
+        tc = tile.as_corners()
 
-        new_tiles: list[Tile] = []
-        line = Line(
-            coordinate=anchor_tile.as_corners().c3.x,
-            orientation=Orientation.VERTICAL,
+        vertical = (tc.c0.y, tc.c3.y, tile)
+        horizontal = (tc.c0.x, tc.c3.x, tile)
+
+        return (
+            ((Orientation.VERTICAL, tc.c0.x, True), vertical),
+            ((Orientation.VERTICAL, tc.c3.x + 1, False), vertical),
+            ((Orientation.HORIZONTAL, tc.c0.y, True), horizontal),
+            ((Orientation.HORIZONTAL, tc.c3.y + 1, False), horizontal),
         )
-        # Make space (to the RIGHT) {{{
-        for tile in self.tiles:
-            if tile.handle == anchor_handle:
-                new_tiles.append(tile)
 
-            elif (not line.intersects_tile(tile)) and line.on_positive_side_of_tile(
-                tile
-            ):
-                new_tiles.append(tile)
-            elif line.intersects_tile(tile):
-                new_tiles.append(
-                    tile.replace_tile(
-                        TileAsCorners(
-                            c0=tile.as_corners().c0,
-                            c3=tile.as_corners().c3 + Cell(x=1, y=0),
-                        )
-                    )
+    def replace(self, old: Iterable[Tile], new: Iterable[Tile]) -> "EdgeIndex":
+        """
+        Index with `old` tiles swapped for `new` ones, only rebuilding the
+        lines their edges lie on
+        """
+        removed: defaultdict[tuple[Orientation, int, bool], set[Tile]]
+        removed = defaultdict(set)
+        for tile in old:
+            for key, _ in EdgeIndex._get_edges(tile):
+                removed[key].add(tile)
+
+        added: defaultdict[tuple[Orientation, int, bool], list[tuple[int, int, Tile]]]
+        added = defaultdict(list)
+        for tile in new:
+            for key, span in EdgeIndex._get_edges(tile):
+                added[key].append(span)
+
+        edges = dict(self.edges)
+        for key in removed.keys() | added.keys():
+            edge_list = edges.get(key, EMPTY_EDGE_LIST)
+            removed_ = removed.get(key, set[Tile]())
+            spans = [
+                span
+                for span in zip(
+                    edge_list.lows, edge_list.highs, edge_list.tiles, strict=True
                 )
-            elif (not line.intersects_tile(tile)) and line.on_negative_side_of_tile(
-                tile
-            ):
-                new_tiles.append(
-                    tile.replace_tile(
-                        TileAsCorners(
-                            c0=tile.as_corners().c0 + Cell(x=1, y=0),
-                            c3=tile.as_corners().c3 + Cell(x=1, y=0),
-                        )
+                if span[2] not in removed_
+            ] + added.get(key, [])
+
+            if spans:
+                edges[key] = EdgeList.build(spans)
+            else:
+                edges.pop(key, None)
+
+        return EdgeIndex(edges=edges)
+
+    def get(self, line: BorderLine, *, after: bool) -> EdgeList:
+        return self.edges.get(
+            (line.orientation, line.coordinate, after), EMPTY_EDGE_LIST
+        )
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class SpatialIndex:
+    """
+    Uniform grid of square buckets over the tiles.
+
+    Every tile is registered in each bucket it covers, so point and area
+    queries only look at tiles from the buckets they touch.
+    """
+
+    tiles: tuple[Tile, ...]
+    bucket_side: int
+    buckets: dict[tuple[int, int], tuple[int, ...]]
+    """
+    Bucket coordinates -> indexes into `tiles` (ascending)
+    """
+
+    @staticmethod
+    def build(tiles: Iterable[Tile]) -> "SpatialIndex":
+        tiles = tuple(tiles)
+        if not tiles:
+            return SpatialIndex(tiles=tiles, bucket_side=1, buckets={})
+
+        # Aim for about one tile per bucket
+        box = get_box(tiles).as_span()
+        bucket_side = max(1, math.isqrt((box.span.x * box.span.y) // len(tiles)))
+
+        buckets: defaultdict[tuple[int, int], list[int]] = defaultdict(list)
+        for i, tile in enumerate(tiles):
+            tc = tile.as_corners()
+            for bx in range(tc.c0.x // bucket_side, (tc.c3.x // bucket_side) + 1):
+                for by in range(tc.c0.y // bucket_side, (tc.c3.y // bucket_side) + 1):
+                    buckets[(bx, by)].append(i)
+
+        return SpatialIndex(
+            tiles=tiles,
+            bucket_side=bucket_side,
+            buckets={key: tuple(value) for key, value in buckets.items()},
+        )
+
+    def try_get_tile_by_cell(self, cell: Cell) -> Tile | None:
+        bucket = self.buckets.get(
+            (cell.x // self.bucket_side, cell.y // self.bucket_side), ()
+        )
+        for i in bucket:
+            if self.tiles[i].contains_cell(cell):
+                return self.tiles[i]
+
+        return None
+
+    def get_tiles_intersecting(self, area: Tile) -> tuple[Tile, ...]:
+        """
+        Return tiles sharing at least one cell with `area`, in grid order
+        """
+        ac = area.as_corners()
+
+        bx0, bx3 = ac.c0.x // self.bucket_side, ac.c3.x // self.bucket_side
+        by0, by3 = ac.c0.y // self.bucket_side, ac.c3.y // self.bucket_side
+
+        indexes: Iterable[int]
+        if (bx3 - bx0 + 1) * (by3 - by0 + 1) > len(self.buckets):
+            # Area covers most of the grid, scanning is cheaper
+            indexes = range(len(self.tiles))
+        else:
+            indexes = sorted(
+                set(
+                    itertools.chain.from_iterable(
+                        self.buckets.get((bx, by), ())
+                        for bx in range(bx0, bx3 + 1)
+                        for by in range(by0, by3 + 1)
                     )
                 )
-        # }}}
+            )
 
-        # Insert new Tile (on the RIGHT) {{{
-        new_tiles.append(
-            Tile.build(
-                TileAsStep(
-                    cell=anchor_tile.as_corners().c3 + Cell(x=1, y=0),
-                    step=Cell(x=0, y=-anchor_tile.as_step().step.y),
+        return tuple(
+            self.tiles[i] for i in indexes if overlap(self.tiles[i].as_corners(), ac)
+        )
+
+
+TILE_VECTOR_CHUNK = 32
+
+
+@dataclass(frozen=True, slots=True)
+class TileVectorBranch:
+    children: "tuple[TileVectorNode, ...]"
+    ends: tuple[int, ...]
+    """
+    Number of tiles under `children[: i + 1]`, for every `i`
+    """
+
+
+# Leaves are tuples of tiles
+type TileVectorNode = TileVectorBranch | tuple[Tile, ...]
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class TileVector(Sequence[Tile]):
+    """
+    Persistent sequence of tiles.
+
+    A tree of chunks of up to `TILE_VECTOR_CHUNK` tiles. Updates copy only
+    the paths to the chunks they change, so a vector shares the rest with
+    the one it came from. Compares and hashes like the tuple of its tiles.
+    Chunks stay at least half full, except for the root.
+    """
+
+    root: TileVectorNode = ()
+
+    _hash: int | None = dataclasses.field(default=None, repr=False)
+
+    @staticmethod
+    def from_(tiles: Iterable[Tile]) -> "TileVector":
+        tiles = tuple(tiles)
+        nodes: list[TileVectorNode] = [
+            tiles[i : i + TILE_VECTOR_CHUNK]
+            for i in range(0, len(tiles), TILE_VECTOR_CHUNK)
+        ]
+        while len(nodes) > 1:
+            nodes = [
+                TileVector._build_branch(nodes[i : i + TILE_VECTOR_CHUNK])
+                for i in range(0, len(nodes), TILE_VECTOR_CHUNK)
+            ]
+
+        return TileVector(nodes[0] if nodes else ())
+
+    @override
+    def __len__(self) -> int:
+        return TileVector._get_length(self.root)
+
+    @overload
+    def __getitem__(self, index: int) -> Tile:
+        pass
+
+    @overload
+    def __getitem__(self, index: slice) -> tuple[Tile, ...]:
+        pass
+
+    @override
+    def __getitem__(self, index: int | slice) -> Tile | tuple[Tile, ...]:
+        if isinstance(index, slice):
+            return tuple(self)[index]
+
+        index = self._check_index(index)
+
+        node = self.root
+        while isinstance(node, TileVectorBranch):
+            j = bisect.bisect_right(node.ends, index)
+            if j:
+                index -= node.ends[j - 1]
+            node = node.children[j]
+
+        return node[index]
+
+    @override
+    def __iter__(self) -> Iterator[Tile]:
+        return itertools.chain.from_iterable(TileVector._get_leaves(self.root))
+
+    @override
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, TileVector):
+            if len(self) != len(other):
+                return False
+            if (
+                (self._hash is not None)
+                and (other._hash is not None)
+                and (self._hash != other._hash)
+            ):
+                return False
+            return TileVector._equal(self.root, other.root)
+        if isinstance(other, tuple):
+            items = cast(tuple[object, ...], other)
+            return (len(self) == len(items)) and all(map(operator.eq, self, items))
+        return NotImplemented
+
+    @override
+    def __hash__(self) -> int:
+        """
+        Computed once per vector
+        """
+        if self._hash is None:
+            object.__setattr__(self, "_hash", hash(tuple(self)))
+            assert self._hash is not None
+
+        return self._hash
+
+    @override
+    def __repr__(self) -> str:
+        return f"TileVector({tuple(self)!r})"
+
+    def set_many(self, items: Iterable[tuple[int, Tile]]) -> "TileVector":
+        """
+        Copy with every `(index, tile)` of `items` set, the last one wins
+        """
+        items_ = sorted(
+            ((self._check_index(i), tile) for i, tile in items),
+            key=lambda item: item[0],
+        )
+        if not items_:
+            return self
+
+        return TileVector(TileVector._set(self.root, items_, 0))
+
+    def insert(self, index: int, tile: Tile) -> "TileVector":
+        """
+        Copy with `tile` before the tile at `index`, `len(self)` appends
+        """
+        if not 0 <= index <= len(self):
+            raise IndexError(index)
+
+        nodes = TileVector._insert(self.root, index, tile)
+        return TileVector(
+            nodes[0] if len(nodes) == 1 else TileVector._build_branch(nodes)
+        )
+
+    def append(self, tile: Tile) -> "TileVector":
+        return self.insert(len(self), tile)
+
+    def delete(self, index: int) -> "TileVector":
+        root = TileVector._delete(self.root, self._check_index(index))
+        while isinstance(root, TileVectorBranch) and len(root.children) == 1:
+            root = root.children[0]
+
+        return TileVector(() if root is None else root)
+
+    def splice(self, index: int, tiles: Sequence[Tile]) -> "TileVector":
+        """
+        Copy with the tile at `index` replaced by `tiles`
+        """
+        if not tiles:
+            return self.delete(index)
+
+        vector = self.set_many(((index, tiles[0]),))
+        for offset, tile in enumerate(tiles[1:], start=1):
+            vector = vector.insert(index + offset, tile)
+
+        return vector
+
+    def _check_index(self, index: int) -> int:
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError(index)
+
+        return index
+
+    @staticmethod
+    def _get_length(node: TileVectorNode) -> int:
+        if isinstance(node, TileVectorBranch):
+            return node.ends[-1]
+
+        return len(node)
+
+    @staticmethod
+    def _build_branch(children: Sequence[TileVectorNode]) -> TileVectorBranch:
+        return TileVectorBranch(
+            children=tuple(children),
+            ends=tuple(itertools.accumulate(map(TileVector._get_length, children))),
+        )
+
+    @staticmethod
+    def _get_leaves(node: TileVectorNode) -> Iterator[tuple[Tile, ...]]:
+        if isinstance(node, TileVectorBranch):
+            for child in node.children:
+                yield from TileVector._get_leaves(child)
+        else:
+            yield node
+
+    @staticmethod
+    def _equal(a: TileVectorNode, b: TileVectorNode) -> bool:
+        """
+        `a` and `b` are of the same length. Shared chunks are not compared.
+        """
+        if a is b:
+            return True
+
+        if (
+            isinstance(a, TileVectorBranch)
+            and isinstance(b, TileVectorBranch)
+            and (a.ends == b.ends)
+        ):
+            return all(map(TileVector._equal, a.children, b.children))
+
+        return all(
+            map(
+                operator.eq,
+                itertools.chain.from_iterable(TileVector._get_leaves(a)),
+                itertools.chain.from_iterable(TileVector._get_leaves(b)),
+            )
+        )
+
+    @staticmethod
+    def _set(
+        node: TileVectorNode, items: Sequence[tuple[int, Tile]], offset: int
+    ) -> TileVectorNode:
+        """
+        `items` are ascending and within `node`, `offset` is the index of its
+        first tile
+        """
+        if not isinstance(node, TileVectorBranch):
+            leaf = list(node)
+            for i, tile in items:
+                leaf[i - offset] = tile
+            return tuple(leaf)
+
+        children = list(node.children)
+        k = 0
+        while k < len(items):
+            j = bisect.bisect_right(node.ends, items[k][0] - offset)
+            start = offset + (node.ends[j - 1] if j else 0)
+            end = offset + node.ends[j]
+
+            m = k
+            while (m < len(items)) and (items[m][0] < end):
+                m += 1
+
+            children[j] = TileVector._set(children[j], items[k:m], start)
+            k = m
+
+        return TileVectorBranch(children=tuple(children), ends=node.ends)
+
+    @staticmethod
+    def _insert(
+        node: TileVectorNode, index: int, tile: Tile
+    ) -> tuple[TileVectorNode, ...]:
+        """
+        Return: `node` with `tile` inserted, split in two once it overflows
+        """
+        if not isinstance(node, TileVectorBranch):
+            leaf = node[:index] + (tile,) + node[index:]
+            if len(leaf) <= TILE_VECTOR_CHUNK:
+                return (leaf,)
+            half = len(leaf) // 2
+            return (leaf[:half], leaf[half:])
+
+        j = min(bisect.bisect_left(node.ends, index), len(node.children) - 1)
+        start = node.ends[j - 1] if j else 0
+        children = (
+            node.children[:j]
+            + TileVector._insert(node.children[j], index - start, tile)
+            + node.children[j + 1 :]
+        )
+        if len(children) <= TILE_VECTOR_CHUNK:
+            return (TileVector._build_branch(children),)
+        half = len(children) // 2
+        return (
+            TileVector._build_branch(children[:half]),
+            TileVector._build_branch(children[half:]),
+        )
+
+    @staticmethod
+    def _delete(node: TileVectorNode, index: int) -> TileVectorNode | None:
+        """
+        Return: `node` without the tile at `index`, `None` once it is empty
+        """
+        if not isinstance(node, TileVectorBranch):
+            return (node[:index] + node[index + 1 :]) or None
+
+        j = bisect.bisect_right(node.ends, index)
+        start = node.ends[j - 1] if j else 0
+        child = TileVector._delete(node.children[j], index - start)
+        if child is None:
+            children = node.children[:j] + node.children[j + 1 :]
+        elif TileVector._is_underfull(child) and (len(node.children) > 1):
+            # Merge with a sibling, split again if that overflows
+            k = j - 1 if j else j + 1
+            low, high = min(j, k), max(j, k)
+            pair = (child, node.children[k]) if j < k else (node.children[k], child)
+            children = (
+                node.children[:low]
+                + TileVector._merge(*pair)
+                + node.children[high + 1 :]
+            )
+        else:
+            children = node.children[:j] + (child,) + node.children[j + 1 :]
+
+        return TileVector._build_branch(children) if children else None
+
+    @staticmethod
+    def _is_underfull(node: TileVectorNode) -> bool:
+        if isinstance(node, TileVectorBranch):
+            return len(node.children) < TILE_VECTOR_CHUNK // 2
+
+        return len(node) < TILE_VECTOR_CHUNK // 2
+
+    @staticmethod
+    def _merge(a: TileVectorNode, b: TileVectorNode) -> tuple[TileVectorNode, ...]:
+        """
+        Adjacent nodes of the same depth as one node, or two if they do not fit
+        """
+        if isinstance(a, TileVectorBranch) and isinstance(b, TileVectorBranch):
+            children = a.children + b.children
+            if len(children) <= TILE_VECTOR_CHUNK:
+                return (TileVector._build_branch(children),)
+            half = len(children) // 2
+            return (
+                TileVector._build_branch(children[:half]),
+                TileVector._build_branch(children[half:]),
+            )
+
+        assert not isinstance(a, TileVectorBranch)
+        assert not isinstance(b, TileVectorBranch)
+        leaf = a + b
+        if len(leaf) <= TILE_VECTOR_CHUNK:
+            return (leaf,)
+        half = len(leaf) // 2
+        return (leaf[:half], leaf[half:])
+
+
+@dataclass(frozen=True, slots=True)
+class TileGrid:
+    tiles: Sequence[Tile]
+    """
+    Always a `TileVector` once built, so edits share storage with the grid
+    they were made on
+    """
+
+    _spatial_index: SpatialIndex | None = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _handle_index: dict[IntHandle, int] | None = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _handle_tile_map: dict[IntHandle, Tile] | None = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _edge_index: EdgeIndex | None = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _fingerprint: int | None = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _hover_maps: "dict[tuple[int, BorderMode], HoverMap] | None" = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.tiles, TileVector):
+            object.__setattr__(self, "tiles", TileVector.from_(self.tiles))
+
+    @staticmethod
+    def from_(tiles: Iterable[Tile] | Tile, *tiles_: Tile) -> "TileGrid":
+        if isinstance(tiles, Tile):
+            tiles = (tiles,)
+
+        return TileGrid(TileVector.from_(itertools.chain(tiles, tiles_)))
+
+    def get_tile_vector(self) -> TileVector:
+        assert isinstance(self.tiles, TileVector)
+        return self.tiles
+
+    @override
+    def __hash__(self) -> int:
+        """
+        Computed once per grid, so grids are cheap to use as cache keys
+        """
+        if self._fingerprint is None:
+            object.__setattr__(self, "_fingerprint", hash(self.tiles))
+            assert self._fingerprint is not None
+
+        return self._fingerprint
+
+    def get_handle_index(self) -> Mapping[IntHandle, int]:
+        """
+        Handle -> index of the first tile with that handle
+        """
+        if self._handle_index is None:
+            handle_index: dict[IntHandle, int] = {}
+            for i, tile in enumerate(self.tiles):
+                handle_index.setdefault(tile.handle, i)
+            object.__setattr__(self, "_handle_index", handle_index)
+            return handle_index
+
+        return self._handle_index
+
+    def has_unique_handles(self) -> bool:
+        return len(self.get_handle_index()) == len(self.tiles)
+
+    def get_handle_tile_map(self) -> Mapping[IntHandle, Tile]:
+        if self._handle_tile_map is None:
+            handle_tile_map = {
+                handle: self.tiles[i] for handle, i in self.get_handle_index().items()
+            }
+            object.__setattr__(self, "_handle_tile_map", handle_tile_map)
+            return handle_tile_map
+
+        return self._handle_tile_map
+
+    def get_box(self) -> Tile:
+        return get_box(self.tiles)
+
+    def centralize_origin(self) -> "TileGrid":
+        return self.translate(delta=Cell(x=0, y=0) - self.tiles[0].as_corners().c0)
+
+    def try_get_tile_by_handle(self, handle: IntHandle) -> Tile | None:
+        i = self.get_handle_index().get(handle)
+        return None if i is None else self.tiles[i]
+
+    def get_tile_by_handle(self, handle: IntHandle) -> Tile:
+        return_ = self.try_get_tile_by_handle(handle)
+        if return_ is None:
+            raise ValueError
+        return return_
+
+    def get_spatial_index(self) -> SpatialIndex:
+        if self._spatial_index is None:
+            object.__setattr__(self, "_spatial_index", SpatialIndex.build(self.tiles))
+            assert self._spatial_index is not None
+
+        return self._spatial_index
+
+    def get_edge_index(self) -> EdgeIndex:
+        if self._edge_index is None:
+            object.__setattr__(self, "_edge_index", EdgeIndex.build(self.tiles))
+            assert self._edge_index is not None
+
+        return self._edge_index
+
+    def get_hover_map(self, *, proximity: int = 1, mode: BorderMode) -> "HoverMap":
+        if self._hover_maps is None:
+            object.__setattr__(self, "_hover_maps", {})
+            assert self._hover_maps is not None
+
+        key = (proximity, mode)
+        if key not in self._hover_maps:
+            self._hover_maps[key] = HoverMap(grid=self, proximity=proximity, mode=mode)
+
+        return self._hover_maps[key]
+
+    def try_get_tile_by_cell(self, cell: Cell) -> Tile | None:
+        return self.get_spatial_index().try_get_tile_by_cell(cell)
+
+    def get_tiles_intersecting(self, area: Tile) -> tuple[Tile, ...]:
+        return self.get_spatial_index().get_tiles_intersecting(area)
+
+    def replace_tiles(self, new: Iterable[Tile]) -> "TileGrid":
+        new_ = {t.handle: t for t in new}
+
+        if not self.has_unique_handles():
+            return TileGrid.from_(new_.get(tile.handle, tile) for tile in self.tiles)
+
+        handle_index = self.get_handle_index()
+        tiles = self.get_tile_vector()
+        replaced: list[Tile] = []
+        items: list[tuple[int, Tile]] = []
+        for handle, tile in new_.items():
+            i = handle_index.get(handle)
+            if (i is not None) and (tiles[i] != tile):
+                replaced.append(tiles[i])
+                items.append((i, tile))
+
+        if not replaced:
+            return self
+
+        grid = self._derive(tiles.set_many(items))
+        if self._edge_index is not None:
+            object.__setattr__(
+                grid,
+                "_edge_index",
+                self._edge_index.replace(
+                    replaced, (new_[tile.handle] for tile in replaced)
                 ),
-                handle=new_tile_handle,
+            )
+
+        return grid
+
+    def replace_tiles_at(
+        self, positions: Sequence[int], new: Sequence[Tile]
+    ) -> "TileGrid":
+        """
+        `replace_tiles` for callers that already know the positions, every new
+        tile must keep the handle of the tile it replaces
+        """
+        tiles = self.get_tile_vector()
+        replaced: list[Tile] = []
+        items: list[tuple[int, Tile]] = []
+        for i, tile in zip(positions, new, strict=True):
+            assert tiles[i].handle == tile.handle
+            if tiles[i] != tile:
+                replaced.append(tiles[i])
+                items.append((i, tile))
+
+        if not replaced:
+            return self
+
+        grid = self._derive(tiles.set_many(items))
+        if self._edge_index is not None:
+            object.__setattr__(
+                grid,
+                "_edge_index",
+                self._edge_index.replace(replaced, (tile for _, tile in items)),
+            )
+
+        return grid
+
+    def _derive(self, tiles: TileVector) -> "TileGrid":
+        """
+        Build a grid with the same handles at the same positions as `self`
+        """
+        grid = TileGrid(tiles)
+        object.__setattr__(grid, "_handle_index", self._handle_index)
+        return grid
+
+    def count_handles(self) -> Counter[IntHandle]:
+        return Counter(t.handle for t in self.tiles)
+
+    def get_handle_errors(self) -> dict[IntHandle, int]:
+        return {
+            handle: count
+            for handle, count in self.count_handles().items()
+            if count != 1
+        }
+
+    def get_overlapping_tile_pairs(self) -> tuple[tuple[Tile, Tile], ...]:
+        tiles = self.tiles
+        return tuple(
+            (tiles[i], tiles[j])
+            for i, j in get_overlapping_index_pairs(
+                tuple(tile.as_corners() for tile in tiles)
             )
         )
-        # }}}
 
-        return TileGrid.from_(new_tiles)
+    def get_area_mismatch(self) -> int:
+        box_area = self.get_box().area()
+
+        tiles_area = 0
+        for tile in self.tiles:
+            tiles_area += tile.area()
+
+        return box_area - tiles_area
+
+    def get_invariant_errors(self) -> TileGridInvariantErrorContainer:
+        return TileGridInvariantErrorContainer(
+            handles=self.get_handle_errors(),
+            overlapping_tiles=self.get_overlapping_tile_pairs(),
+            area_mismatch=self.get_area_mismatch(),
+        )
+
+    def assert_invariants(self) -> None:
+        invariant_errors = self.get_invariant_errors()
+        if invariant_errors.has_errors():
+            raise InvariantViolation(f"{invariant_errors=}")
+
+    def rotate_clockwise(self) -> "TileGrid":
+        return TileGrid.from_(x.rotate_clockwise() for x in self.tiles)
+
+    def rotate_counterclockwise(self) -> "TileGrid":
+        return TileGrid.from_(x.rotate_counterclockwise() for x in self.tiles)
+
+    def rotate(
+        self, side: CardinalDirection, /, *, to: CardinalDirection
+    ) -> "TileGrid":
+        return TileGrid.from_(t.rotate(side, to=to) for t in self.tiles)
+
+    def mirror_horizontally(self) -> "TileGrid":
+        return TileGrid.from_(t.mirror_horizontally() for t in self.tiles)
+
+    def mirror_vertically(self) -> "TileGrid":
+        return TileGrid.from_(t.mirror_vertically() for t in self.tiles)
+
+    def translate(self, *, delta: Cell) -> "TileGrid":
+        return TileGrid.from_(tile.translate(delta=delta) for tile in self.tiles)
+
+    def transform(self, transform: Transform) -> "TileGrid":
+        return self.view().with_transform(transform).materialize()
+
+    def view(self) -> "TileGridView":
+        return TileGridView(self)
+
+    def delete_by_handle(self, handle: IntHandle) -> "TileGrid":
+        if self.tiles[0].handle == handle:
+            # Origin must not be deleted
+            return self
+
+        if not self.has_unique_handles():
+            return TileGrid.from_(t for t in self.tiles if t.handle != handle)
+
+        i = self.get_handle_index().get(handle)
+        if i is None:
+            return self
+
+        grid = TileGrid(self.get_tile_vector().delete(i))
+        if self._edge_index is not None:
+            object.__setattr__(
+                grid, "_edge_index", self._edge_index.replace((self.tiles[i],), ())
+            )
+
+        return grid
+
+    def append(self, tile: Tile) -> "TileGrid":
+        grid = TileGrid(self.get_tile_vector().append(tile))
+        if self._edge_index is not None:
+            object.__setattr__(
+                grid, "_edge_index", self._edge_index.replace((), (tile,))
+            )
+
+        return grid
+
+    def delete_and_close_gap(
+        self,
+        *,
+        handle: IntHandle,
+        order: tuple[
+            CardinalDirection, CardinalDirection, CardinalDirection, CardinalDirection
+        ] = (
+            CardinalDirection.LEFT,
+            CardinalDirection.UP,
+            CardinalDirection.RIGHT,
+            CardinalDirection.DOWN,
+        ),
+    ) -> "TileGrid":
+        if self.tiles[0].handle == handle:
+            # Origin must not be deleted
+            return self
+
+        tile = self.get_tile_by_handle(handle)
+
+        for direction in order:
+            line = BorderLine.of(tile, direction)
+            border = self._get_shortest_border(tile, direction)
+
+            tiles_own = line.get_own(border)
+            extent = line.get_extent(tile)
+
+            if (len([t for t in tiles_own if line.get_extent(t) <= extent]) > 1) or (
+                border == SharedBorders()
+            ):
+                continue
+
+            # Tiles on the other side of the border grow over the gap, tiles
+            # on the tile's side shrink by as much
+            shift = line.get_shift(extent if line.own_after else -extent)
+            return self.replace_tiles(
+                itertools.chain(
+                    (t.corners_c3_add(shift) for t in line.get_before(border)),
+                    (t.corners_c0_add(shift) for t in line.get_after(border)),
+                )
+            ).delete_by_handle(handle)
+
+        return self
+
+    def insert(
+        self,
+        *,
+        anchor_handle: IntHandle,
+        direction: CardinalDirection,
+        new_tile_handle: IntHandle,
+    ) -> "TileGrid":
+        return (
+            self.view()
+            .rotate(direction, to=CardinalDirection.RIGHT)
+            .insert_to_right(
+                anchor_handle=anchor_handle, new_tile_handle=new_tile_handle
+            )
+            .grid
+        )
+
+    def insert_to_right(
+        self,
+        *,
+        anchor_handle: IntHandle,
+        new_tile_handle: IntHandle,
+    ) -> "TileGrid":
+        return (
+            self.view()
+            .insert_to_right(
+                anchor_handle=anchor_handle, new_tile_handle=new_tile_handle
+            )
+            .grid
+        )
 
     def split_tile(
         self,
@@ -869,12 +1854,13 @@ class TileGrid:
         new_tile_handle: IntHandle,
     ) -> "TileGrid":
         return (
-            self.rotate(direction, to=CardinalDirection.RIGHT)
+            self.view()
+            .rotate(direction, to=CardinalDirection.RIGHT)
             .split_tile_to_right(
                 tile_handle=tile_handle,
                 new_tile_handle=new_tile_handle,
             )
-            .rotate(CardinalDirection.RIGHT, to=direction)
+            .grid
         )
 
     def split_tile_to_right(
@@ -883,208 +1869,303 @@ class TileGrid:
         tile_handle: IntHandle,
         new_tile_handle: IntHandle,
     ) -> "TileGrid":
-        # Guards {{{
-        tile = self.try_get_tile_by_handle(tile_handle)
-        if tile is None:
-            return self
-        # }}}
-
-        new_tiles: list[Tile] = []
-        for tile in self.tiles:
-            corners = tile.as_corners()
-            width = corners.c3.x - corners.c0.x
+        return (
+            self.view()
+            .split_tile_to_right(
+                tile_handle=tile_handle,
+                new_tile_handle=new_tile_handle,
+            )
+            .grid
+        )
 
-            if (tile.handle != tile_handle) or (width < 2):
-                new_tiles.append(tile)
-                continue
+    def resize(self, *, new_boundary: Cell) -> "TileGrid":
+        """
+        Same as `resize_along_x`, rotating clockwise, `resize_along_x` again
+        and rotating back, without building the intermediate grids.
+        """
+        self.assert_invariants()
 
-            c3 = Cell(x=corners.c0.x + (width // 2), y=corners.c3.y)
-            c0 = Cell(x=c3.x + 1, y=corners.c0.y)
+        return resize_tiles(self.tiles, new_boundary)
 
-            new_tiles.extend(
-                (
-                    tile.replace_tile(
-                        TileAsCorners(c0=corners.c0, c3=c3),
-                    ),
-                    Tile.build(
-                        TileAsCorners(c0=c0, c3=corners.c3),
-                        handle=new_tile_handle,
-                    ),
-                )
-            )
+    def resize_many(
+        self, new_boundaries: Iterable[Cell], *, executor: Executor | None = None
+    ) -> list["TileGrid"]:
+        """
+        `resize` to every boundary of `new_boundaries`.
 
-        return TileGrid.from_(new_tiles)
+        Invariants and the rows along x are only computed once. Pass a
+        `ProcessPoolExecutor` as `executor` to resize in parallel.
+        """
+        self.assert_invariants()
 
-    def resize(self, *, new_boundary: Cell) -> "TileGrid":
-        return (
-            self.resize_along_x(x_length_new=new_boundary.x)
-            .rotate_clockwise()
-            .resize_along_x(x_length_new=new_boundary.y)
-            .rotate_counterclockwise()
+        spans_x = get_spans_along_x(self.tiles)
+        resize = functools.partial(
+            resize_tiles,
+            self.tiles,
+            spans_x=spans_x,
+            rows_x=get_rows(
+                spans_x, sorted(range(len(spans_x)), key=lambda i: spans_x[i][0])
+            ),
         )
 
+        if executor is None:
+            return [resize(new_boundary) for new_boundary in new_boundaries]
+
+        return list(executor.map(resize, new_boundaries))
+
     def resize_along_x(
         self, *, x_length_new: int, mode: Literal["balance", "scale"] = "scale"
     ) -> "TileGrid":
         self.assert_invariants()
 
-        @dataclass(frozen=True, slots=True, kw_only=True)
-        class TileVar:
-            cell_x: Variable
-            span_x: Variable
+        return set_spans_along_x(
+            self.tiles,
+            resize_spans(
+                get_spans_along_x(self.tiles), length_new=x_length_new, mode=mode
+            ),
+        )
+
+    def get_top_ys(self) -> frozenset[int]:
+        return get_top_ys(self.tiles)
+
+    def un_occupy(self, area: "Tile", /, *, prefer: Orientation) -> "TileGrid | None":
+        tiles: list[Tile] = []
+        for tile in self.tiles:
+            processed_tile = tile.un_occupy(area, prefer=prefer)
+            if processed_tile is None:
+                return None
+            tiles.append(processed_tile)
 
-            cell_y: int
-            span_y: int
+        return TileGrid.from_(tiles)
 
-            handle: IntHandle
+    def align_borders(self, *, proximity: int = 1) -> "TileGrid":
+        assert proximity >= 0, f"{proximity=}, expected `proximity >= 0`"
 
-        tiles_sorted = tuple(
-            sorted(self.tiles, key=lambda tile: tile.as_corners().c0.x)
+        # Align in every direction, moving from one frame to the next with a
+        # single composed transform
+        steps = (
+            Transform().mirror_horizontally(),
+            Transform().mirror_vertically(),
+            Transform().mirror_horizontally(),
+            Transform().mirror_vertically().rotate_clockwise(),
+            Transform().mirror_horizontally(),
+            Transform().mirror_vertically(),
+            Transform().mirror_horizontally(),
+            Transform().mirror_vertically().rotate_counterclockwise(),
         )
 
-        # Variable declaration {{{
-        tile_vars: dict[IntHandle, TileVar] = {
-            tile.handle: TileVar(
-                cell_x=Variable(f"cell.x.{tile.handle}"),
-                span_x=Variable(f"span.x.{tile.handle}"),
-                cell_y=tile.as_span().cell.y,
-                span_y=tile.as_span().span.y,
-                handle=tile.handle,
-            )
-            for tile in tiles_sorted
-        }
-        # }}}
+        grid = self
+        for step in steps:
+            grid = grid.align_left_borders_to_left(proximity=proximity).transform(step)
 
-        # Lines {{{
-        tile_vars_groups: defaultdict[int, list[TileVar]] = defaultdict(list)
-        for y in self.get_top_ys():
-            line = Line(coordinate=y, orientation=Orientation.HORIZONTAL)
-            for tile in tiles_sorted:
-                if line.intersects_tile(tile):
-                    tile_vars_groups[y].append(tile_vars[tile.handle])
+        return grid
 
-        max_tiles = max(len(tiles) for tiles in tile_vars_groups.values())
-        # }}}
+    def align_border_clusters(
+        self, *, proximity: int = 1, handles: Iterable[IntHandle] | None = None
+    ) -> "TileGrid":
+        """
+        Clustering counterpart of `align_borders`.
 
-        solver = Solver()
+        Borders meeting end to end at a line across them, with an offset of
+        at most `proximity`, are clustered. Every border of a cluster moves
+        to the longest one, unless it would collapse a tile. Vertical
+        borders are aligned first, then horizontal ones.
 
-        for tile_var in tile_vars.values():
-            solver.addConstraint(tile_var.span_x >= 1)
-            solver.addConstraint(tile_var.span_x <= x_length_new)
+        A move can bring other borders within `proximity`, so tiles moved by
+        a pass are aligned in turn until nothing moves. With `handles`, the
+        first pass only aligns clusters reachable from borders of those
+        tiles, see `get_changed_handles` to get them from a diff.
+        """
+        assert proximity >= 0, f"{proximity=}, expected `proximity >= 0`"
 
-            match mode:
-                case "scale":
-                    # Scaling {{{
+        grid = self
+        if handles is None:
+            dirty: set[IntHandle] = set()
+            for orientation in (Orientation.VERTICAL, Orientation.HORIZONTAL):
+                grid, moved_ = grid._align_border_clusters(
+                    grid._get_border_clusters(orientation, proximity=proximity),
+                    proximity=proximity,
+                )
+                dirty |= moved_
+        else:
+            dirty = set(handles)
+
+        while dirty:
+            moved: set[IntHandle] = set()
+            for orientation in (Orientation.VERTICAL, Orientation.HORIZONTAL):
+                grid, moved_ = grid._align_border_clusters(
+                    grid._get_border_clusters_near(
+                        dirty | moved, orientation, proximity=proximity
+                    ),
+                    proximity=proximity,
+                )
+                moved |= moved_
+            dirty = moved
 
-                    # span_x_new   x_length_new
-                    # ---------- = ------------
-                    # span_x_old   x_length_old
+        return grid
 
-                    # span_x_new = (span_x_old * x_length_new) / x_length_old
+    def get_changed_handles(self, other: "TileGrid") -> frozenset[IntHandle]:
+        """
+        Handles of tiles in `self` that are not in `other` as they are
+        """
+        tiles_other = other.get_handle_tile_map()
+        return frozenset(
+            tile.handle for tile in self.tiles if tiles_other.get(tile.handle) != tile
+        )
 
-                    a = self.try_get_tile_by_handle(tile_var.handle)
-                    if a is None:
-                        raise Unreachable
+    def _get_border_clusters(
+        self, orientation: Orientation, *, proximity: int
+    ) -> list[list[AlignableBorder]]:
+        borders = [
+            border
+            for border in (
+                AlignableBorder.of(shared_borders)
+                for shared_borders in self.get_all_borders(mode=BorderMode.LONGEST)
+            )
+            if border.line.orientation == orientation
+        ]
+
+        # Borders ending right before and starting right at every line
+        # across them
+        ending: defaultdict[int, list[int]] = defaultdict(list)
+        starting: defaultdict[int, list[tuple[int, int]]] = defaultdict(list)
+        for i, border in enumerate(borders):
+            ending[border.high + 1].append(i)
+            starting[border.low].append((border.line.coordinate, i))
+
+        parents = list(range(len(borders)))
+
+        def find(i: int) -> int:
+            while parents[i] != i:
+                parents[i] = parents[parents[i]]
+                i = parents[i]
+            return i
+
+        for across, ending_ in ending.items():
+            starting_ = sorted(starting.get(across, ()))
+            for i in ending_:
+                coordinate = borders[i].line.coordinate
+                k = bisect.bisect_left(starting_, (coordinate - proximity,))
+                while (k < len(starting_)) and (
+                    starting_[k][0] <= coordinate + proximity
+                ):
+                    parents[find(i)] = find(starting_[k][1])
+                    k += 1
 
-                    solver.addConstraint(
-                        tile_var.span_x
-                        >= (
-                            (a.as_span().span.x * x_length_new)
-                            // self.get_box().as_span().span.x
-                        )
-                    )
-                    solver.addConstraint(
-                        tile_var.span_x
-                        <= 1
-                        + (
-                            (a.as_span().span.x * x_length_new)
-                            // self.get_box().as_span().span.x
-                        )
-                    )
-                    # }}}
-                case "balance":
-                    # Balancing {{{
-                    solver.addConstraint(tile_var.span_x >= (x_length_new // max_tiles))
-                    # }}}
-
-        # Position constraints {{{
-        for tile_vars_group in tile_vars_groups.values():
-            # Span constraints {{{
-            expression: Expression | Variable = tile_vars_group[0].span_x
-            for tile_var in tile_vars_group[1:]:
-                expression += tile_var.span_x
-
-            solver.addConstraint(expression == x_length_new)
-            # }}}
-
-            # Cell constraints {{{
-            if len(tile_vars_group) > 0:
-                # Don't let rows of tiles slide out of the box
-                solver.addConstraint(tile_vars_group[0].cell_x == 0)
-
-            for i in range(1, len(tile_vars_group)):
-                previous_tile, tile_var = tile_vars_group[i - 1], tile_vars_group[i]
-                solver.addConstraint(
-                    tile_var.cell_x == (previous_tile.cell_x + previous_tile.span_x)
+        clusters: defaultdict[int, list[AlignableBorder]] = defaultdict(list)
+        for i, border in enumerate(borders):
+            clusters[find(i)].append(border)
+
+        return list(clusters.values())
+
+    def _get_border_clusters_near(
+        self, handles: Iterable[IntHandle], orientation: Orientation, *, proximity: int
+    ) -> list[list[AlignableBorder]]:
+        """
+        Clusters of `_get_border_clusters` containing borders of `handles`
+        """
+        sides = (
+            (CardinalDirection.LEFT, CardinalDirection.RIGHT)
+            if orientation == Orientation.VERTICAL
+            else (CardinalDirection.UP, CardinalDirection.DOWN)
+        )
+        edge_index = self.get_edge_index()
+
+        def get_border(tile: Tile, side: CardinalDirection) -> AlignableBorder | None:
+            shared_borders = self._get_border(tile, side, mode=BorderMode.LONGEST)
+            if shared_borders == SharedBorders():
+                return None
+            return AlignableBorder.of(shared_borders)
+
+        def get_adjacent(border: AlignableBorder) -> Iterable[AlignableBorder]:
+            for coordinate in range(
+                border.line.coordinate - proximity,
+                border.line.coordinate + proximity + 1,
+            ):
+                edges = edge_index.get(
+                    BorderLine(
+                        orientation=orientation, coordinate=coordinate, own_after=True
+                    ),
+                    after=True,
                 )
-            # }}}
+                for tile in edges.by_high.get(border.low - 1, ()):
+                    adjacent = get_border(tile, sides[0])
+                    if (adjacent is not None) and (adjacent.high == border.low - 1):
+                        yield adjacent
+                for tile in edges.by_low.get(border.high + 1, ()):
+                    adjacent = get_border(tile, sides[0])
+                    if (adjacent is not None) and (adjacent.low == border.high + 1):
+                        yield adjacent
+
+        clusters: list[list[AlignableBorder]] = []
+        seen: set[AlignableBorder] = set()
+        for handle in sorted(handles):
+            tile = self.try_get_tile_by_handle(handle)
+            if tile is None:
+                continue
 
-        # }}}
+            for side in sides:
+                border = get_border(tile, side)
+                if (border is None) or (border in seen):
+                    continue
+
+                seen.add(border)
+                cluster = [border]
+                for member in cluster:
+                    for adjacent in get_adjacent(member):
+                        if adjacent not in seen:
+                            seen.add(adjacent)
+                            cluster.append(adjacent)
 
-        solver.updateVariables()
-        return TileGrid.from_(
-            Tile.build(
-                TileAsSpan(
-                    cell=Cell(
-                        x=int(tile_var.cell_x.value()),
-                        y=tile_var.cell_y,
-                    ),
-                    span=Cell(
-                        x=int(tile_var.span_x.value()),
-                        y=tile_var.span_y,
-                    ),
-                ),
-                handle=tile_var.handle,
-            )
-            for tile_var in (tile_vars[tile.handle] for tile in self.tiles)
-        )
+                clusters.append(cluster)
 
-    def get_top_ys(self) -> frozenset[int]:
-        return get_top_ys(self.tiles)
+        return clusters
 
-    def un_occupy(self, area: "Tile", /, *, prefer: Orientation) -> "TileGrid | None":
-        tiles: list[Tile] = []
-        for tile in self.tiles:
-            processed_tile = tile.un_occupy(area, prefer=prefer)
-            if processed_tile is None:
-                return None
-            tiles.append(processed_tile)
+    def _align_border_clusters(
+        self, clusters: Iterable[Sequence[AlignableBorder]], *, proximity: int
+    ) -> tuple["TileGrid", set[IntHandle]]:
+        """
+        Return: the aligned grid and handles of tiles that moved
+        """
+        tile_map = self.get_handle_tile_map()
+        tiles: dict[IntHandle, Tile] = {}
+        moved: set[IntHandle] = set()
+        for cluster in clusters:
+            if len(cluster) < 2:
+                continue
 
-        return TileGrid.from_(tiles)
+            target = max(
+                cluster,
+                key=lambda border: (border.high - border.low, -border.line.coordinate),
+            ).line.coordinate
+
+            for border in cluster:
+                line = border.line
+                distance = target - line.coordinate
+                if (distance == 0) or (abs(distance) > proximity):
+                    continue
+
+                before = [
+                    tiles.get(t.handle, tile_map[t.handle])
+                    for t in line.get_before(border.borders)
+                ]
+                after = [
+                    tiles.get(t.handle, tile_map[t.handle])
+                    for t in line.get_after(border.borders)
+                ]
+                if any(line.get_extent(t) + distance < 1 for t in before) or any(
+                    line.get_extent(t) - distance < 1 for t in after
+                ):
+                    continue
 
-    def align_borders(self, *, proximity: int = 1) -> "TileGrid":
-        assert proximity >= 0, f"{proximity=}, expected `proximity >= 0`"
+                shift = line.get_shift(distance)
+                for t in before:
+                    tiles[t.handle] = t.corners_c3_add(shift)
+                for t in after:
+                    tiles[t.handle] = t.corners_c0_add(shift)
+                moved.update(t.handle for t in itertools.chain(before, after))
 
-        return (
-            self.align_left_borders_to_left(proximity=proximity)
-            .mirror_horizontally()
-            .align_left_borders_to_left(proximity=proximity)
-            .mirror_vertically()
-            .align_left_borders_to_left(proximity=proximity)
-            .mirror_horizontally()
-            .align_left_borders_to_left(proximity=proximity)
-            .mirror_vertically()
-            .rotate_clockwise()
-            .align_left_borders_to_left(proximity=proximity)
-            .mirror_horizontally()
-            .align_left_borders_to_left(proximity=proximity)
-            .mirror_vertically()
-            .align_left_borders_to_left(proximity=proximity)
-            .mirror_horizontally()
-            .align_left_borders_to_left(proximity=proximity)
-            .mirror_vertically()
-            .rotate_counterclockwise()
-        )
+        return self.replace_tiles(tiles.values()), moved
 
     def align_left_borders_to_left(self, *, proximity: int = 1) -> "TileGrid":
         assert proximity >= 0, f"{proximity=}, expected `proximity >= 0`"
@@ -1132,159 +2213,736 @@ class TileGrid:
         )
 
     def get_left_border(self, handle: IntHandle, *, mode: BorderMode) -> SharedBorders:
+        return self.get_border(handle, CardinalDirection.LEFT, mode=mode)
+
+    def get_shortest_left_border(self, handle: IntHandle) -> SharedBorders:
+        return self.get_border(handle, CardinalDirection.LEFT, mode=BorderMode.SHORTEST)
+
+    def get_longest_left_border(self, handle: IntHandle) -> SharedBorders:
+        return self.get_border(handle, CardinalDirection.LEFT, mode=BorderMode.LONGEST)
+
+    def get_border(
+        self, handle: IntHandle, side: CardinalDirection, /, *, mode: BorderMode
+    ) -> SharedBorders:
+        """
+        Border on `side` of the tile, found without transforming the grid.
+
+        Vertical borders fill `left` and `right`, horizontal ones fill `top`
+        and `bottom`. The result is the same as rotating `side` to the left,
+        calling `get_left_border` and rotating the result back.
+        """
+        return self._get_border(self.get_tile_by_handle(handle), side, mode=mode)
+
+    def _get_border(
+        self, tile: Tile, side: CardinalDirection, /, *, mode: BorderMode
+    ) -> SharedBorders:
         match mode:
             case BorderMode.SHORTEST:
-                return self.get_shortest_left_border(handle)
+                return self._get_shortest_border(tile, side)
             case BorderMode.LONGEST:
-                return self.get_longest_left_border(handle)
+                return self._get_longest_border(tile, side)
 
-    def get_shortest_left_border(self, handle: IntHandle) -> SharedBorders:
-        tile = self.get_tile_by_handle(handle)
-        tc = tile.as_corners()
-        tiles = self.tiles
+    def _get_shortest_border(
+        self, tile: Tile, side: CardinalDirection
+    ) -> SharedBorders:
+        line = BorderLine.of(tile, side)
+        edge_index = self.get_edge_index()
 
-        possible_left = [t for t in tiles if tc.c0.x - 1 == t.as_corners().c3.x]
-        possible_right = [t for t in tiles if tc.c0.x == t.as_corners().c0.x]
+        possible_own = edge_index.get(line, after=line.own_after)
+        possible_other = edge_index.get(line, after=not line.own_after)
 
-        if not possible_left:
+        if not possible_other.tiles:
             return SharedBorders()
 
-        y_min: int = tc.c0.y
-        y_max: int = tc.c3.y
+        low, high = line.get_span(tile)
+
+        tiles_own: set[Tile] = {tile}
+        tiles_other: set[Tile] = set()
 
-        left_and_right_swapped: bool = False
-        tiles_left: set[Tile] = set()
-        tiles_right: set[Tile] = {tile}
+        # Grow both sides in turns until the covered span stops changing
+        found, possible = tiles_other, possible_other
         while True:
-            detector = Tile.build(
-                TileAsCorners(
-                    Cell(x=tc.c0.x - 1, y=y_min),
-                    Cell(x=tc.c0.x, y=y_max),
+            found.update(possible.get_overlapping(low, high))
+
+            if not found:
+                return SharedBorders()
+
+            new_low = min(line.get_span(t)[0] for t in found)
+            new_high = max(line.get_span(t)[1] for t in found)
+
+            if (new_low, new_high) == (low, high):
+                break
+
+            low, high = new_low, new_high
+
+            if found is tiles_other:
+                found, possible = tiles_own, possible_own
+            else:
+                found, possible = tiles_other, possible_other
+
+        return line.build_borders(own=tiles_own, other=tiles_other)
+
+    def _get_longest_border(self, tile: Tile, side: CardinalDirection) -> SharedBorders:
+        line = BorderLine.of(tile, side)
+        possible_own = self.get_edge_index().get(line, after=line.own_after)
+
+        shared_borders = self._get_shortest_border(tile, side)
+        if shared_borders == SharedBorders():
+            return shared_borders
+
+        # Extend through tiles continuing the border on the tile's side
+        # Both sides grow in place, rebuilding `SharedBorders` per neighbour
+        # would copy them every time
+        tiles_own = set(line.get_own(shared_borders))
+        tiles_other = set(line.get_other(shared_borders))
+        while True:
+            low = min(line.get_span(t)[0] for t in tiles_own)
+            high = max(line.get_span(t)[1] for t in tiles_own)
+
+            neighbours = possible_own.by_high.get(
+                low - 1, ()
+            ) + possible_own.by_low.get(high + 1, ())
+            if not neighbours:
+                break
+
+            for t in neighbours:
+                shortest = self._get_shortest_border(t, side)
+                tiles_own.update(line.get_own(shortest))
+                tiles_other.update(line.get_other(shortest))
+
+        return line.build_borders(own=tiles_own, other=tiles_other)
+
+    def get_all_borders(self, *, mode: BorderMode) -> tuple[SharedBorders, ...]:
+        """
+        Every distinct border of the grid, vertical ones first, each line in
+        order along it.
+
+        For a valid grid this is the set of non-empty `get_border` results
+        over all tiles and sides, found in one sweep per line instead.
+        """
+        edge_index = self.get_edge_index()
+        lines = sorted(
+            {
+                (orientation, coordinate)
+                for orientation, coordinate, _ in edge_index.edges
+            },
+            key=lambda line: (line[0] != Orientation.VERTICAL, line[1]),
+        )
+
+        return_: list[SharedBorders] = []
+        for orientation, coordinate in lines:
+            line = BorderLine(
+                orientation=orientation, coordinate=coordinate, own_after=True
+            )
+            return_.extend(
+                get_borders_on_line(
+                    line,
+                    before=edge_index.get(line, after=False),
+                    after=edge_index.get(line, after=True),
+                    mode=mode,
+                )
+            )
+
+        return tuple(return_)
+
+    def get_shared_borders_near(
+        self,
+        cell: Cell,
+        *,
+        proximity: int = 1,
+        mode: BorderMode,
+        ignore_plus: bool = False,
+    ) -> SharedBorders:
+        tile = self.try_get_tile_by_cell(cell)
+        if tile is None:
+            return SharedBorders()
+
+        tc = tile.as_corners()
+
+        def get_border_near(
+            *, side: CardinalDirection, to: int, low: int, high: int, beyond: Cell
+        ) -> SharedBorders:
+            """
+            `low` is the edge on `side` of `tile`, `high` - the opposite one,
+            `beyond` - a cell just past `high`
+            """
+            closest_edge = closest(to=to, out_of=(low, high), proximity=proximity)
+            if closest_edge is None:
+                return SharedBorders()
+            elif closest_edge == low:
+                return self._get_border(tile, side, mode=mode)
+            else:
+                new_tile = self.try_get_tile_by_cell(beyond)
+                if new_tile is None:
+                    return SharedBorders()
+                else:
+                    return self._get_border(new_tile, side, mode=mode)
+
+        vertical_borders = get_border_near(
+            side=CardinalDirection.LEFT,
+            to=cell.x,
+            low=tc.c0.x,
+            high=tc.c3.x + 1,
+            beyond=Cell(tc.c3.x + 1, cell.y),
+        )
+        horizontal_borders = get_border_near(
+            side=CardinalDirection.UP,
+            to=cell.y,
+            low=tc.c0.y,
+            high=tc.c3.y + 1,
+            beyond=Cell(cell.x, tc.c3.y + 1),
+        )
+
+        shared_borders = SharedBorders(
+            left=vertical_borders.left,
+            right=vertical_borders.right,
+            top=horizontal_borders.top,
+            bottom=horizontal_borders.bottom,
+        )
+
+        if ignore_plus or (mode == BorderMode.LONGEST):
+            return shared_borders
+
+        # Handle "+" {{{
+        vertical, horizontal = shared_borders.as_tiles()
+        if (vertical is None) or (horizontal is None):
+            return shared_borders
+
+        vertical = vertical.corners_c3_add(Cell(0, 1))
+        horizontal = horizontal.corners_c3_add(Cell(1, 0))
+
+        v1, v2 = vertical.as_4_corners()[0:3:2]
+        h1, h2 = horizontal.as_4_corners()[0:2]
+
+        if not (v1 == h1 or v1 == h2 or v2 == h1 or v2 == h2):
+            return shared_borders
+
+        intersection = vertical.intersection(horizontal)
+        assert intersection is not None
+
+        new_base_cell = intersection.as_corners().c0 + Cell(
+            x=-1 if h1 in (v1, v2) else 1,
+            y=-1 if v1 in (h1, h2) else 1,
+        )
+
+        return self.get_shared_borders_near(
+            new_base_cell,
+            proximity=proximity,
+            mode=BorderMode.SHORTEST,
+            ignore_plus=True,
+        ).union(shared_borders)
+        # }}} Handle "+"
+
+
+@dataclass(frozen=True, slots=True)
+class TileGridView:
+    """
+    `grid` as seen through `transform`.
+
+    Transforms compose without touching tiles, tiles are mapped one at a time
+    when accessed. Edits are mapped back, so `grid` is always untransformed and
+    nothing has to be rotated back once an edit is done.
+    """
+
+    grid: TileGrid
+    transform: Transform = Transform()
+
+    def materialize(self) -> TileGrid:
+        if self.transform.is_identity():
+            return self.grid
+
+        return TileGrid.from_(
+            self.transform.apply_to_tile(tile) for tile in self.grid.tiles
+        )
+
+    def with_transform(self, transform: Transform) -> "TileGridView":
+        return TileGridView(self.grid, self.transform.then(transform))
+
+    def rotate_clockwise(self) -> "TileGridView":
+        return TileGridView(self.grid, self.transform.rotate_clockwise())
+
+    def rotate_counterclockwise(self) -> "TileGridView":
+        return TileGridView(self.grid, self.transform.rotate_counterclockwise())
+
+    def rotate(
+        self, side: CardinalDirection, /, *, to: CardinalDirection
+    ) -> "TileGridView":
+        return TileGridView(self.grid, self.transform.rotate(side, to=to))
+
+    def mirror_horizontally(self) -> "TileGridView":
+        return TileGridView(self.grid, self.transform.mirror_horizontally())
+
+    def mirror_vertically(self) -> "TileGridView":
+        return TileGridView(self.grid, self.transform.mirror_vertically())
+
+    def try_get_tile_by_handle(self, handle: IntHandle) -> Tile | None:
+        tile = self.grid.try_get_tile_by_handle(handle)
+        return None if tile is None else self.transform.apply_to_tile(tile)
+
+    def get_tile_by_handle(self, handle: IntHandle) -> Tile:
+        return_ = self.try_get_tile_by_handle(handle)
+        if return_ is None:
+            raise ValueError
+        return return_
+
+    def try_get_tile_by_cell(self, cell: Cell) -> Tile | None:
+        tile = self.grid.try_get_tile_by_cell(
+            self.transform.inverse().apply_to_cell(cell)
+        )
+        return None if tile is None else self.transform.apply_to_tile(tile)
+
+    def replace_tiles(self, new: Iterable[Tile]) -> "TileGridView":
+        inverse = self.transform.inverse()
+        return TileGridView(
+            self.grid.replace_tiles(inverse.apply_to_tile(tile) for tile in new),
+            self.transform,
+        )
+
+    def delete_by_handle(self, handle: IntHandle) -> "TileGridView":
+        return TileGridView(self.grid.delete_by_handle(handle), self.transform)
+
+    def flat_map_tiles(
+        self,
+        function: Callable[[Tile], Iterable[Tile]],
+        *,
+        handles: Collection[IntHandle] | None = None,
+    ) -> "TileGridView":
+        """
+        Replace every tile with tiles returned by `function`.
+
+        `function` receives and returns tiles in view coordinates. Tiles with
+        handles not in `handles` are kept without being mapped at all, tiles
+        `function` returns unchanged are kept without being mapped back.
+        """
+        transform = self.transform
+        inverse = transform.inverse()
+
+        if (handles is not None) and self.grid.has_unique_handles():
+            # Splice only the tiles of `handles`, from the back so positions
+            # of the ones left stay put
+            handle_index = self.grid.get_handle_index()
+            vector = self.grid.get_tile_vector()
+            for i in sorted(
+                (handle_index[h] for h in handles if h in handle_index), reverse=True
+            ):
+                tile = vector[i]
+                tile_view = transform.apply_to_tile(tile)
+                vector = vector.splice(
+                    i,
+                    [
+                        tile
+                        if new_tile is tile_view
+                        else inverse.apply_to_tile(new_tile)
+                        for new_tile in function(tile_view)
+                    ],
+                )
+
+            return TileGridView(TileGrid(vector), transform)
+
+        tiles: list[Tile] = []
+        for tile in self.grid.tiles:
+            if (handles is not None) and (tile.handle not in handles):
+                tiles.append(tile)
+                continue
+
+            tile_view = transform.apply_to_tile(tile)
+            for new_tile in function(tile_view):
+                tiles.append(
+                    tile if new_tile is tile_view else inverse.apply_to_tile(new_tile)
+                )
+
+        return TileGridView(TileGrid.from_(tiles), transform)
+
+    def append(self, tile: Tile) -> "TileGridView":
+        return TileGridView(
+            self.grid.append(self.transform.inverse().apply_to_tile(tile)),
+            self.transform,
+        )
+
+    def insert_to_right(
+        self,
+        *,
+        anchor_handle: IntHandle,
+        new_tile_handle: IntHandle,
+    ) -> "TileGridView":
+        # Guard {{{
+        anchor_tile = self.try_get_tile_by_handle(anchor_handle)
+        if anchor_tile is None:
+            return self
+        # }}}
+
+        line = Line(
+            coordinate=anchor_tile.as_corners().c3.x,
+            orientation=Orientation.VERTICAL,
+        )
+
+        # Make space (to the RIGHT) {{{
+        def make_space(tile: Tile) -> tuple[Tile, ...]:
+            if tile.handle == anchor_handle:
+                return (tile,)
+
+            elif (not line.intersects_tile(tile)) and line.on_positive_side_of_tile(
+                tile
+            ):
+                return (tile,)
+            elif line.intersects_tile(tile):
+                return (
+                    tile.replace_tile(
+                        TileAsCorners(
+                            c0=tile.as_corners().c0,
+                            c3=tile.as_corners().c3 + Cell(x=1, y=0),
+                        )
+                    ),
+                )
+            elif (not line.intersects_tile(tile)) and line.on_negative_side_of_tile(
+                tile
+            ):
+                return (
+                    tile.replace_tile(
+                        TileAsCorners(
+                            c0=tile.as_corners().c0 + Cell(x=1, y=0),
+                            c3=tile.as_corners().c3 + Cell(x=1, y=0),
+                        )
+                    ),
                 )
+
+            return ()
+
+        # }}}
+
+        # Insert new Tile (on the RIGHT) {{{
+        return self.flat_map_tiles(make_space).append(
+            Tile.build(
+                TileAsStep(
+                    cell=anchor_tile.as_corners().c3 + Cell(x=1, y=0),
+                    step=Cell(x=0, y=-anchor_tile.as_step().step.y),
+                ),
+                handle=new_tile_handle,
+            )
+        )
+        # }}}
+
+    def split_tile_to_right(
+        self,
+        *,
+        tile_handle: IntHandle,
+        new_tile_handle: IntHandle,
+    ) -> "TileGridView":
+        # Guards {{{
+        tile = self.try_get_tile_by_handle(tile_handle)
+        if tile is None:
+            return self
+        # }}}
+
+        def split(tile: Tile) -> tuple[Tile, ...]:
+            corners = tile.as_corners()
+            width = corners.c3.x - corners.c0.x
+
+            if width < 2:
+                return (tile,)
+
+            c3 = Cell(x=corners.c0.x + (width // 2), y=corners.c3.y)
+            c0 = Cell(x=c3.x + 1, y=corners.c0.y)
+
+            return (
+                tile.replace_tile(
+                    TileAsCorners(c0=corners.c0, c3=c3),
+                ),
+                Tile.build(
+                    TileAsCorners(c0=c0, c3=corners.c3),
+                    handle=new_tile_handle,
+                ),
             )
-            for tile_left in possible_left:
-                if tile_left.intersection(detector) is not None:
-                    tiles_left.add(tile_left)
 
-            new_y_min = min(t.as_corners().c0.y for t in tiles_left)
-            new_y_max = max(t.as_corners().c3.y for t in tiles_left)
+        return self.flat_map_tiles(split, handles=(tile_handle,))
 
-            if (new_y_min, new_y_max) == (y_min, y_max):
-                break
 
-            y_min, y_max = new_y_min, new_y_max
+@dataclass(slots=True, kw_only=True)
+class BorderQueryCache:
+    """
+    Bounded LRU cache of border queries.
 
-            tiles_left, tiles_right = tiles_right, tiles_left
-            possible_left, possible_right = possible_right, possible_left
-            left_and_right_swapped = not left_and_right_swapped
+    Entries are keyed by the queried grid (or borders) and the arguments,
+    grids hash by a fingerprint computed once per grid. Results are only
+    reused for equal grids, so the cache never has to be invalidated, only
+    trimmed.
+    """
 
-        if left_and_right_swapped:
-            tiles_left, tiles_right = tiles_right, tiles_left
+    max_size: int = 256
 
-        return SharedBorders(left=frozenset(tiles_left), right=frozenset(tiles_right))
+    hits: int = 0
+    misses: int = 0
 
-    def get_longest_left_border(self, handle: IntHandle) -> SharedBorders:
-        shared_borders = self.get_shortest_left_border(handle)
-        if shared_borders == SharedBorders():
-            return shared_borders
+    _entries: OrderedDict[tuple[Hashable, ...], SharedBorders | Cell | None] = (
+        dataclasses.field(
+            default_factory=OrderedDict[
+                tuple[Hashable, ...], SharedBorders | Cell | None
+            ],
+            repr=False,
+        )
+    )
 
-        while True:
-            a = min(shared_borders.right, key=lambda t: t.as_corners().c0.y)
-            b = max(shared_borders.right, key=lambda t: t.as_corners().c3.y)
+    def __len__(self) -> int:
+        return len(self._entries)
 
-            break_ = True
-            for tile in self.tiles:
-                if (tile.as_4_corners()[2] == (a.as_4_corners()[0] + Cell(0, -1))) or (
-                    tile.as_4_corners()[0] == (b.as_4_corners()[2] + Cell(0, 1))
-                ):
-                    break_ = False
-                    shared_borders = shared_borders.union(
-                        self.get_shortest_left_border(tile.handle)
-                    )
+    def _lookup(
+        self, key: tuple[Hashable, ...]
+    ) -> tuple[bool, SharedBorders | Cell | None]:
+        if key not in self._entries:
+            self.misses += 1
+            return False, None
 
-            if break_:
-                break
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return True, self._entries[key]
 
-        return SharedBorders(left=shared_borders.left, right=shared_borders.right)
+    def _store(
+        self, key: tuple[Hashable, ...], value: SharedBorders | Cell | None
+    ) -> None:
+        self._entries[key] = value
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
 
     def get_shared_borders_near(
         self,
+        grid: TileGrid,
         cell: Cell,
         *,
         proximity: int = 1,
         mode: BorderMode,
-        ignore_plus: bool = False,
     ) -> SharedBorders:
-        tile = self.try_get_tile_by_cell(cell)
-        if tile is None:
-            return SharedBorders()
+        key = ("get_shared_borders_near", grid, cell, proximity, mode)
+        found, value = self._lookup(key)
+        if found:
+            assert isinstance(value, SharedBorders)
+            return value
+
+        shared_borders = grid.get_shared_borders_near(
+            cell, proximity=proximity, mode=mode
+        )
+        self._store(key, shared_borders)
+        return shared_borders
 
-        def get_vertical_border(
-            *, cell: Cell, tile: Tile, grid: TileGrid
-        ) -> SharedBorders:
-            as4c = tile.as_4_corners()
+    def get_left_border(
+        self, grid: TileGrid, handle: IntHandle, *, mode: BorderMode
+    ) -> SharedBorders:
+        key = ("get_left_border", grid, handle, mode)
+        found, value = self._lookup(key)
+        if found:
+            assert isinstance(value, SharedBorders)
+            return value
+
+        shared_borders = grid.get_left_border(handle, mode=mode)
+        self._store(key, shared_borders)
+        return shared_borders
+
+    def get_cross_cell(
+        self, borders: SharedBorders, *, strict: bool = False
+    ) -> Cell | None:
+        key = ("get_cross_cell", borders, strict)
+        found, value = self._lookup(key)
+        if found:
+            assert (value is None) or isinstance(value, Cell)
+            return value
+
+        cross_cell = borders.get_cross_cell(strict=strict)
+        self._store(key, cross_cell)
+        return cross_cell
+
+    def evict(self, grid: TileGrid) -> None:
+        """
+        Drop every entry computed for `grid`
+        """
+        for key in [key for key in self._entries if key[1] == grid]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+@dataclass(slots=True)
+class ResizeSession:
+    """
+    `TileGrid.resize_along_x` for repeated resizes of grids with the same
+    topology, with the same results.
+
+    Rows of tiles are grouped once per topology and regrouped when tiles are
+    added, removed, moved along y or reordered along x. "scale" mode takes
+    the integer path of `scale_spans`. The solver, for "balance" mode and
+    for layouts `scale_spans` cannot handle, is built for every resize: a
+    kept solver re-solving with edit variables can end on another optimal
+    vertex depending on the resizes before, so its results would neither
+    match `resize_along_x` nor be reproducible.
+    """
+
+    mode: Literal["balance", "scale"] = "scale"
+
+    _topology: tuple[object, ...] | None = dataclasses.field(default=None, repr=False)
+    _rows: list[list[int]] = dataclasses.field(
+        default_factory=list[list[int]], repr=False
+    )
+
+    def _get_topology(self, grid: TileGrid) -> tuple[object, ...]:
+        return (
+            tuple(
+                (tile.handle, tile.as_corners().c0.y, tile.as_corners().c3.y)
+                for tile in grid.tiles
+            ),
+            tuple(
+                tile.handle
+                for tile in sorted(grid.tiles, key=lambda tile: tile.as_corners().c0.x)
+            ),
+        )
+
+    def resize(self, grid: TileGrid, *, x_length_new: int) -> TileGrid:
+        grid.assert_invariants()
+
+        spans = get_spans_along_x(grid.tiles)
 
-            closest_edge = closest(
-                to=cell.x, out_of=(as4c[0].x, as4c[1].x + 1), proximity=proximity
+        topology = self._get_topology(grid)
+        if self._topology != topology:
+            self._topology = topology
+            self._rows = get_rows(
+                spans, sorted(range(len(spans)), key=lambda i: spans[i][0])
             )
-            if closest_edge is None:
-                return SharedBorders()
-            elif cell.x >= closest_edge:
-                return grid.get_left_border(tile.handle, mode=mode)
-            else:
-                new_tile = grid.try_get_tile_by_cell(Cell(as4c[1].x + 1, cell.y))
-                if new_tile is None:
-                    return SharedBorders()
-                else:
-                    return grid.get_left_border(new_tile.handle, mode=mode)
 
-        vertical_borders = get_vertical_border(cell=cell, tile=tile, grid=self)
-        horizontal_borders = get_vertical_border(
-            cell=cell.rotate_counterclockwise(),
-            tile=tile.rotate_counterclockwise(),
-            grid=self.rotate_counterclockwise(),
+        return set_spans_along_x(
+            grid.tiles,
+            resize_spans(
+                spans, length_new=x_length_new, mode=self.mode, rows=self._rows
+            ),
         )
 
-        shared_borders = SharedBorders(
-            left=vertical_borders.left,
-            right=vertical_borders.right,
-            # Rotated counterclockwise before
-            top=horizontal_borders.left,
-            bottom=horizontal_borders.right,
-        ).pull_coords(self)
 
-        if ignore_plus or (mode == BorderMode.LONGEST):
-            return shared_borders
+@dataclass(frozen=True, slots=True, kw_only=True)
+class HoverMap:
+    """
+    `TileGrid.get_shared_borders_near` for every cell of `grid`, filled in
+    lazily.
 
-        # Handle "+" {{{
-        vertical, horizontal = shared_borders.as_tiles()
-        if (vertical is None) or (horizontal is None):
-            return shared_borders
+    Inside a tile the result only changes at a few coordinates: where the
+    closest edge (or the lack of one within `proximity`) changes and where
+    the neighbour past the far edge changes. Every tile is split along those
+    coordinates into regions, each region is queried once, on first hover.
+    """
 
-        vertical = vertical.corners_c3_add(Cell(0, 1))
-        horizontal = horizontal.corners_c3_add(Cell(1, 0))
+    grid: TileGrid
+    proximity: int
+    mode: BorderMode
 
-        v1, v2 = vertical.as_4_corners()[0:3:2]
-        h1, h2 = horizontal.as_4_corners()[0:2]
+    breaks: dict[Tile, tuple[tuple[int, ...], tuple[int, ...]]] = dataclasses.field(
+        default_factory=dict[Tile, tuple[tuple[int, ...], tuple[int, ...]]],
+        repr=False,
+    )
+    """
+    Tile -> sorted x and y coordinates starting its regions
+    """
+    regions: dict[tuple[Tile, int, int], SharedBorders] = dataclasses.field(
+        default_factory=dict[tuple[Tile, int, int], SharedBorders], repr=False
+    )
+    """
+    `(tile, x region, y region)` -> result
+    """
 
-        if not (v1 == h1 or v1 == h2 or v2 == h1 or v2 == h2):
-            return shared_borders
+    def get(self, cell: Cell) -> SharedBorders:
+        tile = self.grid.try_get_tile_by_cell(cell)
+        if tile is None:
+            return SharedBorders()
 
-        intersection = vertical.intersection(horizontal)
-        assert intersection is not None
+        xs, ys = self._get_breaks(tile)
+        key = (
+            tile,
+            bisect.bisect_right(xs, cell.x) - 1,
+            bisect.bisect_right(ys, cell.y) - 1,
+        )
 
-        new_base_cell = intersection.as_corners().c0 + Cell(
-            x=-1 if h1 in (v1, v2) else 1,
-            y=-1 if v1 in (h1, h2) else 1,
+        if key not in self.regions:
+            self.regions[key] = self.grid.get_shared_borders_near(
+                Cell(xs[key[1]], ys[key[2]]), proximity=self.proximity, mode=self.mode
+            )
+
+        return self.regions[key]
+
+    def precompute(self, area: Tile | None = None) -> None:
+        """
+        Fill in regions of tiles intersecting `area`, the whole grid by default
+        """
+        tiles = (
+            self.grid.tiles if area is None else self.grid.get_tiles_intersecting(area)
         )
 
-        return self.get_shared_borders_near(
-            new_base_cell,
-            proximity=proximity,
-            mode=BorderMode.SHORTEST,
-            ignore_plus=True,
-        ).union(shared_borders)
-        # }}} Handle "+"
+        for tile in tiles:
+            xs, ys = self._get_breaks(tile)
+            for x in xs:
+                for y in ys:
+                    self.get(Cell(x, y))
+
+    def _get_breaks(self, tile: Tile) -> tuple[tuple[int, ...], tuple[int, ...]]:
+        if tile not in self.breaks:
+            tc = tile.as_corners()
+
+            # Neighbours past the far edges are looked up on the cursor's row
+            # and column
+            right = self.grid.get_tiles_intersecting(
+                Tile.build(
+                    TileAsCorners(
+                        Cell(tc.c3.x + 1, tc.c0.y), Cell(tc.c3.x + 1, tc.c3.y)
+                    )
+                )
+            )
+            below = self.grid.get_tiles_intersecting(
+                Tile.build(
+                    TileAsCorners(
+                        Cell(tc.c0.x, tc.c3.y + 1), Cell(tc.c3.x, tc.c3.y + 1)
+                    )
+                )
+            )
+
+            self.breaks[tile] = (
+                self._get_axis_breaks(
+                    tc.c0.x,
+                    tc.c3.x,
+                    itertools.chain.from_iterable(
+                        (t.as_corners().c0.x, t.as_corners().c3.x + 1) for t in below
+                    ),
+                ),
+                self._get_axis_breaks(
+                    tc.c0.y,
+                    tc.c3.y,
+                    itertools.chain.from_iterable(
+                        (t.as_corners().c0.y, t.as_corners().c3.y + 1) for t in right
+                    ),
+                ),
+            )
+
+        return self.breaks[tile]
+
+    def _get_axis_breaks(
+        self, low: int, high: int, neighbour_breaks: Iterable[int]
+    ) -> tuple[int, ...]:
+        """
+        `low` and `high` are the first and the last cell of the tile
+        """
+        edge_breaks = (
+            # Past `proximity` from the near edge
+            low + self.proximity + 1,
+            # Within `proximity` from the far edge
+            high + 1 - self.proximity,
+            # Closer to the far edge than to the near one
+            (low + high + 1) // 2 + 1,
+        )
+
+        return tuple(
+            sorted(
+                {low}.union(
+                    b
+                    for b in itertools.chain(edge_breaks, neighbour_breaks)
+                    if low < b <= high
+                )
+            )
+        )
 
 
 @dataclass(frozen=True, slots=True, kw_only=True)
@@ -1293,14 +2951,35 @@ class BorderDragCache:
     borders: SharedBorders
     grid: TileGrid
 
-    snap_points_x: frozenset[int]
-    snap_points_y: frozenset[int]
+    snap_points_x: tuple[int, ...]
+    """
+    Ascending
+    """
+    snap_points_y: tuple[int, ...]
+    """
+    Ascending
+    """
 
     max_delta_left: int
     max_delta_right: int
     max_delta_top: int
     max_delta_bottom: int
 
+    # Compiled drag {{{
+    # The drag only moves the tiles of `borders`, one entry per tile:
+    # position in `grid.tiles`, corners before the drag and the factors
+    # `(c0.x, c0.y, c3.x, c3.y)` the delta is applied to its corners with
+    _positions: tuple[int, ...] = dataclasses.field(default=(), repr=False)
+    _base_corners: tuple[TileAsCorners, ...] = dataclasses.field(default=(), repr=False)
+    _factors: tuple[tuple[int, int, int, int], ...] = dataclasses.field(
+        default=(), repr=False
+    )
+    # Entries of the tiles on each side: `(left, right, top, bottom)`
+    _sides: tuple[tuple[int, ...], ...] = dataclasses.field(
+        default=((), (), (), ()), repr=False
+    )
+    # }}} Compiled drag
+
     @classmethod
     def build(
         cls, *, borders: SharedBorders, grid: TileGrid, cursor: Cell
@@ -1317,44 +2996,71 @@ class BorderDragCache:
         max_delta_bottom = min_span_bottom - 1
 
         # Snap Points {{{
-        snap_points_x: Iterable[int]
-        snap_points_y: Iterable[int]
+        snap_points_x: tuple[int, ...] = ()
+        snap_points_y: tuple[int, ...] = ()
 
         cross_cell = borders.get_cross_cell()
-        if cross_cell is None:
-            snap_points_x = ()
-            snap_points_y = ()
-        else:
-            snap_points_x, snap_points_y = cls._get_potential_snap_points(
-                grid=grid, borders=borders
-            )
-
-            snap_points_x = (
-                x
-                for x in snap_points_x
-                if ((d := x - cross_cell.x) == 0)
-                or (d > 0 and d <= max_delta_right)
-                or (d < 0 and d >= -max_delta_left)
+        if cross_cell is not None:
+            xs, ys = cls._get_potential_snap_points(grid=grid, borders=borders)
+
+            snap_points_x = tuple(
+                sorted(
+                    x
+                    for x in xs
+                    if -max_delta_left <= x - cross_cell.x <= max_delta_right
+                )
             )
-            snap_points_y = (
-                y
-                for y in snap_points_y
-                if ((d := y - cross_cell.y) == 0)
-                or (d > 0 and d <= max_delta_bottom)
-                or (d < 0 and d >= -max_delta_top)
+            snap_points_y = tuple(
+                sorted(
+                    y
+                    for y in ys
+                    if -max_delta_top <= y - cross_cell.y <= max_delta_bottom
+                )
             )
         # }}} Snap Points
 
+        # Compiled drag {{{
+        handle_index = grid.get_handle_index()
+        entries: dict[int, int] = {}
+        factors: list[list[int]] = []
+        sides: list[list[int]] = [[], [], [], []]
+        for side, (tiles, moved, kept) in enumerate(
+            (
+                # Left and top tiles move their `c3`, right and bottom their `c0`.
+                # A tile on both sides of a line only moves its `c0`
+                (borders.left, 2, None),
+                (borders.right, 0, 2),
+                (borders.top, 3, None),
+                (borders.bottom, 1, 3),
+            )
+        ):
+            for tile in tiles:
+                i = handle_index.get(tile.handle)
+                if i is None:
+                    continue
+                entry = entries.setdefault(i, len(entries))
+                if entry == len(factors):
+                    factors.append([0, 0, 0, 0])
+                factors[entry][moved] = 1
+                if kept is not None:
+                    factors[entry][kept] = 0
+                sides[side].append(entry)
+        # }}} Compiled drag
+
         return BorderDragCache(
             cursor=cursor,
             borders=borders,
             grid=grid,
-            snap_points_x=frozenset(snap_points_x),
-            snap_points_y=frozenset(snap_points_y),
+            snap_points_x=snap_points_x,
+            snap_points_y=snap_points_y,
             max_delta_left=max_delta_left,
             max_delta_right=max_delta_right,
             max_delta_top=max_delta_top,
             max_delta_bottom=max_delta_bottom,
+            _positions=tuple(entries),
+            _base_corners=tuple(grid.tiles[i].as_corners() for i in entries),
+            _factors=tuple((f[0], f[1], f[2], f[3]) for f in factors),
+            _sides=tuple(tuple(side) for side in sides),
         )
 
     @overload
@@ -1395,47 +3101,51 @@ class BorderDragCache:
 
         # Snap {{{
         current_delta += Cell(
-            x=min(
-                (
-                    x - current_cross_cell.x
-                    for x in self.snap_points_x
-                    if abs(x - current_cross_cell.x) <= snap_proximity
-                ),
-                key=abs,
-                default=0,
+            x=self._get_snap(
+                self.snap_points_x, current_cross_cell.x, proximity=snap_proximity
             ),
-            y=min(
-                (
-                    y - current_cross_cell.y
-                    for y in self.snap_points_y
-                    if abs(y - current_cross_cell.y) <= snap_proximity
-                ),
-                key=abs,
-                default=0,
+            y=self._get_snap(
+                self.snap_points_y, current_cross_cell.y, proximity=snap_proximity
             ),
         )
         # }}} Snap
 
-        grid = self.grid
-        borders = self.borders
-
-        borders = borders.pull_coords(grid)
-        grid = grid.replace_tiles(
-            itertools.chain(
-                (t.corners_c3_add(Cell(current_delta.x, 0)) for t in borders.left),
-                (t.corners_c0_add(Cell(current_delta.x, 0)) for t in borders.right),
+        dx, dy = current_delta.x, current_delta.y
+        tiles = tuple(
+            Tile.build(
+                TileAsCorners(
+                    c0=Cell(c.c0.x + dx * f[0], c.c0.y + dy * f[1]),
+                    c3=Cell(c.c3.x + dx * f[2], c.c3.y + dy * f[3]),
+                ),
+                handle=self.grid.tiles[i].handle,
+            )
+            for i, c, f in zip(
+                self._positions, self._base_corners, self._factors, strict=True
             )
         )
 
-        borders = borders.pull_coords(grid)
-        grid = grid.replace_tiles(
-            itertools.chain(
-                (t.corners_c3_add(Cell(0, current_delta.y)) for t in borders.top),
-                (t.corners_c0_add(Cell(0, current_delta.y)) for t in borders.bottom),
-            )
+        left, right, top, bottom = (
+            frozenset(tiles[entry] for entry in side) for side in self._sides
+        )
+
+        return (
+            self.grid.replace_tiles_at(self._positions, tiles),
+            SharedBorders(left=left, right=right, top=top, bottom=bottom),
         )
 
-        return grid, self.borders.pull_coords(grid)
+    @staticmethod
+    def _get_snap(points: Sequence[int], at: int, *, proximity: int) -> int:
+        """
+        Offset from `at` to the closest of the ascending `points` within
+        `proximity`, the lower one on a tie, `0` if there is none
+        """
+        i = bisect.bisect_left(points, at)
+        offsets = [points[j] - at for j in (i - 1, i) if 0 <= j < len(points)]
+        return min(
+            (offset for offset in offsets if abs(offset) <= proximity),
+            key=abs,
+            default=0,
+        )
 
     @classmethod
     def _get_potential_snap_points(
@@ -1443,50 +3153,148 @@ class BorderDragCache:
     ) -> tuple[frozenset[int], frozenset[int]]:
         """
         Return: `(xs, ys)`
+
+        Vertical borders snap to the near edges of the tiles just above and
+        just below them, horizontal ones - of the tiles just left and right
         """
-        box = borders.get_box()
-        if box is None:
+        if borders.get_box() is None:
             return (frozenset(), frozenset())
 
         xs: set[int] = set()
-        xs.update(cls._get_potential_top_snap_points(grid=grid, borders=borders))
-        xs.update(
-            cls._get_potential_top_snap_points(
-                grid=grid.mirror_vertically(), borders=borders.mirror_vertically()
-            )
-        )
-
-        grid = grid.rotate_counterclockwise()
-        borders = borders.rotate_counterclockwise()
+        if tiles := borders.left | borders.right:
+            bc = get_box(tiles).as_corners()
+            for y in (bc.c0.y - 1, bc.c3.y + 1):
+                detector = Tile.build(TileAsCorners(Cell(bc.c0.x, y), Cell(bc.c3.x, y)))
+                xs.update(
+                    max(tile.as_corners().c0.x, bc.c0.x)
+                    for tile in grid.get_tiles_intersecting(detector)
+                )
 
         ys: set[int] = set()
-        ys.update(cls._get_potential_top_snap_points(grid=grid, borders=borders))
-        ys.update(
-            cls._get_potential_top_snap_points(
-                grid=grid.mirror_vertically(), borders=borders.mirror_vertically()
-            )
-        )
+        if tiles := borders.top | borders.bottom:
+            bc = get_box(tiles).as_corners()
+            for x in (bc.c0.x - 1, bc.c3.x + 1):
+                detector = Tile.build(TileAsCorners(Cell(x, bc.c0.y), Cell(x, bc.c3.y)))
+                ys.update(
+                    max(tile.as_corners().c0.y, bc.c0.y)
+                    for tile in grid.get_tiles_intersecting(detector)
+                )
 
         return (frozenset(xs), frozenset(ys))
 
-    @classmethod
-    def _get_potential_top_snap_points(
-        cls, *, grid: TileGrid, borders: SharedBorders
-    ) -> frozenset[int]:
-        tiles = borders.left | borders.right
-        if not tiles:
-            return frozenset()
-        box = get_box(tiles)
 
-        bc = box.as_4_corners()
-        detector = Tile.build(TileAsCorners(bc[0] + Cell(0, -1), bc[1] + Cell(0, -1)))
+@dataclass(slots=True)
+class TileGridHistory:
+    """
+    Undo and redo over versions of a grid.
+
+    Versions are stored as their `TileVector`s, so the ones made by small
+    edits share most of their storage, and no per-grid index is kept alive.
+    Every stored node counts once towards `max_size`, as the number of tiles
+    or children it holds. The oldest versions are dropped once the history
+    outgrows it, the current one is always kept.
+    """
+
+    grid: TileGrid
+    max_size: int = 1_000_000
+
+    _undo: deque[TileVector] = dataclasses.field(
+        default_factory=deque[TileVector], repr=False
+    )
+    _redo: list[TileVector] = dataclasses.field(
+        default_factory=list[TileVector], repr=False
+    )
+    _nodes: dict[int, tuple[TileVectorNode, int]] = dataclasses.field(
+        default_factory=dict[int, tuple[TileVectorNode, int]], repr=False
+    )
+    """
+    `id` of every stored node -> the node and the number of references to it
+    """
+    _size: int = dataclasses.field(default=0, repr=False)
+
+    def __post_init__(self) -> None:
+        self._add(self.grid.get_tile_vector().root)
+
+    def get_size(self) -> int:
+        return self._size
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def push(self, grid: TileGrid) -> TileGrid:
+        """
+        Make `grid` the current version, versions that could be redone are
+        dropped. Grids with the same storage as the current one are no edit.
+        """
+        if grid.get_tile_vector().root is self.grid.get_tile_vector().root:
+            self.grid = grid
+            return grid
+
+        for vector in self._redo:
+            self._remove(vector.root)
+        self._redo.clear()
 
-        return_: set[int] = set()
-        for tile in grid.tiles:
-            if intersection := detector.intersection(tile):
-                return_.add(intersection.as_corners().c0.x)
+        self._undo.append(self.grid.get_tile_vector())
+        self.grid = grid
+        self._add(grid.get_tile_vector().root)
 
-        return frozenset(return_)
+        while (self._size > self.max_size) and self._undo:
+            self._remove(self._undo.popleft().root)
+
+        return grid
+
+    def undo(self) -> TileGrid:
+        if self._undo:
+            self._redo.append(self.grid.get_tile_vector())
+            self.grid = TileGrid(self._undo.pop())
+
+        return self.grid
+
+    def redo(self) -> TileGrid:
+        if self._redo:
+            self._undo.append(self.grid.get_tile_vector())
+            self.grid = TileGrid(self._redo.pop())
+
+        return self.grid
+
+    def _add(self, root: TileVectorNode) -> None:
+        """
+        Only descends into nodes not stored yet, so it costs as much as the
+        storage `root` does not share
+        """
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            entry = self._nodes.get(id(node))
+            if entry is not None:
+                self._nodes[id(node)] = (node, entry[1] + 1)
+                continue
+
+            self._nodes[id(node)] = (node, 1)
+            if isinstance(node, TileVectorBranch):
+                self._size += len(node.children)
+                stack.extend(node.children)
+            else:
+                self._size += len(node)
+
+    def _remove(self, root: TileVectorNode) -> None:
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            _, count = self._nodes[id(node)]
+            if count > 1:
+                self._nodes[id(node)] = (node, count - 1)
+                continue
+
+            del self._nodes[id(node)]
+            if isinstance(node, TileVectorBranch):
+                self._size -= len(node.children)
+                stack.extend(node.children)
+            else:
+                self._size -= len(node)
 
 
 @dataclass(frozen=True, slots=True, kw_only=True)
@@ -1569,12 +3377,20 @@ class Line:
 
 
 def get_box(tiles: Iterable[Tile]) -> Tile:
-    tiles = tuple(tiles)
+    corners = tuple(tile.as_corners() for tile in tiles)
 
-    def reducer(a: Tile, b: Tile) -> Tile:
-        return a.min_max(b)
-
-    return functools.reduce(reducer, tiles, tiles[0])
+    return Tile.build(
+        TileAsCorners(
+            c0=Cell(
+                x=min(c.c0.x for c in corners),
+                y=min(c.c0.y for c in corners),
+            ),
+            c3=Cell(
+                x=max(c.c3.x for c in corners),
+                y=max(c.c3.y for c in corners),
+            ),
+        )
+    )
 
 
 def get_top_ys(tiles: Iterable[Tile]) -> frozenset[int]:
@@ -1584,6 +3400,395 @@ def get_top_ys(tiles: Iterable[Tile]) -> frozenset[int]:
     # )
 
 
+def get_rows(
+    spans: Sequence[tuple[int, int, int, int]], order: Sequence[int]
+) -> list[list[int]]:
+    """
+    `spans` holds `(low, high, across_low, across_high)` of every tile.
+
+    Return: indexes of tiles crossed by a line through the `across_low` of
+    some tile, one row per line, each in `order`. Rows come in the iteration
+    order of the `frozenset` of lines.
+    """
+    rank = [0] * len(spans)
+    for r, i in enumerate(order):
+        rank[i] = r
+
+    starts = sorted(range(len(spans)), key=lambda i: spans[i][2])
+    ends = sorted(range(len(spans)), key=lambda i: spans[i][3])
+
+    # Sweep the lines in order, keeping ranks of the crossed tiles sorted
+    rows: dict[int, list[int]] = {}
+    active: list[int] = []
+    start = end = 0
+    across_lines = frozenset(span[2] for span in spans)
+    for across in sorted(across_lines):
+        while (start < len(starts)) and (spans[starts[start]][2] <= across):
+            bisect.insort(active, rank[starts[start]])
+            start += 1
+
+        while (end < len(ends)) and (spans[ends[end]][3] < across):
+            del active[bisect.bisect_left(active, rank[ends[end]])]
+            end += 1
+
+        rows[across] = [order[r] for r in active]
+
+    return [rows[across] for across in across_lines]
+
+
+def resize_tiles(
+    tiles: Sequence[Tile],
+    new_boundary: Cell,
+    *,
+    spans_x: Sequence[tuple[int, int, int, int]] | None = None,
+    rows_x: Sequence[Sequence[int]] | None = None,
+) -> TileGrid:
+    """
+    `TileGrid.resize` of valid `tiles`, reusing `spans_x` and `rows_x` if
+    given
+    """
+    tiles_x = tuple(
+        Tile.build(
+            TileAsSpan(cell=Cell(x=x, y=s.cell.y), span=Cell(x=span_x, y=s.span.y))
+        )
+        for s, (x, span_x) in zip(
+            (tile.as_span() for tile in tiles),
+            resize_spans(
+                get_spans_along_x(tiles) if spans_x is None else spans_x,
+                length_new=new_boundary.x,
+                rows=rows_x,
+            ),
+            strict=True,
+        )
+    )
+
+    # Along y as seen after a clockwise rotation: `(x, y) -> (-y, x)`
+    return TileGrid.from_(
+        Tile.build(
+            TileAsSpan(
+                cell=Cell(x=y, y=tc.c0.x),
+                span=Cell(x=span_y, y=tc.c3.x - tc.c0.x + 1),
+            ),
+            handle=tile.handle,
+        ).rotate_counterclockwise()
+        for tile, tc, (y, span_y) in zip(
+            tiles,
+            (tile.as_corners() for tile in tiles_x),
+            resize_spans(
+                [
+                    (-tc.c3.y, -tc.c0.y, tc.c0.x, tc.c3.x)
+                    for tc in (tile.as_corners() for tile in tiles_x)
+                ],
+                length_new=new_boundary.y,
+            ),
+            strict=True,
+        )
+    )
+
+
+def get_spans_along_x(tiles: Iterable[Tile]) -> list[tuple[int, int, int, int]]:
+    """
+    `(low, high, across_low, across_high)` of `tiles` for `resize_spans`
+    along x
+    """
+    return [
+        (tc.c0.x, tc.c3.x, tc.c0.y, tc.c3.y)
+        for tc in (tile.as_corners() for tile in tiles)
+    ]
+
+
+def set_spans_along_x(
+    tiles: Sequence[Tile], spans_x: Iterable[tuple[int, int]]
+) -> TileGrid:
+    """
+    `tiles` moved to `(cell, span)` along x of `spans_x`, as `resize_spans`
+    returns them
+    """
+    return TileGrid.from_(
+        Tile.build(
+            TileAsSpan(cell=Cell(x=x, y=s.cell.y), span=Cell(x=span_x, y=s.span.y)),
+            handle=tile.handle,
+        )
+        for tile, s, (x, span_x) in zip(
+            tiles, (tile.as_span() for tile in tiles), spans_x, strict=True
+        )
+    )
+
+
+def scale_spans(
+    spans: Sequence[tuple[int, int, int, int]], *, length_new: int
+) -> list[tuple[int, int]] | None:
+    """
+    Integer solution of the "scale" constraints of `resize_spans`.
+
+    Every edge moves to `floor(offset * length_new / length_old)`, where
+    `offset` is its distance from the start of the box. Tiles sharing an
+    edge keep sharing it and each span rounds down or up from its exact
+    scaled value, so rows add up to `length_new`.
+
+    Return: `None` if a tile would shrink to nothing
+    """
+    low = min(span[0] for span in spans)
+    length_old = max(span[1] for span in spans) - low + 1
+
+    return_: list[tuple[int, int]] = []
+    for span_low, span_high, _, _ in spans:
+        cell = ((span_low - low) * length_new) // length_old
+        span = ((span_high + 1 - low) * length_new) // length_old - cell
+        if span < 1:
+            return None
+
+        return_.append((cell, span))
+
+    return return_
+
+
+def resize_spans(
+    spans: Sequence[tuple[int, int, int, int]],
+    *,
+    length_new: int,
+    mode: Literal["balance", "scale"] = "scale",
+    rows: Sequence[Sequence[int]] | None = None,
+) -> list[tuple[int, int]]:
+    """
+    `TileGrid.resize_along_x` on plain coordinates.
+
+    `spans` holds `(low, high, across_low, across_high)` of every tile, `low`
+    and `high` are along the resized axis. `rows` are `get_rows` of `spans`,
+    computed if not given.
+
+    Return: `(cell, span)` of every tile along the axis
+    """
+
+    if mode == "scale":
+        scaled = scale_spans(spans, length_new=length_new)
+        if scaled is not None:
+            return scaled
+
+    @dataclass(frozen=True, slots=True, kw_only=True)
+    class TileVar:
+        cell: Variable
+        span: Variable
+
+        span_old: int
+
+    order = sorted(range(len(spans)), key=lambda i: spans[i][0])
+
+    # Variable declaration {{{
+    tile_vars: dict[int, TileVar] = {
+        i: TileVar(
+            cell=Variable(f"cell.{i}"),
+            span=Variable(f"span.{i}"),
+            span_old=spans[i][1] - spans[i][0] + 1,
+        )
+        for i in order
+    }
+    # }}}
+
+    # Lines {{{
+    if rows is None:
+        rows = get_rows(spans, order)
+    tile_vars_groups = [[tile_vars[i] for i in row] for row in rows]
+
+    max_tiles = max(len(tiles) for tiles in tile_vars_groups)
+    # }}}
+
+    length_old = max(span[1] for span in spans) - min(span[0] for span in spans) + 1
+
+    solver = Solver()
+
+    for tile_var in tile_vars.values():
+        solver.addConstraint(tile_var.span >= 1)
+        solver.addConstraint(tile_var.span <= length_new)
+
+        match mode:
+            case "scale":
+                # Scaling {{{
+
+                # span_new   length_new
+                # -------- = ----------
+                # span_old   length_old
+
+                # span_new = (span_old * length_new) / length_old
+
+                solver.addConstraint(
+                    tile_var.span >= ((tile_var.span_old * length_new) // length_old)
+                )
+                solver.addConstraint(
+                    tile_var.span
+                    <= 1 + ((tile_var.span_old * length_new) // length_old)
+                )
+                # }}}
+            case "balance":
+                # Balancing {{{
+                solver.addConstraint(tile_var.span >= (length_new // max_tiles))
+                # }}}
+
+    # Position constraints {{{
+    for tile_vars_group in tile_vars_groups:
+        # Span constraints {{{
+        expression: Expression | Variable = tile_vars_group[0].span
+        for tile_var in tile_vars_group[1:]:
+            expression += tile_var.span
+
+        solver.addConstraint(expression == length_new)
+        # }}}
+
+        # Cell constraints {{{
+        if len(tile_vars_group) > 0:
+            # Don't let rows of tiles slide out of the box
+            solver.addConstraint(tile_vars_group[0].cell == 0)
+
+        for i in range(1, len(tile_vars_group)):
+            previous_tile, tile_var = tile_vars_group[i - 1], tile_vars_group[i]
+            solver.addConstraint(
+                tile_var.cell == (previous_tile.cell + previous_tile.span)
+            )
+        # }}}
+
+    # }}}
+
+    solver.updateVariables()
+    return [
+        (int(tile_vars[i].cell.value()), int(tile_vars[i].span.value()))
+        for i in range(len(spans))
+    ]
+
+
+def overlap(a: TileAsCorners, b: TileAsCorners) -> bool:
+    """
+    Whether normalized corners `a` and `b` share at least one cell
+    """
+    return (
+        (a.c0.x <= b.c3.x)
+        and (b.c0.x <= a.c3.x)
+        and (a.c0.y <= b.c3.y)
+        and (b.c0.y <= a.c3.y)
+    )
+
+
+def get_overlapping_index_pairs(
+    corners: Sequence[TileAsCorners],
+) -> list[tuple[int, int]]:
+    """
+    Return index pairs `(i, j)`, `i < j`, of overlapping normalized corners,
+    sorted the same way as `itertools.combinations` would yield them.
+
+    Sweeps along X. Rectangles crossing the sweep line are kept in a max
+    segment tree indexed by their `c0.y` rank and holding their `c3.y`, so each
+    rectangle finds the active ones it overlaps in `O(log n)` per match.
+    """
+    n = len(corners)
+    if n < 2:
+        return []
+
+    by_y0 = sorted(range(n), key=lambda i: corners[i].c0.y)
+    y0s = [corners[i].c0.y for i in by_y0]
+    rank = [0] * n
+    for r, i in enumerate(by_y0):
+        rank[i] = r
+
+    empty = y0s[0] - 1  # Lower than any `c3.y`
+    size = 1 << (n - 1).bit_length()
+    tree = [empty] * (2 * size)
+
+    def update(i: int, value: int) -> None:
+        node = size + rank[i]
+        tree[node] = value
+        node //= 2
+        while node:
+            new = max(tree[2 * node], tree[(2 * node) + 1])
+            if tree[node] == new:
+                # Ancestors are up to date as well
+                break
+            tree[node] = new
+            node //= 2
+
+    pairs: list[tuple[int, int]] = []
+    active: list[tuple[int, int]] = []  # Heap of (c3.x, index)
+    for i in sorted(range(n), key=lambda i: corners[i].c0.x):
+        c = corners[i]
+
+        while active and active[0][0] < c.c0.x:
+            update(heapq.heappop(active)[1], empty)
+
+        # Active rectangles with `c0.y <= c.c3.y` and `c3.y >= c.c0.y`
+        limit = bisect.bisect_right(y0s, c.c3.y)
+        stack = [(1, 0, size)]
+        while stack:
+            node, lo, hi = stack.pop()
+            if (lo >= limit) or (tree[node] < c.c0.y):
+                continue
+
+            if node >= size:
+                j = by_y0[node - size]
+                pairs.append((min(i, j), max(i, j)))
+                continue
+
+            mid = (lo + hi) // 2
+            stack.append((2 * node, lo, mid))
+            stack.append(((2 * node) + 1, mid, hi))
+
+        update(i, c.c3.y)
+        heapq.heappush(active, (c.c3.x, i))
+
+    return sorted(pairs)
+
+
+def get_borders_on_line(
+    line: BorderLine, *, before: EdgeList, after: EdgeList, mode: BorderMode
+) -> list[SharedBorders]:
+    """
+    Borders along `line` between the `before` and `after` tiles.
+
+    Spans of both sides are swept together: a `SHORTEST` border is a run of
+    spans chained by overlaps, a `LONGEST` one - a run of `SHORTEST` borders
+    following each other without a gap. Spans without a tile on the other
+    side of the line are not borders.
+    """
+    if not (before.tiles and after.tiles):
+        return []
+
+    spans = heapq.merge(
+        zip(before.lows, before.highs, itertools.repeat(False), before.tiles),
+        zip(after.lows, after.highs, itertools.repeat(True), after.tiles),
+        key=lambda span: span[0],
+    )
+
+    # (low, high, before, after) of every run of overlapping spans
+    groups: list[tuple[int, int, list[Tile], list[Tile]]] = []
+    for low, high, is_after, tile in spans:
+        if (not groups) or (low > groups[-1][1]):
+            groups.append((low, high, [], []))
+        elif high > groups[-1][1]:
+            groups[-1] = (groups[-1][0], high, groups[-1][2], groups[-1][3])
+
+        _, _, tiles_before, tiles_after = groups[-1]
+        (tiles_after if is_after else tiles_before).append(tile)
+
+    return_: list[SharedBorders] = []
+    previous_high: int | None = None
+    for low, high, tiles_before, tiles_after in groups:
+        if not (tiles_before and tiles_after):
+            previous_high = None
+            continue
+
+        shared_borders = line.build_borders(own=tiles_after, other=tiles_before)
+
+        if (
+            (mode == BorderMode.LONGEST)
+            and (previous_high is not None)
+            and (low == previous_high + 1)
+        ):
+            return_[-1] = return_[-1].union(shared_borders)
+        else:
+            return_.append(shared_borders)
+
+        previous_high = high
+
+    return return_
+
+
 def clamp(num: int, min: int, max: int) -> int:
     if num > max:
         return max
@@ -0,0 +1,495 @@
+"""
+Append-only log of model operations and a headless replay of it.
+
+The log is JSON lines, one entry per line. It starts with the grid the
+session started from, grids are also stored every `checkpoint_every`
+operations, so replaying up to any entry starts from the closest grid
+before it instead of from the beginning.
+
+Replay a log: `python -m grid.oplog session.jsonl`
+"""
+
+import argparse
+import dataclasses
+import json
+import time
+from collections import defaultdict
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from typing import Any, Literal, TextIO
+
+from .model import (
+    BorderDragCache,
+    CardinalDirection,
+    Cell,
+    HandleBorders,
+    IntHandle,
+    Tile,
+    TileAsCorners,
+    TileGrid,
+)
+
+
+# Operations {{{
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class SplitTile:
+    tile_handle: IntHandle
+    direction: CardinalDirection
+    new_tile_handle: IntHandle
+
+    def apply(self, grid: TileGrid) -> TileGrid:
+        return grid.split_tile(
+            tile_handle=self.tile_handle,
+            direction=self.direction,
+            new_tile_handle=self.new_tile_handle,
+        )
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Insert:
+    anchor_handle: IntHandle
+    direction: CardinalDirection
+    new_tile_handle: IntHandle
+
+    def apply(self, grid: TileGrid) -> TileGrid:
+        return grid.insert(
+            anchor_handle=self.anchor_handle,
+            direction=self.direction,
+            new_tile_handle=self.new_tile_handle,
+        )
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class DeleteAndCloseGap:
+    handle: IntHandle
+
+    def apply(self, grid: TileGrid) -> TileGrid:
+        return grid.delete_and_close_gap(handle=self.handle)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Drag:
+    """
+    `BorderDragCache.drag` of `borders` grabbed at `cursor`, released at `to`
+    """
+
+    borders: HandleBorders
+    cursor: Cell
+    to: Cell
+    snap_proximity: int
+
+    @staticmethod
+    def of(cache: BorderDragCache, *, to: Cell, snap_proximity: int) -> "Drag":
+        return Drag(
+            borders=cache.borders.get_handles(),
+            cursor=cache.cursor,
+            to=to,
+            snap_proximity=snap_proximity,
+        )
+
+    def apply(self, grid: TileGrid) -> TileGrid:
+        cache = BorderDragCache.build(
+            borders=self.borders.resolve(grid), grid=grid, cursor=self.cursor
+        )
+        grid, _ = cache.drag(to=self.to, snap_proximity=self.snap_proximity)
+        return grid
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class AlignBorders:
+    proximity: int
+
+    def apply(self, grid: TileGrid) -> TileGrid:
+        return grid.align_borders(proximity=self.proximity)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class AlignBorderClusters:
+    proximity: int
+    handles: frozenset[IntHandle] | None = None
+
+    def apply(self, grid: TileGrid) -> TileGrid:
+        return grid.align_border_clusters(
+            proximity=self.proximity, handles=self.handles
+        )
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Resize:
+    new_boundary: Cell
+
+    def apply(self, grid: TileGrid) -> TileGrid:
+        return grid.resize(new_boundary=self.new_boundary)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ResizeAlongX:
+    x_length_new: int
+    mode: Literal["balance", "scale"] = "scale"
+
+    def apply(self, grid: TileGrid) -> TileGrid:
+        return grid.resize_along_x(x_length_new=self.x_length_new, mode=self.mode)
+
+
+type Operation = (
+    SplitTile
+    | Insert
+    | DeleteAndCloseGap
+    | Drag
+    | AlignBorders
+    | AlignBorderClusters
+    | Resize
+    | ResizeAlongX
+)
+
+
+# }}} Operations
+
+
+# Grids {{{
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class SetGrid:
+    """
+    Change no operation describes (undo, rotation, reset, ...)
+    """
+
+    grid: TileGrid
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class Checkpoint:
+    """
+    Grid the operations before lead to, only there to speed up replays
+    """
+
+    grid: TileGrid
+
+
+# }}} Grids
+
+
+type Entry = Operation | SetGrid | Checkpoint
+
+
+@dataclass(slots=True, kw_only=True)
+class OperationLog:
+    """
+    Log of everything that happened to `grid`, written to `file` as it is
+    recorded if given
+    """
+
+    grid: TileGrid
+    checkpoint_every: int = 256
+    file: TextIO | None = None
+
+    entries: list[Entry] = dataclasses.field(default_factory=list[Entry])
+    _since_checkpoint: int = dataclasses.field(default=0, repr=False)
+
+    def __post_init__(self) -> None:
+        self._append(SetGrid(grid=self.grid))
+
+    def record(
+        self, operation: Operation, grid: TileGrid, *, result: TileGrid | None = None
+    ) -> TileGrid:
+        """
+        Apply `operation` to `grid`, a `SetGrid` goes first if `grid` is not
+        the one the log is at.
+
+        `result` is `operation` applied to `grid` if the caller already has it,
+        e.g. from a `ResizeSession`. It has to be what `operation.apply` gives,
+        or replays would diverge from here on, which is checked unless
+        running with `-O`.
+        """
+        self.record_grid(grid)
+
+        if result is None:
+            result = operation.apply(grid)
+        else:
+            assert result == operation.apply(grid), (
+                f"{operation} does not replay to the given result"
+            )
+
+        self.grid = result
+        self._append(operation)
+
+        self._since_checkpoint += 1
+        if self._since_checkpoint >= self.checkpoint_every:
+            self._append(Checkpoint(grid=self.grid))
+
+        return self.grid
+
+    def record_grid(self, grid: TileGrid) -> TileGrid:
+        if grid.get_tile_vector() != self.grid.get_tile_vector():
+            self._append(SetGrid(grid=grid))
+
+        self.grid = grid
+        return grid
+
+    def _append(self, entry: Entry) -> None:
+        if isinstance(entry, SetGrid | Checkpoint):
+            self._since_checkpoint = 0
+
+        self.entries.append(entry)
+        if self.file is not None:
+            self.file.write(dump_entry(entry) + "\n")
+            self.file.flush()
+
+
+# Replay {{{
+
+
+def replay(
+    entries: Sequence[Entry],
+    *,
+    until: int | None = None,
+    use_checkpoints: bool = True,
+) -> TileGrid:
+    """
+    Grid after `entries[:until]`.
+
+    Starts from the last stored grid before `until`, with `use_checkpoints`
+    off only `SetGrid`s are taken, so every operation is run again.
+    """
+    grid: TileGrid | None = None
+    for _, grid in iter_replay(entries, until=until, use_checkpoints=use_checkpoints):
+        pass
+
+    if grid is None:
+        raise ValueError("Nothing to replay")
+
+    return grid
+
+
+def iter_replay(
+    entries: Sequence[Entry],
+    *,
+    until: int | None = None,
+    use_checkpoints: bool = True,
+) -> Iterator[tuple[Entry, TileGrid]]:
+    """
+    Every replayed entry with the grid after it
+    """
+    entries = entries[:until]
+
+    for start in reversed(range(len(entries))):
+        first = entries[start]
+        if isinstance(first, SetGrid) or (
+            use_checkpoints and isinstance(first, Checkpoint)
+        ):
+            break
+    else:
+        if entries:
+            raise ValueError("Log does not start with a grid")
+        return
+
+    grid = first.grid
+    yield first, grid
+
+    for entry in entries[start + 1 :]:
+        match entry:
+            case SetGrid():
+                grid = entry.grid
+            case Checkpoint():
+                if use_checkpoints:
+                    grid = entry.grid
+            case _:
+                grid = entry.apply(grid)
+
+        yield entry, grid
+
+
+# }}} Replay
+
+
+# Encoding {{{
+
+
+def dump_entry(entry: Entry) -> str:
+    return json.dumps(_encode_entry(entry), separators=(",", ":"))
+
+
+def load_entry(line: str) -> Entry:
+    return _decode_entry(json.loads(line))
+
+
+def load_entries(lines: Iterable[str]) -> list[Entry]:
+    return [load_entry(line) for line in lines if line.strip()]
+
+
+def _encode_entry(entry: Entry) -> dict[str, Any]:
+    match entry:
+        case SplitTile():
+            return {
+                "op": "split_tile",
+                "tile_handle": entry.tile_handle,
+                "direction": entry.direction.name,
+                "new_tile_handle": entry.new_tile_handle,
+            }
+        case Insert():
+            return {
+                "op": "insert",
+                "anchor_handle": entry.anchor_handle,
+                "direction": entry.direction.name,
+                "new_tile_handle": entry.new_tile_handle,
+            }
+        case DeleteAndCloseGap():
+            return {"op": "delete_and_close_gap", "handle": entry.handle}
+        case Drag():
+            return {
+                "op": "drag",
+                "left": sorted(entry.borders.left),
+                "right": sorted(entry.borders.right),
+                "top": sorted(entry.borders.top),
+                "bottom": sorted(entry.borders.bottom),
+                "cursor": [entry.cursor.x, entry.cursor.y],
+                "to": [entry.to.x, entry.to.y],
+                "snap_proximity": entry.snap_proximity,
+            }
+        case AlignBorders():
+            return {"op": "align_borders", "proximity": entry.proximity}
+        case AlignBorderClusters():
+            return {
+                "op": "align_border_clusters",
+                "proximity": entry.proximity,
+                "handles": None if entry.handles is None else sorted(entry.handles),
+            }
+        case Resize():
+            return {
+                "op": "resize",
+                "new_boundary": [entry.new_boundary.x, entry.new_boundary.y],
+            }
+        case ResizeAlongX():
+            return {
+                "op": "resize_along_x",
+                "x_length_new": entry.x_length_new,
+                "mode": entry.mode,
+            }
+        case SetGrid():
+            return {"op": "set_grid", "tiles": _encode_tiles(entry.grid)}
+        case Checkpoint():
+            return {"op": "checkpoint", "tiles": _encode_tiles(entry.grid)}
+
+
+def _decode_entry(data: dict[str, Any]) -> Entry:
+    match data["op"]:
+        case "split_tile":
+            return SplitTile(
+                tile_handle=data["tile_handle"],
+                direction=CardinalDirection[data["direction"]],
+                new_tile_handle=data["new_tile_handle"],
+            )
+        case "insert":
+            return Insert(
+                anchor_handle=data["anchor_handle"],
+                direction=CardinalDirection[data["direction"]],
+                new_tile_handle=data["new_tile_handle"],
+            )
+        case "delete_and_close_gap":
+            return DeleteAndCloseGap(handle=data["handle"])
+        case "drag":
+            return Drag(
+                borders=HandleBorders(
+                    left=frozenset(data["left"]),
+                    right=frozenset(data["right"]),
+                    top=frozenset(data["top"]),
+                    bottom=frozenset(data["bottom"]),
+                ),
+                cursor=Cell(*data["cursor"]),
+                to=Cell(*data["to"]),
+                snap_proximity=data["snap_proximity"],
+            )
+        case "align_borders":
+            return AlignBorders(proximity=data["proximity"])
+        case "align_border_clusters":
+            return AlignBorderClusters(
+                proximity=data["proximity"],
+                handles=(
+                    None if data["handles"] is None else frozenset(data["handles"])
+                ),
+            )
+        case "resize":
+            return Resize(new_boundary=Cell(*data["new_boundary"]))
+        case "resize_along_x":
+            return ResizeAlongX(x_length_new=data["x_length_new"], mode=data["mode"])
+        case "set_grid":
+            return SetGrid(grid=_decode_tiles(data["tiles"]))
+        case "checkpoint":
+            return Checkpoint(grid=_decode_tiles(data["tiles"]))
+        case op:
+            raise ValueError(f"Unknown operation: {op!r}")
+
+
+def _encode_tiles(grid: TileGrid) -> list[list[int]]:
+    return [
+        [c.c0.x, c.c0.y, c.c3.x, c.c3.y, tile.handle]
+        for tile, c in ((tile, tile.as_corners()) for tile in grid.tiles)
+    ]
+
+
+def _decode_tiles(rows: list[list[int]]) -> TileGrid:
+    return TileGrid.from_(
+        Tile.build(TileAsCorners(Cell(x0, y0), Cell(x1, y1)), handle=handle)
+        for x0, y0, x1, y1, handle in rows
+    )
+
+
+# }}} Encoding
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay an operation log")
+    parser.add_argument("log")
+    parser.add_argument("--until", type=int, default=None)
+    parser.add_argument(
+        "--no-checkpoints",
+        action="store_true",
+        help="run every operation from the start, as benchmarks should",
+    )
+    args = parser.parse_args()
+
+    with open(args.log) as file:
+        entries = load_entries(file)
+
+    seconds: defaultdict[str, float] = defaultdict(float)
+    counts: defaultdict[str, int] = defaultdict(int)
+
+    start = time.perf_counter()
+    for _ in _timed(
+        iter_replay(entries, until=args.until, use_checkpoints=not args.no_checkpoints),
+        seconds,
+        counts,
+    ):
+        pass
+    total = time.perf_counter() - start
+
+    for name in sorted(seconds, key=seconds.__getitem__, reverse=True):
+        print(f"{name:<24}{counts[name]:>8}{seconds[name]:>12.4f}s")
+    print(f"{'total':<24}{sum(counts.values()):>8}{total:>12.4f}s")
+
+
+def _timed(
+    replayed: Iterator[tuple[Entry, TileGrid]],
+    seconds: defaultdict[str, float],
+    counts: defaultdict[str, int],
+) -> Iterator[tuple[Entry, TileGrid]]:
+    """
+    Time spent replaying every kind of entry
+    """
+    while True:
+        start = time.perf_counter()
+        item = next(replayed, None)
+        if item is None:
+            return
+
+        name = type(item[0]).__name__
+        seconds[name] += time.perf_counter() - start
+        counts[name] += 1
+        yield item
+
+
+if __name__ == "__main__":
+    main()
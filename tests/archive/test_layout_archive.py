@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import pytest
+
+from grid.archive import (
+    HEADER,
+    INDEX_ENTRY,
+    MAX_ID_LENGTH,
+    TRAILER,
+    LayoutArchive,
+    append_layouts,
+)
+from grid.model import CardinalDirection, Cell, Tile, TileAsCorners, TileGrid
+from grid.serialize import dump_grid
+
+
+GRID = TileGrid.from_(Tile.build(TileAsCorners(Cell(0, 0), Cell(9, 9)), handle=0))
+SPLIT = GRID.split_tile(
+    tile_handle=0, new_tile_handle=1, direction=CardinalDirection.RIGHT
+)
+
+
+def test_append(tmp_path: Path) -> None:
+    path = tmp_path / "layouts.grda"
+
+    append_layouts(path, {"a": GRID, "b": SPLIT})
+    with LayoutArchive.open(path) as archive:
+        assert list(archive) == ["a", "b"]
+        assert archive.load("a") == GRID
+        assert archive.load("b") == SPLIT
+
+        with archive.get_bytes("b") as data:
+            assert data == dump_grid(SPLIT)
+
+    size = path.stat().st_size
+    append_layouts(path, {"экран": SPLIT.rotate_clockwise(), "a": SPLIT})
+    with LayoutArchive.open(path) as archive:
+        assert len(archive) == 3
+        assert "b" in archive
+        assert archive.load("экран") == SPLIT.rotate_clockwise()
+        assert archive.load("a") == SPLIT
+        assert archive.index["b"][0] < size
+
+
+def test_append_one_at_a_time(tmp_path: Path) -> None:
+    path = tmp_path / "layouts.grda"
+    for i in range(10):
+        append_layouts(path, {f"{i}": GRID})
+
+    # Each append writes only its own layout, index entry and trailer
+    assert path.stat().st_size == HEADER.size + 10 * (
+        len(dump_grid(GRID)) + INDEX_ENTRY.size + 1 + TRAILER.size
+    )
+    with LayoutArchive.open(path) as archive:
+        assert list(archive) == [f"{i}" for i in range(10)]
+        assert all(archive.load(f"{i}") == GRID for i in range(10))
+
+
+def test_long_id(tmp_path: Path) -> None:
+    path = tmp_path / "layouts.grda"
+    append_layouts(path, {"a": GRID})
+    data = path.read_bytes()
+
+    with pytest.raises(ValueError):
+        append_layouts(path, {"b": GRID, "ы" * MAX_ID_LENGTH: GRID})
+    assert path.read_bytes() == data
+
+    append_layouts(path, {"b" * MAX_ID_LENGTH: GRID})
+    with LayoutArchive.open(path) as archive:
+        assert archive.load("b" * MAX_ID_LENGTH) == GRID
+
+
+def test_invalid(tmp_path: Path) -> None:
+    path = tmp_path / "layouts.grda"
+    append_layouts(path, {"a": GRID})
+    append_layouts(path, {"b": GRID})
+    data = path.read_bytes()
+
+    # The last trailer pointing at itself as the previous one
+    trailer = len(data) - TRAILER.size
+    looped = data[: trailer + 8] + trailer.to_bytes(8, "little") + data[trailer + 16 :]
+
+    for invalid in (b"GRID" + data[4:], data[:-1], data + b"\x00", looped):
+        path.write_bytes(invalid)
+        with pytest.raises(ValueError):
+            LayoutArchive.open(path)
@@ -0,0 +1,87 @@
+import pytest
+
+from grid.model import (
+    CardinalDirection,
+    Cell,
+    Line,
+    Orientation,
+    Tile,
+    TileAsCorners,
+    TileAsStep,
+    TileGrid,
+)
+
+
+pytest.importorskip("numpy")
+
+from grid.columnar import TileGridArray
+from grid.serialize import dump_grid
+
+
+GRID = TileGrid.from_(
+    Tile.build(TileAsCorners(Cell(6, 0), Cell(10, 5)), handle=1),
+    Tile.build(TileAsCorners(Cell(6, 6), Cell(10, 10)), handle=2),
+    Tile.build(TileAsCorners(Cell(0, 0), Cell(5, 5)), handle=3),
+    Tile.build(TileAsStep(Cell(0, 6), Cell(5, 4)), handle=4),
+)
+
+
+def test_round_trip() -> None:
+    assert TileGridArray.from_grid(GRID).to_grid() == GRID
+
+
+def test_bytes() -> None:
+    a = TileGridArray.from_bytes(dump_grid(GRID))
+
+    assert a.to_grid() == GRID
+    assert a.to_bytes() == dump_grid(GRID)
+
+
+def test_transforms() -> None:
+    a = TileGridArray.from_grid(GRID)
+
+    assert a.rotate_clockwise().to_grid() == GRID.rotate_clockwise()
+    assert a.rotate_counterclockwise().to_grid() == GRID.rotate_counterclockwise()
+    assert a.mirror_horizontally().to_grid() == GRID.mirror_horizontally()
+    assert a.mirror_vertically().to_grid() == GRID.mirror_vertically()
+    assert a.translate(delta=Cell(3, -2)).to_grid() == GRID.translate(delta=Cell(3, -2))
+
+    for side in CardinalDirection:
+        for to in CardinalDirection:
+            assert a.rotate(side, to=to).to_grid() == GRID.rotate(side, to=to)
+
+
+def test_measures() -> None:
+    a = TileGridArray.from_grid(GRID)
+
+    assert a.get_box() == GRID.get_box()
+    assert a.area().tolist() == [t.area() for t in GRID.tiles]
+    assert a.get_area_mismatch() == GRID.get_area_mismatch()
+
+
+def test_large_area() -> None:
+    grid = TileGrid.from_(
+        Tile.build(TileAsCorners(Cell(0, 0), Cell(99_999, 99_999)), handle=1),
+        Tile.build(TileAsCorners(Cell(100_000, 0), Cell(149_999, 99_999)), handle=2),
+    )
+    a = TileGridArray.from_grid(grid)
+
+    assert a.area().tolist() == [10_000_000_000, 5_000_000_000]
+    assert a.get_area_mismatch() == 0
+
+
+def test_line_predicates() -> None:
+    a = TileGridArray.from_grid(GRID)
+
+    for orientation in Orientation:
+        for coordinate in range(-1, 12):
+            line = Line(coordinate=coordinate, orientation=orientation)
+
+            for vectorized, scalar in (
+                (a.line_fully_contains, line.fully_contains_tile),
+                (a.line_intersects, line.intersects_tile),
+                (a.line_touches, line.touches_tile),
+                (a.line_on_positive_side, line.on_positive_side_of_tile),
+                (a.line_on_negative_side, line.on_negative_side_of_tile),
+            ):
+                assert vectorized(line).tolist() == [scalar(t) for t in GRID.tiles]
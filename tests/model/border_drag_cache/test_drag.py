@@ -0,0 +1,71 @@
+from grid.model import (
+    BorderDragCache,
+    BorderMode,
+    Cell,
+    SharedBorders,
+    Tile,
+    TileAsCorners,
+    TileGrid,
+)
+
+
+GRID = TileGrid.from_(
+    Tile.build(TileAsCorners(Cell(0, 0), Cell(4, 4)), handle=1),
+    Tile.build(TileAsCorners(Cell(5, 0), Cell(9, 4)), handle=2),
+    Tile.build(TileAsCorners(Cell(0, 5), Cell(4, 9)), handle=3),
+    Tile.build(TileAsCorners(Cell(5, 5), Cell(9, 9)), handle=4),
+    Tile.build(TileAsCorners(Cell(0, 10), Cell(9, 12)), handle=5),
+)
+
+
+def test_cross() -> None:
+    borders = GRID.get_shared_borders_near(Cell(5, 5), mode=BorderMode.LONGEST)
+    cache = BorderDragCache.build(borders=borders, grid=GRID, cursor=Cell(5, 5))
+
+    grid, dragged = cache.drag(to=Cell(7, 3), snap_proximity=0)
+
+    tile_1 = Tile.build(TileAsCorners(Cell(0, 0), Cell(6, 2)), handle=1)
+    tile_2 = Tile.build(TileAsCorners(Cell(7, 0), Cell(9, 2)), handle=2)
+    tile_3 = Tile.build(TileAsCorners(Cell(0, 3), Cell(6, 9)), handle=3)
+    tile_4 = Tile.build(TileAsCorners(Cell(7, 3), Cell(9, 9)), handle=4)
+
+    assert grid == TileGrid.from_(tile_1, tile_2, tile_3, tile_4, GRID.tiles[4])
+    assert grid.tiles[4] is GRID.tiles[4]
+    assert dragged == SharedBorders(
+        left=frozenset((tile_1, tile_3)),
+        right=frozenset((tile_2, tile_4)),
+        top=frozenset((tile_1, tile_2)),
+        bottom=frozenset((tile_3, tile_4)),
+    )
+
+
+def test_clamp() -> None:
+    borders = GRID.get_shared_borders_near(Cell(5, 5), mode=BorderMode.LONGEST)
+    cache = BorderDragCache.build(borders=borders, grid=GRID, cursor=Cell(5, 5))
+
+    grid, _ = cache.drag(delta=Cell(100, 0), snap_proximity=0)
+
+    assert grid.get_tile_by_handle(1).as_corners() == TileAsCorners(
+        Cell(0, 0), Cell(8, 4)
+    )
+    assert grid.get_tile_by_handle(2).as_corners() == TileAsCorners(
+        Cell(9, 0), Cell(9, 4)
+    )
+
+
+def test_no_delta() -> None:
+    borders = GRID.get_shared_borders_near(Cell(5, 5), mode=BorderMode.LONGEST)
+    cache = BorderDragCache.build(borders=borders, grid=GRID, cursor=Cell(5, 5))
+
+    assert cache.drag(delta=Cell(0, 0), snap_proximity=0) == (GRID, borders)
+
+
+def test_edge_index() -> None:
+    grid = TileGrid.from_(GRID.tiles)
+    grid.get_edge_index()
+    borders = grid.get_shared_borders_near(Cell(5, 5), mode=BorderMode.LONGEST)
+    cache = BorderDragCache.build(borders=borders, grid=grid, cursor=Cell(5, 5))
+
+    dragged, _ = cache.drag(delta=Cell(-2, 1), snap_proximity=0)
+
+    assert dragged.get_edge_index() == TileGrid.from_(dragged.tiles).get_edge_index()
@@ -0,0 +1,48 @@
+from grid.model import (
+    BorderDragCache,
+    BorderMode,
+    Cell,
+    Tile,
+    TileAsCorners,
+    TileGrid,
+)
+
+
+GRID = TileGrid.from_(
+    Tile.build(TileAsCorners(Cell(0, 0), Cell(3, 2)), handle=1),
+    Tile.build(TileAsCorners(Cell(4, 0), Cell(9, 2)), handle=2),
+    Tile.build(TileAsCorners(Cell(0, 3), Cell(5, 9)), handle=3),
+    Tile.build(TileAsCorners(Cell(6, 3), Cell(9, 9)), handle=4),
+    Tile.build(TileAsCorners(Cell(0, 10), Cell(1, 12)), handle=5),
+    Tile.build(TileAsCorners(Cell(2, 10), Cell(8, 12)), handle=6),
+    Tile.build(TileAsCorners(Cell(9, 10), Cell(9, 12)), handle=7),
+)
+
+
+def build() -> BorderDragCache:
+    borders = GRID.get_shared_borders_near(Cell(6, 6), mode=BorderMode.LONGEST)
+    return BorderDragCache.build(borders=borders, grid=GRID, cursor=Cell(6, 6))
+
+
+def test_snap_points() -> None:
+    cache = build()
+
+    # `0` is too far for the left tile to shrink to
+    assert cache.snap_points_x == (2, 4, 9)
+    assert cache.snap_points_y == ()
+
+
+def test_drag() -> None:
+    cache = build()
+
+    def get_x(delta: int, proximity: int) -> int:
+        grid, _ = cache.drag(delta=Cell(delta, 0), snap_proximity=proximity)
+        return grid.get_tile_by_handle(4).as_corners().c0.x
+
+    assert get_x(-1, 0) == 5
+    assert get_x(-1, 1) == 4
+    assert get_x(-3, 1) == 2
+    # Equally close to `2` and `4`
+    assert get_x(-3, 2) == 2
+    assert get_x(2, 0) == 8
+    assert get_x(2, 1) == 9
@@ -0,0 +1,50 @@
+from grid.model import (
+    BorderMode,
+    BorderQueryCache,
+    Cell,
+    Tile,
+    TileAsCorners,
+    TileGrid,
+)
+
+
+t1 = Tile.build(TileAsCorners(Cell(0, 0), Cell(5, 5)), handle=1)
+t2 = Tile.build(TileAsCorners(Cell(6, 0), Cell(10, 5)), handle=2)
+GRID = TileGrid.from_(t1, t2)
+
+
+def test_hits_and_misses() -> None:
+    cache = BorderQueryCache()
+
+    a = cache.get_shared_borders_near(GRID, Cell(6, 2), mode=BorderMode.SHORTEST)
+    b = cache.get_shared_borders_near(
+        TileGrid.from_(t1, t2), Cell(6, 2), mode=BorderMode.SHORTEST
+    )
+
+    assert a is b
+    assert a == GRID.get_shared_borders_near(Cell(6, 2), mode=BorderMode.SHORTEST)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    assert cache.get_cross_cell(a) == a.get_cross_cell()
+    assert cache.get_cross_cell(a) == a.get_cross_cell()
+    assert cache.get_left_border(GRID, 2, mode=BorderMode.LONGEST) == a
+    assert (cache.hits, cache.misses) == (2, 3)
+
+
+def test_eviction() -> None:
+    cache = BorderQueryCache(max_size=2)
+
+    for x in range(4):
+        cache.get_shared_borders_near(GRID, Cell(x, 0), mode=BorderMode.SHORTEST)
+    assert len(cache) == 2
+
+    cache.get_shared_borders_near(GRID, Cell(3, 0), mode=BorderMode.SHORTEST)
+    assert cache.hits == 1
+
+    other = GRID.translate(delta=Cell(1, 0))
+    cache.get_shared_borders_near(other, Cell(3, 0), mode=BorderMode.SHORTEST)
+    cache.evict(GRID)
+    assert len(cache) == 1
+
+    cache.clear()
+    assert (len(cache), cache.hits, cache.misses) == (0, 0, 0)
@@ -0,0 +1,38 @@
+from grid.model import (
+    BorderLine,
+    CardinalDirection,
+    Cell,
+    EdgeList,
+    Tile,
+    TileAsCorners,
+    TileGrid,
+)
+
+
+t1 = Tile.build(TileAsCorners(Cell(0, 0), Cell(5, 5)), handle=1)
+t2 = Tile.build(TileAsCorners(Cell(6, 0), Cell(10, 3)), handle=2)
+t3 = Tile.build(TileAsCorners(Cell(6, 4), Cell(10, 5)), handle=3)
+t4 = Tile.build(TileAsCorners(Cell(0, 6), Cell(10, 10)), handle=4)
+GRID = TileGrid.from_(t1, t2, t3, t4)
+
+
+def test_get_overlapping() -> None:
+    edges = EdgeList.build([(0, 3, t1), (2, 9, t2), (5, 5, t3), (11, 12, t4)])
+
+    assert set(edges.get_overlapping(4, 6)) == {t2, t3}
+    assert set(edges.get_overlapping(10, 10)) == set()
+    assert set(edges.get_overlapping(-5, 0)) == {t1}
+    assert set(edges.get_overlapping(0, 20)) == {t1, t2, t3, t4}
+
+
+def test_sides_of_line() -> None:
+    edge_index = GRID.get_edge_index()
+    line = BorderLine.of(t1, CardinalDirection.RIGHT)
+
+    assert set(edge_index.get(line, after=False).tiles) == {t1}
+    assert set(edge_index.get(line, after=True).tiles) == {t2, t3}
+
+    line = BorderLine.of(t4, CardinalDirection.UP)
+
+    assert set(edge_index.get(line, after=False).tiles) == {t1, t3}
+    assert set(edge_index.get(line, after=True).tiles) == {t4}
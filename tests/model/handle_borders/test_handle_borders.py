@@ -0,0 +1,81 @@
+from grid.model import (
+    BorderMode,
+    CardinalDirection,
+    Cell,
+    HandleBorders,
+    Tile,
+    TileAsCorners,
+    TileGrid,
+)
+
+
+GRID = TileGrid.from_(
+    Tile.build(TileAsCorners(Cell(0, 0), Cell(4, 4)), handle=1),
+    Tile.build(TileAsCorners(Cell(5, 0), Cell(9, 4)), handle=2),
+    Tile.build(TileAsCorners(Cell(0, 5), Cell(4, 9)), handle=3),
+    Tile.build(TileAsCorners(Cell(5, 5), Cell(9, 9)), handle=4),
+)
+
+
+def test_resolve() -> None:
+    borders = GRID.get_shared_borders_near(Cell(5, 5), mode=BorderMode.LONGEST)
+    handles = borders.get_handles()
+
+    assert handles == HandleBorders(
+        left=frozenset((1, 3)),
+        right=frozenset((2, 4)),
+        top=frozenset((1, 2)),
+        bottom=frozenset((3, 4)),
+    )
+    assert handles.resolve(GRID) == borders
+
+    grid = GRID.replace_tiles(
+        (Tile.build(TileAsCorners(Cell(0, 0), Cell(5, 4)), handle=1),)
+    )
+    assert handles.resolve(grid) == borders.pull_coords(grid)
+    assert Tile.build(TileAsCorners(Cell(0, 0), Cell(5, 4)), handle=1) in (
+        handles.resolve(grid).left
+    )
+
+
+def test_resolve_missing() -> None:
+    handles = HandleBorders(left=frozenset((1, 5)), right=frozenset((2,)))
+
+    assert handles.resolve(GRID).left == frozenset((GRID.tiles[0],))
+    assert handles.resolve(GRID).right == frozenset((GRID.tiles[1],))
+
+
+def test_union() -> None:
+    assert HandleBorders(left=frozenset((1,)), top=frozenset((2,))).union(
+        HandleBorders(left=frozenset((3,)), bottom=frozenset((4,)))
+    ) == HandleBorders(
+        left=frozenset((1, 3)), top=frozenset((2,)), bottom=frozenset((4,))
+    )
+
+
+def test_transforms() -> None:
+    borders = GRID.get_shared_borders_near(Cell(5, 4), mode=BorderMode.SHORTEST)
+    handles = borders.get_handles()
+
+    assert (
+        handles.rotate_clockwise().resolve(GRID.rotate_clockwise())
+        == borders.rotate_clockwise()
+    )
+    assert (
+        handles.rotate_counterclockwise().resolve(GRID.rotate_counterclockwise())
+        == borders.rotate_counterclockwise()
+    )
+    assert (
+        handles.mirror_horizontally().resolve(GRID.mirror_horizontally())
+        == borders.mirror_horizontally()
+    )
+    assert (
+        handles.mirror_vertically().resolve(GRID.mirror_vertically())
+        == borders.mirror_vertically()
+    )
+
+    for side in CardinalDirection:
+        for to in CardinalDirection:
+            assert handles.rotate(side, to=to).resolve(
+                GRID.rotate(side, to=to)
+            ) == borders.rotate(side, to=to)
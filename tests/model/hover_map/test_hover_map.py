@@ -0,0 +1,40 @@
+from grid.model import (
+    BorderMode,
+    CardinalDirection,
+    Cell,
+    Tile,
+    TileAsCorners,
+    TileGrid,
+)
+
+
+GRID = (
+    TileGrid.from_(Tile.build(TileAsCorners(Cell(0, 0), Cell(20, 20)), handle=0))
+    .split_tile(tile_handle=0, direction=CardinalDirection.LEFT, new_tile_handle=1)
+    .split_tile(tile_handle=0, direction=CardinalDirection.DOWN, new_tile_handle=2)
+    .split_tile(tile_handle=1, direction=CardinalDirection.UP, new_tile_handle=3)
+    .split_tile(tile_handle=2, direction=CardinalDirection.RIGHT, new_tile_handle=4)
+)
+
+
+def test_matches_get_shared_borders_near() -> None:
+    for mode in BorderMode:
+        for proximity in (1, 2):
+            hover_map = GRID.get_hover_map(proximity=proximity, mode=mode)
+
+            for x in range(-1, 22):
+                for y in range(-1, 22):
+                    assert hover_map.get(Cell(x, y)) == GRID.get_shared_borders_near(
+                        Cell(x, y), proximity=proximity, mode=mode
+                    )
+
+
+def test_precompute() -> None:
+    hover_map = GRID.get_hover_map(proximity=3, mode=BorderMode.SHORTEST)
+    assert hover_map is GRID.get_hover_map(proximity=3, mode=BorderMode.SHORTEST)
+
+    hover_map.precompute(Tile.build(TileAsCorners(Cell(0, 0), Cell(0, 0))))
+    assert set(hover_map.breaks) == {GRID.try_get_tile_by_cell(Cell(0, 0))}
+
+    hover_map.precompute()
+    assert set(hover_map.breaks) == set(GRID.tiles)
@@ -0,0 +1,123 @@
+import random
+from typing import Literal
+
+import pytest
+from kiwisolver import UnsatisfiableConstraint
+
+from grid.model import (
+    CardinalDirection,
+    Cell,
+    ResizeSession,
+    Tile,
+    TileAsCorners,
+    TileGrid,
+)
+
+
+GRID = (
+    TileGrid.from_(Tile.build(TileAsCorners(Cell(0, 0), Cell(19, 19)), handle=0))
+    .split_tile(tile_handle=0, direction=CardinalDirection.LEFT, new_tile_handle=1)
+    .split_tile(tile_handle=0, direction=CardinalDirection.DOWN, new_tile_handle=2)
+    .split_tile(tile_handle=1, direction=CardinalDirection.UP, new_tile_handle=3)
+)
+
+
+def test_scale() -> None:
+    session = ResizeSession()
+
+    for x_length_new in (10, 30, 25, 40):
+        grid = session.resize(GRID, x_length_new=x_length_new)
+
+        grid.assert_invariants()
+        assert grid.get_box().as_span().span.x == x_length_new
+        for tile in GRID.tiles:
+            span_x = grid.get_tile_by_handle(tile.handle).as_span().span.x
+            lower = (tile.as_span().span.x * x_length_new) // 20
+            assert lower <= span_x <= lower + 1
+
+
+def test_scale_spans() -> None:
+    session = ResizeSession()
+
+    for x_length_new in (10, 30, 25, 40, 7):
+        assert session.resize(GRID, x_length_new=x_length_new) == GRID.resize_along_x(
+            x_length_new=x_length_new
+        )
+
+
+def build_grid(rng: random.Random) -> TileGrid:
+    grid = TileGrid.from_(
+        Tile.build(
+            TileAsCorners(Cell(0, 0), Cell(rng.randrange(8, 40), rng.randrange(8, 40))),
+            handle=0,
+        )
+    )
+    for handle in range(1, rng.randrange(2, 10)):
+        grid = grid.split_tile(
+            tile_handle=rng.choice(grid.tiles).handle,
+            direction=rng.choice(tuple(CardinalDirection)),
+            new_tile_handle=handle,
+        )
+
+    return grid
+
+
+def resize_or_fail(
+    grid: TileGrid,
+    session: ResizeSession | None,
+    *,
+    x_length_new: int,
+    mode: Literal["balance", "scale"],
+) -> TileGrid | type[UnsatisfiableConstraint]:
+    """
+    With `session` as `None` resize with `TileGrid.resize_along_x`
+    """
+    try:
+        if session is None:
+            return grid.resize_along_x(x_length_new=x_length_new, mode=mode)
+        return session.resize(grid, x_length_new=x_length_new)
+    except UnsatisfiableConstraint:
+        return UnsatisfiableConstraint
+
+
+@pytest.mark.parametrize("mode", ("scale", "balance"))
+def test_same_as_resize_along_x(mode: Literal["balance", "scale"]) -> None:
+    rng = random.Random(0)
+
+    for _ in range(50):
+        grid = build_grid(rng)
+        session = ResizeSession(mode=mode)
+
+        for x_length_new in (rng.randrange(2, 60) for _ in range(5)):
+            expected = resize_or_fail(grid, None, x_length_new=x_length_new, mode=mode)
+
+            # Results don't depend on the resizes done before
+            for session_ in (session, ResizeSession(mode=mode)):
+                assert (
+                    resize_or_fail(grid, session_, x_length_new=x_length_new, mode=mode)
+                    == expected
+                )
+
+
+def test_topology_change() -> None:
+    session = ResizeSession()
+
+    grid = session.resize(session.resize(GRID, x_length_new=30), x_length_new=40)
+    assert grid.get_box().as_span().span.x == 40
+
+    grid = grid.split_tile(
+        tile_handle=2, direction=CardinalDirection.RIGHT, new_tile_handle=4
+    )
+    grid = session.resize(grid, x_length_new=20)
+
+    grid.assert_invariants()
+    assert grid.get_box().as_span().span.x == 20
+
+
+def test_unsatisfiable() -> None:
+    session = ResizeSession(mode="balance")
+
+    with pytest.raises(UnsatisfiableConstraint):
+        session.resize(GRID, x_length_new=1)
+
+    assert session.resize(GRID, x_length_new=4).get_box().as_span().span.x == 4
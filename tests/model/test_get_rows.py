@@ -0,0 +1,32 @@
+import random
+
+from grid.model import get_rows
+
+
+def get_rows_naive(
+    spans: list[tuple[int, int, int, int]], order: list[int]
+) -> list[list[int]]:
+    return [
+        [i for i in order if spans[i][2] <= across <= spans[i][3]]
+        for across in frozenset(span[2] for span in spans)
+    ]
+
+
+def test_rows() -> None:
+    spans = [(0, 4, 0, 9), (5, 9, 0, 4), (5, 9, 5, 9)]
+
+    assert sorted(get_rows(spans, [0, 1, 2])) == [[0, 1], [0, 2]]
+
+
+def test_matches_naive() -> None:
+    random_ = random.Random(0)
+
+    for _ in range(200):
+        spans: list[tuple[int, int, int, int]] = []
+        for _ in range(random_.randint(1, 20)):
+            low, high = sorted(random_.sample(range(-50, 50), 2))
+            across_low, across_high = sorted(random_.sample(range(-80, 80), 2))
+            spans.append((low, high, across_low, across_high))
+
+        order = sorted(range(len(spans)), key=lambda i: spans[i][0])
+        assert get_rows(spans, order) == get_rows_naive(spans, order)
@@ -0,0 +1,100 @@
+from grid.model import (
+    Cell,
+    Tile,
+    TileAsCorners,
+    TileGrid,
+)
+
+
+def test_jog() -> None:
+    grid = TileGrid.from_(
+        Tile.build(TileAsCorners(Cell(0, 0), Cell(4, 5)), handle=1),
+        Tile.build(TileAsCorners(Cell(5, 0), Cell(10, 5)), handle=2),
+        Tile.build(TileAsCorners(Cell(0, 6), Cell(6, 8)), handle=3),
+        Tile.build(TileAsCorners(Cell(7, 6), Cell(10, 8)), handle=4),
+    )
+
+    assert grid.align_border_clusters(proximity=1) == grid
+    assert grid.align_border_clusters(proximity=2) == TileGrid.from_(
+        Tile.build(TileAsCorners(Cell(0, 0), Cell(4, 5)), handle=1),
+        Tile.build(TileAsCorners(Cell(5, 0), Cell(10, 5)), handle=2),
+        Tile.build(TileAsCorners(Cell(0, 6), Cell(4, 8)), handle=3),
+        Tile.build(TileAsCorners(Cell(5, 6), Cell(10, 8)), handle=4),
+    )
+
+
+def test_no_collapse() -> None:
+    grid = TileGrid.from_(
+        Tile.build(TileAsCorners(Cell(0, 0), Cell(3, 5)), handle=1),
+        Tile.build(TileAsCorners(Cell(4, 0), Cell(4, 5)), handle=2),
+        Tile.build(TileAsCorners(Cell(5, 0), Cell(10, 5)), handle=3),
+        Tile.build(TileAsCorners(Cell(0, 6), Cell(5, 15)), handle=4),
+        Tile.build(TileAsCorners(Cell(6, 6), Cell(10, 15)), handle=5),
+    )
+
+    assert grid.align_border_clusters(proximity=2) == TileGrid.from_(
+        Tile.build(TileAsCorners(Cell(0, 0), Cell(3, 5)), handle=1),
+        Tile.build(TileAsCorners(Cell(4, 0), Cell(5, 5)), handle=2),
+        Tile.build(TileAsCorners(Cell(6, 0), Cell(10, 5)), handle=3),
+        Tile.build(TileAsCorners(Cell(0, 6), Cell(5, 15)), handle=4),
+        Tile.build(TileAsCorners(Cell(6, 6), Cell(10, 15)), handle=5),
+    )
+
+
+def test_handles() -> None:
+    grid = TileGrid.from_(
+        Tile.build(TileAsCorners(Cell(0, 0), Cell(4, 5)), handle=1),
+        Tile.build(TileAsCorners(Cell(5, 0), Cell(10, 5)), handle=2),
+        Tile.build(TileAsCorners(Cell(0, 6), Cell(6, 8)), handle=3),
+        Tile.build(TileAsCorners(Cell(7, 6), Cell(10, 8)), handle=4),
+        Tile.build(TileAsCorners(Cell(0, 9), Cell(3, 12)), handle=5),
+        Tile.build(TileAsCorners(Cell(4, 9), Cell(10, 12)), handle=6),
+    )
+    aligned = TileGrid.from_(
+        Tile.build(TileAsCorners(Cell(0, 0), Cell(4, 5)), handle=1),
+        Tile.build(TileAsCorners(Cell(5, 0), Cell(10, 5)), handle=2),
+        Tile.build(TileAsCorners(Cell(0, 6), Cell(4, 8)), handle=3),
+        Tile.build(TileAsCorners(Cell(5, 6), Cell(10, 8)), handle=4),
+        Tile.build(TileAsCorners(Cell(0, 9), Cell(4, 12)), handle=5),
+        Tile.build(TileAsCorners(Cell(5, 9), Cell(10, 12)), handle=6),
+    )
+
+    assert grid.align_border_clusters(proximity=2, handles=()) == grid
+    assert grid.align_border_clusters(proximity=2, handles=(5,)) == grid
+
+    # Aligning 3 and 4 moves the border below them into reach
+    assert grid.align_border_clusters(proximity=2, handles=(3,)) == aligned
+
+
+def test_until_stable() -> None:
+    grid = TileGrid.from_(
+        Tile.build(TileAsCorners(Cell(0, 0), Cell(4, 5)), handle=1),
+        Tile.build(TileAsCorners(Cell(5, 0), Cell(10, 5)), handle=2),
+        Tile.build(TileAsCorners(Cell(0, 6), Cell(6, 8)), handle=3),
+        Tile.build(TileAsCorners(Cell(7, 6), Cell(10, 8)), handle=4),
+        Tile.build(TileAsCorners(Cell(0, 9), Cell(3, 12)), handle=5),
+        Tile.build(TileAsCorners(Cell(4, 9), Cell(10, 12)), handle=6),
+    )
+
+    # The first pass aligns 3 and 4 with 1 and 2, which moves their border
+    # within reach of the one of 5 and 6, aligned by the second pass
+    assert grid.align_border_clusters(proximity=2) == TileGrid.from_(
+        Tile.build(TileAsCorners(Cell(0, 0), Cell(4, 5)), handle=1),
+        Tile.build(TileAsCorners(Cell(5, 0), Cell(10, 5)), handle=2),
+        Tile.build(TileAsCorners(Cell(0, 6), Cell(4, 8)), handle=3),
+        Tile.build(TileAsCorners(Cell(5, 6), Cell(10, 8)), handle=4),
+        Tile.build(TileAsCorners(Cell(0, 9), Cell(4, 12)), handle=5),
+        Tile.build(TileAsCorners(Cell(5, 9), Cell(10, 12)), handle=6),
+    )
+
+
+def test_get_changed_handles() -> None:
+    t1 = Tile.build(TileAsCorners(Cell(0, 0), Cell(4, 5)), handle=1)
+    t2 = Tile.build(TileAsCorners(Cell(5, 0), Cell(10, 5)), handle=2)
+    grid = TileGrid.from_(t1, t2)
+
+    assert grid.get_changed_handles(grid) == frozenset()
+    assert grid.get_changed_handles(TileGrid.from_(t1)) == {2}
+    assert grid.get_changed_handles(
+        grid.replace_tiles([t2.corners_c0_add(Cell(1, 0))])
+    ) == {2}
@@ -0,0 +1,51 @@
+from grid.model import (
+    BorderMode,
+    CardinalDirection,
+    Cell,
+    SharedBorders,
+    Tile,
+    TileAsCorners,
+    TileGrid,
+)
+
+
+t1 = Tile.build(TileAsCorners(Cell(0, 0), Cell(5, 5)), handle=1)
+t2 = Tile.build(TileAsCorners(Cell(6, 0), Cell(10, 3)), handle=2)
+t3 = Tile.build(TileAsCorners(Cell(6, 4), Cell(10, 5)), handle=3)
+t4 = Tile.build(TileAsCorners(Cell(0, 6), Cell(5, 10)), handle=4)
+t5 = Tile.build(TileAsCorners(Cell(6, 6), Cell(10, 10)), handle=5)
+GRID = TileGrid.from_(t1, t2, t3, t4, t5)
+
+
+def test_shortest() -> None:
+    assert GRID.get_all_borders(mode=BorderMode.SHORTEST) == (
+        SharedBorders(left=frozenset({t1}), right=frozenset({t2, t3})),
+        SharedBorders(left=frozenset({t4}), right=frozenset({t5})),
+        SharedBorders(top=frozenset({t2}), bottom=frozenset({t3})),
+        SharedBorders(top=frozenset({t1}), bottom=frozenset({t4})),
+        SharedBorders(top=frozenset({t3}), bottom=frozenset({t5})),
+    )
+
+
+def test_longest() -> None:
+    assert GRID.get_all_borders(mode=BorderMode.LONGEST) == (
+        SharedBorders(left=frozenset({t1, t4}), right=frozenset({t2, t3, t5})),
+        SharedBorders(top=frozenset({t2}), bottom=frozenset({t3})),
+        SharedBorders(top=frozenset({t1, t3}), bottom=frozenset({t4, t5})),
+    )
+
+
+def test_matches_get_border() -> None:
+    grid = GRID.split_tile(
+        tile_handle=1, direction=CardinalDirection.DOWN, new_tile_handle=6
+    ).split_tile(tile_handle=5, direction=CardinalDirection.RIGHT, new_tile_handle=7)
+
+    for mode in BorderMode:
+        all_borders = grid.get_all_borders(mode=mode)
+
+        assert len(set(all_borders)) == len(all_borders)
+        assert set(all_borders) == {
+            grid.get_border(tile.handle, side, mode=mode)
+            for tile in grid.tiles
+            for side in CardinalDirection
+        } - {SharedBorders()}
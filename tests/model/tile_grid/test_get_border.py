@@ -0,0 +1,47 @@
+from grid.model import (
+    BorderMode,
+    CardinalDirection,
+    Cell,
+    SharedBorders,
+    Tile,
+    TileAsCorners,
+    TileGrid,
+)
+
+
+t1 = Tile.build(TileAsCorners(Cell(0, 0), Cell(5, 5)), handle=1)
+t2 = Tile.build(TileAsCorners(Cell(6, 0), Cell(10, 3)), handle=2)
+t3 = Tile.build(TileAsCorners(Cell(6, 4), Cell(10, 5)), handle=3)
+t4 = Tile.build(TileAsCorners(Cell(0, 6), Cell(10, 10)), handle=4)
+GRID = TileGrid.from_(t1, t2, t3, t4)
+
+
+def test_sides() -> None:
+    assert GRID.get_border(
+        1, CardinalDirection.RIGHT, mode=BorderMode.SHORTEST
+    ) == SharedBorders(left=frozenset({t1}), right=frozenset({t2, t3}))
+    assert GRID.get_border(
+        3, CardinalDirection.LEFT, mode=BorderMode.SHORTEST
+    ) == SharedBorders(left=frozenset({t1}), right=frozenset({t2, t3}))
+    assert GRID.get_border(
+        3, CardinalDirection.UP, mode=BorderMode.SHORTEST
+    ) == SharedBorders(top=frozenset({t2}), bottom=frozenset({t3}))
+    assert GRID.get_border(
+        4, CardinalDirection.UP, mode=BorderMode.SHORTEST
+    ) == SharedBorders(top=frozenset({t1, t3}), bottom=frozenset({t4}))
+    assert GRID.get_border(1, CardinalDirection.LEFT, mode=BorderMode.SHORTEST) == (
+        SharedBorders()
+    )
+
+
+def test_matches_rotated_left_border() -> None:
+    for side in CardinalDirection:
+        rotated = GRID.rotate(side, to=CardinalDirection.LEFT)
+
+        for mode in BorderMode:
+            for tile in GRID.tiles:
+                assert GRID.get_border(tile.handle, side, mode=mode) == (
+                    rotated.get_left_border(tile.handle, mode=mode).rotate(
+                        CardinalDirection.LEFT, to=side
+                    )
+                )
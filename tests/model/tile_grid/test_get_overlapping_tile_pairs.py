@@ -0,0 +1,40 @@
+import itertools
+import random
+
+from grid.model import Cell, Tile, TileAsCorners, TileAsStep, TileGrid
+
+
+def test_1() -> None:
+    g = TileGrid.from_(
+        Tile.build(TileAsCorners(Cell(0, 0), Cell(5, 5)), handle=1),
+        Tile.build(TileAsCorners(Cell(6, 0), Cell(10, 5)), handle=2),
+        Tile.build(TileAsCorners(Cell(0, 6), Cell(10, 10)), handle=3),
+    )
+
+    assert g.get_overlapping_tile_pairs() == ()
+
+
+def test_plus() -> None:
+    t1 = Tile.build(TileAsCorners(Cell(0, 4), Cell(10, 6)), handle=1)
+    t2 = Tile.build(TileAsCorners(Cell(4, 0), Cell(6, 10)), handle=2)
+    t3 = Tile.build(TileAsCorners(Cell(11, 0), Cell(12, 10)), handle=3)
+
+    assert TileGrid.from_(t1, t2, t3).get_overlapping_tile_pairs() == ((t1, t2),)
+
+
+def test_matches_pairwise() -> None:
+    rng = random.Random(0)
+    g = TileGrid.from_(
+        Tile.build(
+            TileAsStep(
+                Cell(rng.randint(0, 40), rng.randint(0, 40)),
+                Cell(rng.randint(0, 8), rng.randint(0, 8)),
+            ),
+            handle=i,
+        )
+        for i in range(150)
+    )
+
+    assert g.get_overlapping_tile_pairs() == tuple(
+        (a, b) for a, b in itertools.combinations(g.tiles, 2) if a.intersects_with(b)
+    )
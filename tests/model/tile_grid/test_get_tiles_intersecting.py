@@ -0,0 +1,54 @@
+from grid.model import Cell, Tile, TileAsCorners, TileAsStep, TileGrid
+
+
+def build_grid(side: int) -> TileGrid:
+    return TileGrid.from_(
+        Tile.build(TileAsStep(Cell(x * 3, y * 2), Cell(2, 1)), handle=(y * side) + x)
+        for y in range(side)
+        for x in range(side)
+    )
+
+
+def test_1() -> None:
+    g = TileGrid.from_(
+        Tile.build(TileAsCorners(Cell(0, 0), Cell(5, 5)), handle=1),
+        Tile.build(TileAsCorners(Cell(6, 0), Cell(10, 5)), handle=2),
+        Tile.build(TileAsCorners(Cell(0, 6), Cell(10, 10)), handle=3),
+    )
+
+    assert g.get_tiles_intersecting(
+        Tile.build(TileAsCorners(Cell(5, 5), Cell(6, 5)))
+    ) == (g.tiles[0], g.tiles[1])
+    assert g.get_tiles_intersecting(
+        Tile.build(TileAsCorners(Cell(10, 6), Cell(12, 12)))
+    ) == (g.tiles[2],)
+    assert (
+        g.get_tiles_intersecting(Tile.build(TileAsCorners(Cell(11, 0), Cell(12, 12))))
+        == ()
+    )
+
+
+def test_matches_linear_scan() -> None:
+    g = build_grid(12)
+
+    for area in (
+        Tile.build(TileAsCorners(Cell(0, 0), Cell(0, 0))),
+        Tile.build(TileAsCorners(Cell(4, 3), Cell(9, 9))),
+        Tile.build(TileAsCorners(Cell(-5, -5), Cell(100, 100))),
+        Tile.build(TileAsCorners(Cell(35, 0), Cell(35, 23))),
+    ):
+        assert g.get_tiles_intersecting(area) == tuple(
+            t for t in g.tiles if t.intersects_with(area)
+        )
+
+
+def test_try_get_tile_by_cell() -> None:
+    g = build_grid(12)
+    box = g.get_box().as_corners()
+
+    for x in range(box.c0.x - 1, box.c3.x + 2):
+        for y in range(box.c0.y - 1, box.c3.y + 2):
+            cell = Cell(x, y)
+            assert g.try_get_tile_by_cell(cell) == next(
+                (t for t in g.tiles if t.contains_cell(cell)), None
+            )
@@ -0,0 +1,28 @@
+from grid.model import Cell, Tile, TileAsCorners, TileGrid
+
+
+def test_1() -> None:
+    t1 = Tile.build(TileAsCorners(Cell(0, 0), Cell(5, 5)), handle=1)
+    t2 = Tile.build(TileAsCorners(Cell(6, 0), Cell(10, 5)), handle=2)
+    t3 = Tile.build(TileAsCorners(Cell(0, 6), Cell(10, 10)), handle=3)
+    g = TileGrid.from_(t1, t2, t3)
+
+    t2_new = t2.corners_c0_add(Cell(1, 0))
+    t4 = Tile.build(TileAsCorners(Cell(0, 0), Cell(0, 0)), handle=4)
+    g_new = g.replace_tiles((t2_new, t4))
+
+    assert g_new == TileGrid.from_(t1, t2_new, t3)
+    assert g_new.get_tile_by_handle(2) == t2_new
+    assert g_new.try_get_tile_by_handle(4) is None
+    assert g_new.get_handle_tile_map() == {1: t1, 2: t2_new, 3: t3}
+
+
+def test_duplicate_handles() -> None:
+    t1 = Tile.build(TileAsCorners(Cell(0, 0), Cell(5, 5)))
+    t2 = Tile.build(TileAsCorners(Cell(6, 0), Cell(10, 5)))
+    g = TileGrid.from_(t1, t2)
+
+    assert g.get_tile_by_handle(-1) == t1
+
+    t3 = Tile.build(TileAsCorners(Cell(0, 0), Cell(1, 1)))
+    assert g.replace_tiles((t3,)) == TileGrid.from_(t3, t3)
@@ -0,0 +1,33 @@
+from grid.model import (
+    CardinalDirection,
+    Cell,
+    Tile,
+    TileAsCorners,
+    TileGrid,
+)
+
+
+GRID = (
+    TileGrid.from_(Tile.build(TileAsCorners(Cell(0, 0), Cell(19, 19)), handle=0))
+    .split_tile(tile_handle=0, direction=CardinalDirection.LEFT, new_tile_handle=1)
+    .split_tile(tile_handle=0, direction=CardinalDirection.DOWN, new_tile_handle=2)
+    .split_tile(tile_handle=1, direction=CardinalDirection.UP, new_tile_handle=3)
+    .split_tile(tile_handle=2, direction=CardinalDirection.RIGHT, new_tile_handle=4)
+)
+
+
+def test_matches_rotated_resize_along_x() -> None:
+    for new_boundary in (Cell(10, 10), Cell(30, 7), Cell(13, 41)):
+        assert GRID.resize(new_boundary=new_boundary) == (
+            GRID.resize_along_x(x_length_new=new_boundary.x)
+            .rotate_clockwise()
+            .resize_along_x(x_length_new=new_boundary.y)
+            .rotate_counterclockwise()
+        )
+
+
+def test_box() -> None:
+    grid = GRID.resize(new_boundary=Cell(30, 7))
+
+    grid.assert_invariants()
+    assert grid.get_box().as_span().span == Cell(30, 7)
@@ -0,0 +1,44 @@
+from grid.model import (
+    CardinalDirection,
+    Cell,
+    Tile,
+    TileAsCorners,
+    TileGrid,
+    scale_spans,
+)
+
+
+GRID = (
+    TileGrid.from_(Tile.build(TileAsCorners(Cell(0, 0), Cell(19, 19)), handle=0))
+    .split_tile(tile_handle=0, direction=CardinalDirection.LEFT, new_tile_handle=1)
+    .split_tile(tile_handle=0, direction=CardinalDirection.DOWN, new_tile_handle=2)
+    .split_tile(tile_handle=1, direction=CardinalDirection.UP, new_tile_handle=3)
+    .split_tile(tile_handle=2, direction=CardinalDirection.RIGHT, new_tile_handle=4)
+)
+
+
+def test_scale() -> None:
+    for x_length_new in (3, 7, 20, 33):
+        grid = GRID.resize_along_x(x_length_new=x_length_new)
+
+        grid.assert_invariants()
+        assert grid.get_box().as_span().span.x == x_length_new
+        for tile in GRID.tiles:
+            span_x = grid.get_tile_by_handle(tile.handle).as_span().span.x
+            lower = (tile.as_span().span.x * x_length_new) // 20
+            assert lower <= span_x <= lower + 1
+
+
+def test_scale_spans() -> None:
+    assert scale_spans([(0, 4, 0, 0), (5, 9, 0, 0)], length_new=3) == [
+        (0, 1),
+        (1, 2),
+    ]
+    assert scale_spans([(0, 0, 0, 0), (1, 9, 0, 0)], length_new=3) is None
+
+
+def test_balance() -> None:
+    grid = GRID.resize_along_x(x_length_new=12, mode="balance")
+
+    grid.assert_invariants()
+    assert grid.get_box().as_span().span.x == 12
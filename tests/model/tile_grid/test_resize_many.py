@@ -0,0 +1,32 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from grid.model import (
+    CardinalDirection,
+    Cell,
+    Tile,
+    TileAsCorners,
+    TileGrid,
+)
+
+
+GRID = (
+    TileGrid.from_(Tile.build(TileAsCorners(Cell(0, 0), Cell(19, 19)), handle=0))
+    .split_tile(tile_handle=0, direction=CardinalDirection.LEFT, new_tile_handle=1)
+    .split_tile(tile_handle=0, direction=CardinalDirection.DOWN, new_tile_handle=2)
+    .split_tile(tile_handle=1, direction=CardinalDirection.UP, new_tile_handle=3)
+    .split_tile(tile_handle=2, direction=CardinalDirection.RIGHT, new_tile_handle=4)
+)
+NEW_BOUNDARIES = (Cell(10, 10), Cell(30, 7), Cell(13, 41), Cell(4, 4))
+
+
+def test_matches_resize() -> None:
+    assert GRID.resize_many(NEW_BOUNDARIES) == [
+        GRID.resize(new_boundary=new_boundary) for new_boundary in NEW_BOUNDARIES
+    ]
+
+
+def test_process_pool() -> None:
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        assert GRID.resize_many(NEW_BOUNDARIES, executor=executor) == (
+            GRID.resize_many(NEW_BOUNDARIES)
+        )
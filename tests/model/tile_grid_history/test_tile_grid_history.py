@@ -0,0 +1,96 @@
+from grid.model import (
+    CardinalDirection,
+    Cell,
+    Tile,
+    TileAsCorners,
+    TileGrid,
+    TileGridHistory,
+)
+
+
+GRID = TileGrid.from_(
+    Tile.build(TileAsCorners(Cell(0, 0), Cell(99, 99)), handle=0)
+).split_tile(tile_handle=0, direction=CardinalDirection.RIGHT, new_tile_handle=1)
+
+
+def build_big_grid() -> TileGrid:
+    return TileGrid.from_(
+        Tile.build(TileAsCorners(Cell(x, 0), Cell(x, 9)), handle=x) for x in range(1000)
+    )
+
+
+def test_undo_redo() -> None:
+    history = TileGridHistory(GRID)
+    split = history.push(
+        GRID.split_tile(
+            tile_handle=1, direction=CardinalDirection.DOWN, new_tile_handle=2
+        )
+    )
+    deleted = history.push(split.delete_and_close_gap(handle=2))
+
+    assert history.undo() == split
+    assert history.undo() == GRID
+    assert not history.can_undo()
+    assert history.undo() == GRID
+
+    assert history.redo() == split
+    assert history.redo() == deleted
+    assert not history.can_redo()
+    assert history.redo() == deleted
+
+
+def test_push_drops_redo() -> None:
+    history = TileGridHistory(GRID)
+    history.push(GRID.rotate_clockwise())
+    history.undo()
+
+    mirrored = history.push(GRID.mirror_horizontally())
+
+    assert not history.can_redo()
+    assert history.undo() == GRID
+    assert history.redo() == mirrored
+
+
+def test_push_same() -> None:
+    history = TileGridHistory(GRID)
+    history.push(GRID.replace_tiles(GRID.tiles))
+
+    assert not history.can_undo()
+
+
+def test_shared_size() -> None:
+    grid = build_big_grid()
+    history = TileGridHistory(grid)
+    size = history.get_size()
+
+    for x in range(10):
+        grid = history.push(
+            grid.replace_tiles(
+                (Tile.build(TileAsCorners(Cell(x, 0), Cell(x, 8)), handle=x),)
+            )
+        )
+
+    # Every edit only adds the chunks on the path to the changed tile
+    assert history.get_size() < size + 10 * 100
+
+    while history.can_undo():
+        history.undo()
+    while history.can_redo():
+        history.redo()
+
+    assert history.grid == grid
+
+
+def test_max_size() -> None:
+    grid = build_big_grid()
+    history = TileGridHistory(grid, max_size=2500)
+
+    for _ in range(4):
+        grid = history.push(grid.mirror_horizontally())
+
+    assert history.get_size() <= 2500
+    assert history.undo() == grid.mirror_horizontally()
+    assert not history.can_undo()
+
+    history.push(grid)
+    assert history.get_size() <= 2500
@@ -0,0 +1,57 @@
+from grid.model import (
+    CardinalDirection,
+    Cell,
+    Tile,
+    TileAsCorners,
+    TileGrid,
+    Transform,
+)
+
+
+GRID = TileGrid.from_(
+    Tile.build(TileAsCorners(Cell(6, 0), Cell(10, 5)), handle=1),
+    Tile.build(TileAsCorners(Cell(6, 6), Cell(10, 10)), handle=2),
+    Tile.build(TileAsCorners(Cell(0, 0), Cell(5, 5)), handle=3),
+    Tile.build(TileAsCorners(Cell(0, 6), Cell(5, 10)), handle=4),
+)
+
+
+def test_materialize() -> None:
+    view = GRID.view().rotate_clockwise().mirror_vertically()
+
+    assert view.materialize() == GRID.rotate_clockwise().mirror_vertically()
+    assert view.rotate_counterclockwise().mirror_horizontally().materialize() is GRID
+
+
+def test_lookups() -> None:
+    view = GRID.view().rotate(CardinalDirection.UP, to=CardinalDirection.LEFT)
+    grid = GRID.rotate(CardinalDirection.UP, to=CardinalDirection.LEFT)
+
+    assert view.get_tile_by_handle(2) == grid.get_tile_by_handle(2)
+    for tile in grid.tiles:
+        assert view.try_get_tile_by_cell(tile.as_corners().c3) == tile
+
+
+def test_replace_tiles() -> None:
+    view = GRID.view().rotate_clockwise()
+    tile = view.get_tile_by_handle(1).corners_c0_add(Cell(0, 1))
+
+    assert view.replace_tiles((tile,)).grid == GRID.replace_tiles(
+        (Transform().rotate_counterclockwise().apply_to_tile(tile),)
+    )
+
+
+def test_split_and_insert() -> None:
+    for direction in CardinalDirection:
+        to_right = GRID.rotate(direction, to=CardinalDirection.RIGHT)
+
+        assert GRID.split_tile(
+            tile_handle=1, direction=direction, new_tile_handle=5
+        ) == to_right.split_tile_to_right(tile_handle=1, new_tile_handle=5).rotate(
+            CardinalDirection.RIGHT, to=direction
+        )
+        assert GRID.insert(
+            anchor_handle=4, direction=direction, new_tile_handle=5
+        ) == to_right.insert_to_right(anchor_handle=4, new_tile_handle=5).rotate(
+            CardinalDirection.RIGHT, to=direction
+        )
@@ -0,0 +1,135 @@
+import random
+
+import pytest
+
+from grid.model import (
+    TILE_VECTOR_CHUNK,
+    Cell,
+    Tile,
+    TileAsCorners,
+    TileGrid,
+    TileVector,
+    TileVectorBranch,
+    TileVectorNode,
+)
+
+
+def build_tile(handle: int) -> Tile:
+    return Tile.build(TileAsCorners(Cell(handle, 0), Cell(handle, 1)), handle=handle)
+
+
+def test_sequence() -> None:
+    tiles = tuple(build_tile(i) for i in range(1000))
+    vector = TileVector.from_(tiles)
+
+    assert isinstance(vector.root, TileVectorBranch)
+    assert len(vector) == len(tiles)
+    assert tuple(vector) == tiles
+    assert vector == tiles
+    assert hash(vector) == hash(tiles)
+    assert vector[0] == tiles[0]
+    assert vector[-1] == tiles[-1]
+    assert vector[500] == tiles[500]
+    assert vector[10:20] == tiles[10:20]
+
+    with pytest.raises(IndexError):
+        vector[1000]
+
+    assert TileVector() == ()
+    assert len(TileVector()) == 0
+
+
+def test_edits() -> None:
+    rng = random.Random(0)
+    expected = [build_tile(i) for i in range(100)]
+    vector = TileVector.from_(expected)
+
+    for handle in range(100, 3000):
+        match rng.randrange(4):
+            case 0:
+                i = rng.randrange(len(expected) + 1)
+                expected.insert(i, build_tile(handle))
+                vector = vector.insert(i, build_tile(handle))
+            case 1 if expected:
+                i = rng.randrange(len(expected))
+                del expected[i]
+                vector = vector.delete(i)
+            case 2 if expected:
+                items = [
+                    (rng.randrange(len(expected)), build_tile(handle + 10_000 * k))
+                    for k in range(3)
+                ]
+                for i, tile in items:
+                    expected[i] = tile
+                vector = vector.set_many(items)
+            case _:
+                i = rng.randrange(len(expected)) if expected else 0
+                new = [build_tile(handle + 10_000 * k) for k in range(rng.randrange(3))]
+                if expected:
+                    expected[i : i + 1] = new
+                    vector = vector.splice(i, new)
+
+        assert len(vector) == len(expected)
+
+    assert list(vector) == expected
+    assert [vector[i] for i in range(len(expected))] == expected
+
+
+def test_shared() -> None:
+    grid = TileGrid.from_(build_tile(i) for i in range(TILE_VECTOR_CHUNK * 4))
+    tile = Tile.build(TileAsCorners(Cell(0, 0), Cell(0, 2)), handle=0)
+
+    replaced = grid.replace_tiles((tile,))
+
+    old_root = grid.get_tile_vector().root
+    new_root = replaced.get_tile_vector().root
+    assert isinstance(old_root, TileVectorBranch)
+    assert isinstance(new_root, TileVectorBranch)
+    assert new_root.children[0] != old_root.children[0]
+    assert all(
+        new is old
+        for new, old in zip(new_root.children[1:], old_root.children[1:], strict=True)
+    )
+    assert replaced.tiles[0] == tile
+
+
+def test_delete_rebalances() -> None:
+    def get_sizes(node: TileVectorNode, *, is_root: bool) -> list[int]:
+        if isinstance(node, TileVectorBranch):
+            sizes = [] if is_root else [len(node.children)]
+            for child in node.children:
+                sizes += get_sizes(child, is_root=False)
+            return sizes
+
+        return [] if is_root else [len(node)]
+
+    n = TILE_VECTOR_CHUNK**2 * 2
+    rng = random.Random(0)
+    expected = [build_tile(i) for i in range(n)]
+    vector = TileVector.from_(expected)
+
+    while len(expected) > TILE_VECTOR_CHUNK:
+        i = rng.randrange(len(expected))
+        del expected[i]
+        vector = vector.delete(i)
+
+        sizes = get_sizes(vector.root, is_root=True)
+        assert min(sizes, default=TILE_VECTOR_CHUNK) >= TILE_VECTOR_CHUNK // 2
+
+    assert list(vector) == expected
+
+
+def test_equality() -> None:
+    tiles = tuple(build_tile(i) for i in range(1000))
+    vector = TileVector.from_(tiles)
+    edited = vector.set_many(((500, build_tile(-1)),))
+
+    assert vector != edited
+    assert edited.set_many(((500, tiles[500]),)) == vector
+    assert vector.delete(0).insert(0, tiles[0]) == vector
+    assert vector.delete(999) != vector
+    assert vector != tiles[:-1] + (build_tile(-1),)
+
+    assert hash(vector) == hash(tiles)
+    assert hash(edited) != hash(vector)
+    assert edited != vector
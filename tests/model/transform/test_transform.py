@@ -0,0 +1,48 @@
+from grid.model import CardinalDirection, Cell, Transform
+
+
+CELL = Cell(3, -7)
+
+
+def test_matches_cell() -> None:
+    assert Transform().rotate_clockwise().apply_to_cell(CELL) == (
+        CELL.rotate_clockwise()
+    )
+    assert Transform().rotate_counterclockwise().apply_to_cell(CELL) == (
+        CELL.rotate_counterclockwise()
+    )
+    assert Transform().mirror_horizontally().apply_to_cell(CELL) == (
+        CELL.mirror_horizontally()
+    )
+    assert Transform().mirror_vertically().apply_to_cell(CELL) == (
+        CELL.mirror_vertically()
+    )
+
+    for side in CardinalDirection:
+        for to in CardinalDirection:
+            assert Transform().rotate(side, to=to).apply_to_cell(CELL) == (
+                CELL.rotate(side, to=to)
+            )
+
+
+def test_composition_order() -> None:
+    transform = Transform().mirror_vertically().rotate_clockwise()
+
+    assert transform.apply_to_cell(CELL) == (
+        CELL.mirror_vertically().rotate_clockwise()
+    )
+
+
+def test_cancel_out() -> None:
+    transform = (
+        Transform()
+        .rotate_clockwise()
+        .mirror_horizontally()
+        .rotate_clockwise()
+        .mirror_horizontally()
+    )
+    assert transform.is_identity()
+
+    transform = Transform().mirror_vertically().rotate_clockwise()
+    assert transform.then(transform.inverse()).is_identity()
+    assert transform.inverse().then(transform).is_identity()
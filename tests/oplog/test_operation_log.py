@@ -0,0 +1,139 @@
+import io
+
+import pytest
+
+from grid.model import (
+    BorderDragCache,
+    BorderMode,
+    CardinalDirection,
+    Cell,
+    ResizeSession,
+    Tile,
+    TileAsCorners,
+    TileGrid,
+)
+from grid.oplog import (
+    AlignBorderClusters,
+    Checkpoint,
+    DeleteAndCloseGap,
+    Drag,
+    Insert,
+    OperationLog,
+    Resize,
+    ResizeAlongX,
+    SetGrid,
+    SplitTile,
+    dump_entry,
+    load_entries,
+    load_entry,
+    replay,
+)
+
+
+GRID = TileGrid.from_(Tile.build(TileAsCorners(Cell(0, 0), Cell(39, 39)), handle=0))
+
+
+def record_session(
+    file: io.StringIO | None = None,
+) -> tuple[OperationLog, list[TileGrid]]:
+    log = OperationLog(grid=GRID, checkpoint_every=2, file=file)
+    grids = [GRID]
+
+    def record(operation: SplitTile | Insert | DeleteAndCloseGap | Drag) -> None:
+        grids.append(log.record(operation, grids[-1]))
+
+    record(
+        SplitTile(tile_handle=0, direction=CardinalDirection.RIGHT, new_tile_handle=1)
+    )
+    record(
+        SplitTile(tile_handle=1, direction=CardinalDirection.DOWN, new_tile_handle=2)
+    )
+    record(Insert(anchor_handle=2, direction=CardinalDirection.LEFT, new_tile_handle=3))
+
+    borders = grids[-1].get_shared_borders_near(Cell(18, 5), mode=BorderMode.LONGEST)
+    cache = BorderDragCache.build(borders=borders, grid=grids[-1], cursor=Cell(18, 5))
+    record(Drag.of(cache, to=Cell(12, 5), snap_proximity=2))
+
+    grids.append(log.record_grid(grids[-1].rotate_clockwise()))
+    record(DeleteAndCloseGap(handle=3))
+
+    return log, grids
+
+
+def test_replay() -> None:
+    log, grids = record_session()
+
+    assert isinstance(log.entries[0], SetGrid)
+    assert any(isinstance(entry, Checkpoint) for entry in log.entries)
+    assert grids[4] != grids[3]
+
+    for use_checkpoints in (True, False):
+        assert replay(log.entries, use_checkpoints=use_checkpoints) == grids[-1]
+
+    # The last operation applies to the rotated grid
+    operations = [
+        i
+        for i, entry in enumerate(log.entries)
+        if not isinstance(entry, SetGrid | Checkpoint)
+    ]
+    for i, grid in zip(operations, grids[1:5], strict=False):
+        assert replay(log.entries, until=i + 1) == grid
+
+
+def test_result() -> None:
+    log, grids = record_session()
+    session = ResizeSession(mode="balance")
+
+    tile_grid = grids[-1]
+    for x_length_new in (30, 17, 45, 30):
+        tile_grid = log.record(
+            ResizeAlongX(x_length_new=x_length_new, mode=session.mode),
+            tile_grid,
+            result=session.resize(tile_grid, x_length_new=x_length_new),
+        )
+        tile_grid = log.record(
+            SplitTile(
+                tile_handle=0,
+                direction=CardinalDirection.DOWN,
+                new_tile_handle=x_length_new * 10 + len(log.entries),
+            ),
+            tile_grid,
+        )
+
+    assert replay(log.entries) == tile_grid
+    assert replay(log.entries, use_checkpoints=False) == tile_grid
+
+    with pytest.raises(AssertionError):
+        log.record(
+            ResizeAlongX(x_length_new=20),
+            tile_grid,
+            result=tile_grid.resize_along_x(x_length_new=21),
+        )
+
+
+def test_file() -> None:
+    file = io.StringIO()
+    log, grids = record_session(file)
+
+    entries = load_entries(io.StringIO(file.getvalue()))
+
+    assert entries == log.entries
+    assert replay(entries) == grids[-1]
+
+
+@pytest.mark.parametrize(
+    "operation",
+    (
+        AlignBorderClusters(proximity=2),
+        AlignBorderClusters(proximity=1, handles=frozenset((1, 2))),
+        Resize(new_boundary=Cell(10, 20)),
+        ResizeAlongX(x_length_new=10, mode="balance"),
+    ),
+)
+def test_encoding(operation: AlignBorderClusters | Resize | ResizeAlongX) -> None:
+    assert load_entry(dump_entry(operation)) == operation
+
+
+def test_unknown() -> None:
+    with pytest.raises(ValueError):
+        load_entry('{"op": "teleport"}')
@@ -0,0 +1,72 @@
+import pytest
+
+from grid.model import Cell, Tile, TileAsCorners, TileAsStep, TileGrid
+from grid.serialize import (
+    HEADER,
+    RECORD_SIZE,
+    dump_grid,
+    dump_grid_json,
+    get_records,
+    load_grid,
+    load_grid_json,
+)
+
+
+GRID = TileGrid.from_(
+    Tile.build(TileAsCorners(Cell(6, 0), Cell(10, 5)), handle=1),
+    Tile.build(TileAsCorners(Cell(6, 6), Cell(10, 10)), handle=2),
+    Tile.build(TileAsCorners(Cell(-5, 0), Cell(5, 5)), handle=3),
+    Tile.build(TileAsStep(Cell(0, 6), Cell(5, 4)), handle=-4),
+)
+
+
+def test_binary() -> None:
+    data = dump_grid(GRID)
+
+    assert len(data) == HEADER.size + 4 * RECORD_SIZE
+    assert data[HEADER.size : HEADER.size + 8] == b"\x01\x00\x00\x00\x06\x00\x00\x00"
+    assert list(get_records(data))[10:15] == [3, -5, 0, 5, 5]
+
+    assert load_grid(data) == GRID
+    assert load_grid(memoryview(data)) == GRID
+    assert load_grid(dump_grid(TileGrid.from_(()))) == TileGrid.from_(())
+
+
+def test_json() -> None:
+    assert load_grid_json(dump_grid_json(GRID)) == GRID
+    assert load_grid_json(dump_grid_json(GRID, indent=2)) == GRID
+
+
+@pytest.mark.parametrize(
+    "data",
+    (
+        b"",
+        b"GRIT" + dump_grid(GRID)[4:],
+        dump_grid(GRID)[:-1],
+        dump_grid(GRID) + b"\x00",
+        HEADER.pack(b"GRID", 2, 0),
+        HEADER.pack(b"GRID", 1, 1) + bytes((0, 0, 0, 0, 2, 0, 0, 0)) + bytes(12),
+    ),
+)
+def test_invalid(data: bytes) -> None:
+    with pytest.raises(ValueError):
+        load_grid(data)
+
+
+@pytest.mark.parametrize(
+    "text",
+    (
+        "",
+        "[]",
+        '{"tiles": []}',
+        '{"version": 2, "tiles": []}',
+        '{"version": 1, "tiles": {}}',
+        '{"version": 1, "tiles": [{"handle": 1, "c0": [0, 0]}]}',
+        '{"version": 1, "tiles": [{"handle": 1, "c0": [0, 0], "c3": [1]}]}',
+        '{"version": 1, "tiles": [{"handle": 1, "c0": [0, 0], "c3": ["1", 1]}]}',
+        '{"version": 1, "tiles": [[1, 0, 0, 1, 1]]}',
+    ),
+)
+def test_invalid_json(text: str) -> None:
+    with pytest.raises(ValueError):
+        load_grid_json(text)